@@ -0,0 +1,52 @@
+"""Parser microbenchmark.
+
+Usage: python benchmarks/bench_parser.py [--statements N] [--segments N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from sqlcheck.parser import parse_source
+
+
+def build_source(statements: int, segments: int) -> str:
+    per_segment = max(1, statements // segments)
+    parts: list[str] = []
+    for segment in range(segments):
+        parts.append(f'{{{{ assess(match="rows.size() >= 0", name="segment {segment}") }}}}\n')
+        for idx in range(per_segment):
+            parts.append(
+                f"-- row {idx}; seeded fixture\n"
+                f"INSERT INTO seed_items (id, label, payload) VALUES "
+                f"({idx}, 'label;{idx}', \"quoted;{idx}\") /* block; comment */;\n"
+            )
+        parts.append("CREATE FUNCTION f() RETURNS int AS $$ SELECT 1; $$ LANGUAGE sql;\n")
+    return "".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--statements", type=int, default=50_000)
+    parser.add_argument("--segments", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    source = build_source(args.statements, args.segments)
+    size_mb = len(source.encode("utf-8")) / 1_000_000
+    timings: list[float] = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        parsed = parse_source(source)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(
+        f"{size_mb:.2f} MB, {len(parsed.sql_parsed.statements)} statements, "
+        f"{len(parsed.segments)} segments: best {best * 1000:.1f} ms "
+        f"({size_mb / best:.1f} MB/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+from sqlcheck import serialization
+
+
+class BaselineError(ValueError):
+    """A baseline file is missing or cannot be read."""
+
+
+def resolve_baseline(baseline: str | os.PathLike[str], test_path: Path | None) -> Path:
+    """Baseline paths are relative to the directory of the test file that names them."""
+    path = Path(baseline)
+    if path.is_absolute() or test_path is None:
+        return path
+    return test_path.parent / path
+
+
+def load_baseline(path: Path) -> Any | None:
+    """The stored baseline, or ``None`` when there is none yet."""
+    try:
+        return serialization.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        raise BaselineError(f"Cannot read baseline {path}: {exc}") from exc
+
+
+def write_baseline(path: Path, payload: Any) -> None:
+    """Write ``payload`` indented, so baselines diff well under version control."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(serialization.dumps(payload, indent=True) + "\n", encoding="utf-8")
+
+
+def sync_baseline(path: Path, payload: Any, update: bool) -> Any | None:
+    """The stored baseline to compare ``payload`` with, or ``None`` once it was written.
+
+    ``update`` (``--update-baselines``) rewrites the baseline with
+    ``payload``. Otherwise a missing baseline raises :class:`BaselineError`,
+    so a forgotten file fails the test instead of silently passing.
+    """
+    if update:
+        write_baseline(path, payload)
+        return None
+    stored = load_baseline(path)
+    if stored is None:
+        raise BaselineError(
+            f"Baseline {path} does not exist; run with --update-baselines to write it"
+        )
+    return stored
+
+
+__all__ = [
+    "BaselineError",
+    "load_baseline",
+    "resolve_baseline",
+    "sync_baseline",
+    "write_baseline",
+]
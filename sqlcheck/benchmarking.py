@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import math
+import statistics
+from dataclasses import dataclass, replace
+from typing import Any, Mapping, Sequence
+
+from sqlcheck.models import ExecutionStatus, SQLSegment
+
+DEFAULT_REPEAT = 5
+DEFAULT_WARMUP = 1
+DEFAULT_TOLERANCE = 0.2
+# Statistics a baseline comparison can use, in milliseconds.
+METRICS = ("min_ms", "median_ms", "p95_ms", "mean_ms", "max_ms")
+
+
+@dataclass(frozen=True)
+class BenchmarkStats:
+    """Summary of the measured runs of a segment, in milliseconds."""
+
+    samples_ms: list[float]
+
+    @classmethod
+    def from_seconds(cls, samples_s: Sequence[float]) -> "BenchmarkStats":
+        return cls(samples_ms=[sample * 1000 for sample in samples_s])
+
+    @property
+    def min_ms(self) -> float:
+        return min(self.samples_ms)
+
+    @property
+    def max_ms(self) -> float:
+        return max(self.samples_ms)
+
+    @property
+    def mean_ms(self) -> float:
+        return statistics.fmean(self.samples_ms)
+
+    @property
+    def median_ms(self) -> float:
+        return statistics.median(self.samples_ms)
+
+    @property
+    def p95_ms(self) -> float:
+        """95th percentile by the nearest-rank method, so it is always a measured run."""
+        ordered = sorted(self.samples_ms)
+        return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+    def to_payload(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {"repeat": len(self.samples_ms)}
+        payload.update((metric, getattr(self, metric)) for metric in METRICS)
+        return payload
+
+
+def benchmark_settings(kwargs: Mapping[str, Any]) -> tuple[int, int]:
+    """``(warmup, repeat)`` from ``benchmark()`` kwargs; ``ValueError`` when they are invalid."""
+    try:
+        warmup = int(kwargs.get("warmup", DEFAULT_WARMUP))
+        repeat = int(kwargs.get("repeat", DEFAULT_REPEAT))
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"benchmark() needs integer warmup and repeat: {exc}") from exc
+    if warmup < 0 or repeat < 1:
+        raise ValueError(f"benchmark() needs warmup >= 0 and repeat >= 1, got {warmup}, {repeat}")
+    return warmup, repeat
+
+
+def benchmark_runs(segment: SQLSegment) -> tuple[int, int] | None:
+    """``(warmup, repeat)`` for a ``benchmark()`` segment, ``None`` for other directives.
+
+    Invalid settings also give ``None``: the segment runs once and
+    ``benchmark()`` reports the error for that test only.
+    """
+    if segment.directive.name != "benchmark":
+        return None
+    try:
+        return benchmark_settings(segment.directive.kwargs)
+    except ValueError:
+        return None
+
+
+class BenchmarkRun:
+    """Sample accounting for the ``warmup + repeat`` runs of one segment."""
+
+    def __init__(self, warmup: int, repeat: int) -> None:
+        self.warmup = warmup
+        self.repeat = repeat
+        self.runs = 0
+        self.total_s = 0.0
+        self.samples_s: list[float] = []
+
+    def record(self, status: ExecutionStatus) -> bool:
+        """Account for one run; return whether another run is due.
+
+        A failing run ends the benchmark.
+        """
+        self.runs += 1
+        self.total_s += status.duration_s
+        if not status.success:
+            return False
+        if self.runs > self.warmup:
+            self.samples_s.append(status.duration_s)
+        return self.runs < self.warmup + self.repeat
+
+    def status(self, first: ExecutionStatus, last: ExecutionStatus) -> ExecutionStatus:
+        """The last run's status, timed over every run and keeping the first run's retries."""
+        return replace(
+            last,
+            duration_s=self.total_s,
+            attempts=first.attempts,
+            backoff_s=first.backoff_s,
+            samples_s=list(self.samples_s),
+        )
+
+
+def compare_benchmark(
+    stats: BenchmarkStats,
+    baseline: Mapping[str, Any],
+    metric: str = "median_ms",
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> str | None:
+    """Why ``stats`` regressed against a baseline payload, or ``None`` when it did not.
+
+    ``metric`` may exceed its baseline value by at most ``tolerance`` (a fraction).
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown benchmark metric '{metric}', expected one of {METRICS}")
+    expected = baseline.get(metric)
+    if expected is None:
+        return f"the baseline has no {metric}"
+    current = getattr(stats, metric)
+    if current > float(expected) * (1 + tolerance):
+        return (
+            f"{metric} {current:.2f} exceeds baseline {float(expected):.2f} "
+            f"by more than {tolerance:.0%}"
+        )
+    return None
+
+
+__all__ = [
+    "BenchmarkRun",
+    "BenchmarkStats",
+    "DEFAULT_REPEAT",
+    "DEFAULT_TOLERANCE",
+    "DEFAULT_WARMUP",
+    "METRICS",
+    "benchmark_runs",
+    "benchmark_settings",
+    "compare_benchmark",
+]
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from sqlcheck.version import __version__
+
+DEFAULT_CACHE_DIR = Path(".sqlcheck_cache")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_RESULT_TTL_S = 3600.0
+_ENTRY_SUFFIX = ".pickle"
+# Bump when the layout of cached values (ParsedFile, TestMetadata, ExecutionResult) changes.
+_ENTRY_FORMAT = 10
+_ENTRY_VERSION = f"{__version__}/{_ENTRY_FORMAT}"
+
+
+class _EntryStore:
+    """Directory of pickled entries with hit/miss counters and LRU eviction."""
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Worker processes get a fresh cache over the same directory.
+        return (type(self), (self.directory, self.max_bytes))
+
+    def prune(self) -> None:
+        """Evict least recently used entries until the cache fits in max_bytes."""
+        if not self.directory.is_dir():
+            return
+        entries = []
+        total = 0
+        for entry_path in self.directory.glob(f"*{_ENTRY_SUFFIX}"):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry_path))
+            total += stat.st_size
+        entries.sort()
+        for _, size, entry_path in entries:
+            if total <= self.max_bytes:
+                break
+            entry_path.unlink(missing_ok=True)
+            total -= size
+
+    def _entry_path(self, key: str) -> Path:
+        digest = hashlib.sha256(f"{_ENTRY_VERSION}\0{key}".encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}{_ENTRY_SUFFIX}"
+
+    def _read_entry(self, entry_path: Path) -> dict[str, Any] | None:
+        try:
+            with entry_path.open("rb") as handle:
+                entry = pickle.load(handle)
+        except FileNotFoundError:
+            return None
+        except Exception:  # noqa: BLE001 - a corrupt or stale entry is just a miss
+            return None
+        if not isinstance(entry, dict) or entry.get("version") != _ENTRY_VERSION:
+            return None
+        return entry
+
+    def _write_entry(self, entry_path: Path, entry: dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                pickle.dump(entry, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_name, entry_path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+    def _record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+class ParseCache(_EntryStore):
+    """On-disk cache of parsed test files.
+
+    Entries are keyed by the resolved file path and sqlcheck version (plus entry format). An entry is
+    reused when the file's mtime and size are unchanged, or when they changed but
+    the content hash still matches.
+    """
+
+    def load(self, path: Path, parse: Callable[[Path, str], Any]) -> Any:
+        stat = path.stat()
+        entry_path = self._entry_path(str(path.resolve()))
+        entry = self._read_entry(entry_path)
+        if entry is not None and (entry["mtime_ns"], entry["size"]) == (stat.st_mtime_ns, stat.st_size):
+            self._record(hit=True)
+            _touch(entry_path)
+            return entry["value"]
+
+        data = path.read_bytes()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        if entry is not None and entry["digest"] == digest:
+            value = entry["value"]
+            self._record(hit=True)
+        else:
+            value = parse(path, _decode_source(data))
+            self._record(hit=False)
+        self._write_entry(
+            entry_path,
+            {
+                "version": _ENTRY_VERSION,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "digest": digest,
+                "value": value,
+            },
+        )
+        return value
+
+
+class ResultCache(_EntryStore):
+    """On-disk cache of execution results.
+
+    Keys are built by the caller (connection identity, SQL and execution
+    options). An entry older than the TTL passed to :meth:`get` is a miss and
+    is removed; :meth:`prune` bounds the directory size like :class:`ParseCache`.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: float = DEFAULT_RESULT_TTL_S,
+        read_only: bool = False,
+    ) -> None:
+        super().__init__(directory, max_bytes)
+        self.ttl = ttl
+        # Also cache segments without a ``cache`` setting when their SQL is read-only.
+        self.read_only = read_only
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (ResultCache, (self.directory, self.max_bytes, self.ttl, self.read_only))
+
+    def get(self, key: str, ttl: float | None = None) -> Any | None:
+        entry_path = self._entry_path(key)
+        entry = self._read_entry(entry_path)
+        ttl = self.ttl if ttl is None else ttl
+        if entry is not None and time.time() - entry["created"] <= ttl:
+            self._record(hit=True)
+            _touch(entry_path)
+            return entry["value"]
+        if entry is not None:
+            entry_path.unlink(missing_ok=True)
+        self._record(hit=False)
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        self._write_entry(
+            self._entry_path(key),
+            {"version": _ENTRY_VERSION, "created": time.time(), "value": value},
+        )
+
+
+def _decode_source(data: bytes) -> str:
+    # Match Path.read_text(), which applies universal newline translation.
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _touch(path: Path) -> None:
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+__all__ = [
+    "DEFAULT_CACHE_DIR",
+    "DEFAULT_MAX_BYTES",
+    "DEFAULT_RESULT_TTL_S",
+    "ParseCache",
+    "ResultCache",
+]
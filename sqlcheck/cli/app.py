@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import typer
 
+from sqlcheck.cli.commands.merge import merge
 from sqlcheck.cli.commands.parse import parse
 from sqlcheck.cli.commands.plan import plan
 from sqlcheck.cli.commands.run import run
@@ -11,3 +12,4 @@ app = typer.Typer(help="Run SQL test files.", add_completion=False)
 app.command()(run)
 app.command()(parse)
 app.command()(plan)
+app.command()(merge)
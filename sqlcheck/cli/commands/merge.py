@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import typer
+
+from sqlcheck.reports import merge_json_reports, merge_junit_reports
+
+
+def merge(
+    reports: list[Path] = typer.Argument(
+        ..., help="Per-shard JSON reports (.json, .jsonl) and/or JUnit reports (.xml)"
+    ),
+    json_path: Path | None = typer.Option(
+        None, "--json", help="Write the merged JSON report to path"
+    ),
+    junit_path: Path | None = typer.Option(
+        None, "--junit", help="Write the merged JUnit XML report to path"
+    ),
+) -> None:
+    if not json_path and not junit_path:
+        raise typer.BadParameter("Pass --json and/or --junit", param_hint="--json/--junit")
+    missing = [str(report) for report in reports if not report.is_file()]
+    if missing:
+        raise typer.BadParameter(f"Report not found: {', '.join(missing)}")
+
+    json_reports = [report for report in reports if report.suffix.lower() != ".xml"]
+    junit_reports = [report for report in reports if report.suffix.lower() == ".xml"]
+    if json_path:
+        if not json_reports:
+            raise typer.BadParameter("--json needs JSON reports to merge", param_hint="--json")
+        count = merge_json_reports(json_reports, json_path)
+        print(f"Merged {count} results from {len(json_reports)} reports into {json_path}")
+    if junit_path:
+        # JUnit can be rebuilt from JSON reports when no XML reports are given.
+        sources = junit_reports or json_reports
+        count = merge_junit_reports(sources, junit_path)
+        print(f"Merged {count} results from {len(sources)} reports into {junit_path}")
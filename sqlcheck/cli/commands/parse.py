@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
 import typer
 
-from sqlcheck.parser import parse_file
-from sqlcheck.runner import discover_files
+from sqlcheck import serialization
+from sqlcheck.cli.discovery import build_parse_cache, discover_paths
+from sqlcheck.discovery import iter_parsed_files
+from sqlcheck.reports import build_statements_payload
 
 
 def parse(
@@ -17,28 +18,30 @@ def parse(
     json_path: Path | None = typer.Option(
         None, "--json", help="Write parse output to path"
     ),
+    indent: bool = typer.Option(
+        False, "--indent", help="Indent JSON written to files (printed JSON is always indented)"
+    ),
+    cache_dir: Path | None = typer.Option(
+        None,
+        "--cache-dir",
+        envvar="SQLCHECK_CACHE_DIR",
+        help="Cache parsed test files in this directory (e.g. .sqlcheck_cache)",
+    ),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Disable the parse cache"),
+    parse_workers: int = typer.Option(
+        1, "--parse-workers", help="Number of processes used to parse test files"
+    ),
 ) -> None:
-    paths = discover_files(target, pattern)
-    if not paths:
-        print("No test files found.")
-        raise typer.Exit(code=1)
+    paths = discover_paths(target, pattern)
 
+    cache = build_parse_cache(cache_dir, no_cache)
     payload = []
-    for path in paths:
-        parsed = parse_file(path)
+    for path, (parsed, _) in zip(paths, iter_parsed_files(paths, cache, parse_workers)):
         payload.append(
             {
                 "path": str(path),
                 "sql_source": parsed.sql_parsed.source,
-                "statements": [
-                    {
-                        "index": stmt.index,
-                        "text": stmt.text,
-                        "start": stmt.start,
-                        "end": stmt.end,
-                    }
-                    for stmt in parsed.sql_parsed.statements
-                ],
+                "statements": build_statements_payload(parsed.sql_parsed),
                 "directives": [
                     {
                         "name": directive.name,
@@ -51,8 +54,10 @@ def parse(
             }
         )
 
-    output = json.dumps(payload, indent=2)
+    if cache is not None:
+        cache.prune()
+
     if json_path:
-        json_path.write_text(output, encoding="utf-8")
+        json_path.write_text(serialization.dumps(payload, indent), encoding="utf-8")
     else:
-        print(output)
+        print(serialization.dumps(payload, indent=True))
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
 import typer
 
-from sqlcheck.cli.discovery import discover_cases
-from sqlcheck.reports import build_plan_payload, write_case_plan
+from sqlcheck import serialization
+from sqlcheck.cli.discovery import build_parse_cache, discover_cases
+from sqlcheck.dependencies import DependencyError, validate_dependencies
+from sqlcheck.reports import build_plan_payload, plan_file_name
 
 
 def plan(
@@ -18,21 +19,40 @@ def plan(
         None, "--plan-dir", help="Write per-test plan JSON files to this directory"
     ),
     json_path: Path | None = typer.Option(
-        None, "--json", help="Write plan output to path"
+        None, "--json", help="Write all plans to one JSON file at path"
+    ),
+    indent: bool = typer.Option(
+        False, "--indent", help="Indent JSON written to files (printed JSON is always indented)"
+    ),
+    cache_dir: Path | None = typer.Option(
+        None,
+        "--cache-dir",
+        envvar="SQLCHECK_CACHE_DIR",
+        help="Cache parsed test files in this directory (e.g. .sqlcheck_cache)",
+    ),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Disable the parse cache"),
+    parse_workers: int = typer.Option(
+        1, "--parse-workers", help="Number of processes used to parse test files"
     ),
 ) -> None:
-    cases = discover_cases(target, pattern)
+    cases = discover_cases(
+        target, pattern, build_parse_cache(cache_dir, no_cache), parse_workers
+    )
+    try:
+        validate_dependencies(cases)
+    except DependencyError as exc:
+        print(exc)
+        raise typer.Exit(code=1) from exc
     payload = [build_plan_payload(case) for case in cases]
 
     if plan_dir:
         plan_dir.mkdir(parents=True, exist_ok=True)
-        for case in cases:
-            relative_name = str(case.path).replace("/", "__").replace("\\", "__")
-            plan_path = plan_dir / f"{relative_name}.plan.json"
-            write_case_plan(case, plan_path)
+        for case, entry in zip(cases, payload):
+            (plan_dir / plan_file_name(case)).write_text(
+                serialization.dumps(entry, indent), encoding="utf-8"
+            )
 
-    output = json.dumps(payload, indent=2)
     if json_path:
-        json_path.write_text(output, encoding="utf-8")
+        json_path.write_text(serialization.dumps(payload, indent), encoding="utf-8")
     elif not plan_dir:
-        print(output)
+        print(serialization.dumps(payload, indent=True))
@@ -1,16 +1,55 @@
 from __future__ import annotations
 
+from contextlib import ExitStack
+from enum import Enum
+from functools import partial
+from itertools import chain
 from pathlib import Path
 
 import typer
 
-from sqlcheck.cli.connections import build_connector
-from sqlcheck.cli.discovery import discover_cases
-from sqlcheck.cli.output import print_results
+from sqlcheck.cli.connections import (
+    build_async_connector,
+    build_connector,
+    resolve_connection_uri,
+)
+from sqlcheck.cli.discovery import build_parse_cache, load_fixtures, stream_cases
+from sqlcheck.cache import DEFAULT_RESULT_TTL_S, ResultCache
+from sqlcheck.cli.output import ResultPrinter
+from sqlcheck.db_connector import ExecutionResult, PoolOptions
+from sqlcheck.fixtures import FixtureManager
 from sqlcheck.function_registry import default_registry
+from sqlcheck.functions.assess import expression_cache
+from sqlcheck.incremental import (
+    Selection,
+    changed_files,
+    load_state,
+    record_result,
+    select_affected,
+    write_state,
+)
 from sqlcheck.plugins import load_plugins
-from sqlcheck.reports import write_json, write_junit, write_plan
-from sqlcheck.runner import run_cases
+from sqlcheck.profiling import DEFAULT_PROFILE_SIZE, SlowestStatements
+from sqlcheck.reports import (
+    JSONLReportWriter,
+    JSONReportWriter,
+    JUnitReportWriter,
+    PlanFileWriter,
+    PlanReportWriter,
+    ReportWriter,
+)
+from sqlcheck.runner import (
+    iter_results,
+    iter_results_async,
+    iter_results_processes,
+    require_thread_engine,
+)
+from sqlcheck.sharding import ShardSpec, duration_key, load_durations, write_durations
+
+
+class Engine(str, Enum):
+    threads = "threads"
+    async_ = "async"
 
 
 def run(
@@ -18,7 +57,53 @@ def run(
     pattern: str = typer.Option(
         "**/*.sql", help="Glob pattern for test discovery (default: **/*.sql)"
     ),
-    workers: int = typer.Option(5, help="Number of worker threads"),
+    workers: int = typer.Option(
+        5, help="Number of worker threads (concurrent tests with --engine async)"
+    ),
+    processes: int = typer.Option(
+        1,
+        "--processes",
+        help="Split tests across this many worker processes, each with --workers threads",
+    ),
+    shard: str | None = typer.Option(
+        None,
+        "--shard",
+        envvar="SQLCHECK_SHARD",
+        help="Run only shard INDEX/COUNT of the discovered tests, e.g. 2/4",
+    ),
+    durations: list[Path] | None = typer.Option(
+        None,
+        "--durations",
+        help="JSON report or timing file used to balance --shard (can be repeated)",
+    ),
+    timings: Path | None = typer.Option(
+        None,
+        "--timings",
+        envvar="SQLCHECK_TIMINGS",
+        help="Timing history file: schedules the longest tests first and is updated after the run",
+    ),
+    changed_since: str | None = typer.Option(
+        None,
+        "--changed-since",
+        envvar="SQLCHECK_CHANGED_SINCE",
+        help="Only run tests whose files, fixtures or prerequisites changed since this git ref",
+    ),
+    only_affected: bool = typer.Option(
+        False,
+        "--only-affected",
+        help="Skip tests whose fingerprint and passing result are unchanged in --state",
+    ),
+    state_path: Path = typer.Option(
+        Path(".sqlcheck_state.json"),
+        "--state",
+        envvar="SQLCHECK_STATE",
+        help="State file with per-test fingerprints and results for incremental runs",
+    ),
+    engine: Engine = typer.Option(
+        Engine.threads,
+        "--engine",
+        help="Execution engine: threads, or async for sqlalchemy.ext.asyncio drivers",
+    ),
     connection: str = typer.Option(
         ...,
         "--connection",
@@ -28,39 +113,268 @@ def run(
     json_path: Path | None = typer.Option(
         None, "--json", help="Write JSON report to path"
     ),
+    jsonl_path: Path | None = typer.Option(
+        None, "--jsonl", help="Write a JSON Lines report to path, one line per finished test"
+    ),
     junit_path: Path | None = typer.Option(
         None, "--junit", help="Write JUnit XML report to path"
     ),
+    report_rows: int | None = typer.Option(
+        None,
+        "--report-rows",
+        min=0,
+        help="Keep at most this many result rows per test in JSON reports (0 leaves rows out)",
+    ),
     plan_dir: Path | None = typer.Option(
         None, "--plan-dir", help="Write per-test plan JSON files to this directory"
     ),
+    plan_file: Path | None = typer.Option(
+        None, "--plan-file", help="Write every test's plan to one JSON file at path"
+    ),
+    indent: bool = typer.Option(
+        False, "--indent", help="Indent the JSON report and plan files (default: compact)"
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help=f"List the {DEFAULT_PROFILE_SIZE} slowest statements and the time spent per phase",
+    ),
+    update_baselines: bool = typer.Option(
+        False,
+        "--update-baselines",
+        help="Rewrite plan and benchmark baselines instead of comparing against them",
+    ),
     plugin: list[str] | None = typer.Option(
         None, "--plugin", help="Plugin module path to load (can be repeated)"
     ),
+    cache_dir: Path | None = typer.Option(
+        None,
+        "--cache-dir",
+        envvar="SQLCHECK_CACHE_DIR",
+        help="Cache parsed test files in this directory (e.g. .sqlcheck_cache)",
+    ),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Disable the parse cache"),
+    result_cache_dir: Path | None = typer.Option(
+        None,
+        "--result-cache",
+        envvar="SQLCHECK_RESULT_CACHE",
+        help="Reuse results of cache=True segments stored in this directory",
+    ),
+    result_cache_ttl: float = typer.Option(
+        DEFAULT_RESULT_TTL_S,
+        "--result-cache-ttl",
+        help="Seconds a cached result stays valid (default: 3600)",
+    ),
+    cache_read_only: bool = typer.Option(
+        False,
+        "--cache-read-only",
+        help="With --result-cache, also cache segments whose SQL only reads",
+    ),
+    parse_workers: int = typer.Option(
+        1, "--parse-workers", help="Number of processes used to parse test files"
+    ),
+    max_rows: int | None = typer.Option(
+        None,
+        "--max-rows",
+        help="Keep at most this many result rows per segment (row_count stays exact)",
+    ),
+    columnar: bool = typer.Option(
+        False, "--columnar", help="Capture result rows as typed column arrays"
+    ),
+    timeout: float | None = typer.Option(
+        None,
+        "--timeout",
+        envvar="SQLCHECK_TIMEOUT",
+        help="Cancel statements running longer than this many seconds (tests override "
+        "it with timeout=)",
+    ),
+    isolation: bool = typer.Option(
+        False,
+        "--isolation",
+        envvar="SQLCHECK_ISOLATION",
+        help="Roll back every test at the end (tests opt out with isolated=False)",
+    ),
+    pool_size: int | None = typer.Option(
+        None,
+        "--pool-size",
+        envvar="SQLCHECK_POOL_SIZE",
+        help="Connection pool size (default: one connection per worker)",
+    ),
+    pool_pre_ping: bool = typer.Option(
+        False,
+        "--pool-pre-ping",
+        envvar="SQLCHECK_POOL_PRE_PING",
+        help="Test pooled connections for liveness before use",
+    ),
+    pool_recycle: int | None = typer.Option(
+        None,
+        "--pool-recycle",
+        envvar="SQLCHECK_POOL_RECYCLE",
+        help="Replace pooled connections older than this many seconds",
+    ),
 ) -> None:
-    cases = discover_cases(target, pattern)
+    try:
+        shard_spec = ShardSpec.parse(shard) if shard else None
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--shard") from exc
+    history = load_durations([timings]) if timings and timings.is_file() else {}
+    try:
+        recorded = load_durations(durations or [])
+    except (OSError, ValueError) as exc:
+        raise typer.BadParameter(str(exc), param_hint="--durations") from exc
+    cache = build_parse_cache(cache_dir, no_cache)
+    fixtures = load_fixtures(target, cache)
+    cases = stream_cases(
+        target,
+        pattern,
+        cache,
+        parse_workers,
+        shard=shard_spec,
+        # Only the shared --durations input: each node rewrites its own --timings
+        # history, so balancing on it would give every node a different split.
+        durations=recorded,
+    )
+
+    state = load_state(state_path) if only_affected or changed_since else {}
+    selection: Selection | None = None
+    if only_affected or changed_since:
+        try:
+            changed = changed_files(changed_since) if changed_since else None
+        except ValueError as exc:
+            raise typer.BadParameter(str(exc), param_hint="--changed-since") from exc
+        selection = select_affected(list(cases), fixtures, state, changed)
+        cases = selection.run
 
-    registry = default_registry()
+    if processes > 1 or engine is Engine.async_:
+        # Only the thread engine runs depends_on and fixtures; reject them before any test runs.
+        cases = list(cases)
+        try:
+            for case in cases:
+                require_thread_engine(case)
+        except ValueError as exc:
+            option = "--processes" if processes > 1 else "--engine"
+            raise typer.BadParameter(str(exc), param_hint=option) from exc
+
+    registry = default_registry(update_baselines=update_baselines)
     if plugin:
         load_plugins(plugin, registry)
 
-    connector = build_connector(connection)
+    pool = PoolOptions.for_workers(
+        workers, size=pool_size, pre_ping=pool_pre_ping, recycle=pool_recycle
+    )
+    connector_factory = partial(
+        build_async_connector if engine is Engine.async_ else build_connector,
+        connection,
+        max_rows=max_rows,
+        columnar=columnar,
+        pool=pool,
+        isolation=isolation,
+        timeout=timeout,
+    )
+    result_cache = (
+        ResultCache(result_cache_dir, ttl=result_cache_ttl, read_only=cache_read_only)
+        if result_cache_dir
+        else None
+    )
+    fixture_manager: FixtureManager | None = None
+    if processes > 1:
+        # Fail fast on a missing URI instead of inside every worker process.
+        resolve_connection_uri(connection)
+        results = iter_results_processes(
+            cases,
+            connector_factory,
+            plugin or [],
+            processes=processes,
+            workers=workers,
+            result_cache=result_cache,
+            update_baselines=update_baselines,
+        )
+    elif engine is Engine.async_:
+        results = iter_results_async(
+            cases, connector_factory(), registry, concurrency=workers, result_cache=result_cache
+        )
+    else:
+        connector = connector_factory()
+        try:
+            fixture_manager = FixtureManager(fixtures, connector)
+        except ValueError as exc:
+            raise typer.BadParameter(str(exc), param_hint="target") from exc
+        results = iter_results(
+            cases,
+            connector,
+            registry,
+            workers=workers,
+            durations=history if timings else None,
+            fixtures=fixture_manager,
+            result_cache=result_cache,
+        )
+
+    label = connection if shard_spec is None else f"{connection}, shard {shard_spec}"
+    printer = ResultPrinter(engine=label)
+    slowest = SlowestStatements() if profile else None
+    pool_wait: list[float] = []
+    measured: dict[str, float] = {}
+    teardowns: list[ExecutionResult] = []
+    expression_stats = expression_cache.stats()
+    with ExitStack() as stack:
+        if fixture_manager is not None:
+            # Callbacks unwind in reverse: run fixtures are torn down, then
+            # closing the connector tears down worker fixtures.
+            stack.callback(fixture_manager.connector.close)
+            stack.callback(lambda: teardowns.extend(fixture_manager.teardown()))
+        writers: list[ReportWriter] = []
+        if json_path:
+            writers.append(
+                stack.enter_context(JSONReportWriter(json_path, report_rows, indent=indent))
+            )
+        if jsonl_path:
+            writers.append(stack.enter_context(JSONLReportWriter(jsonl_path, report_rows)))
+        if junit_path:
+            writers.append(stack.enter_context(JUnitReportWriter(junit_path)))
+        if plan_dir:
+            writers.append(stack.enter_context(PlanReportWriter(plan_dir, indent=indent)))
+        if plan_file:
+            writers.append(stack.enter_context(PlanFileWriter(plan_file, indent=indent)))
 
-    results = run_cases(cases, connector, registry, workers=workers)
+        for result in chain(selection.cached if selection else [], results):
+            if selection is not None:
+                record_result(state, result, selection.fingerprints)
+            if not result.cached:
+                pool_wait.append(result.status.pool_wait_s)
+            if not (result.cached or result.status.cache_hit):
+                measured[duration_key(result.case.path)] = result.status.duration_s
+            printer.add(result)
+            if slowest is not None:
+                slowest.add(result)
+            for writer in writers:
+                writer.add(result)
 
-    print_results(results, engine=connection)
+    if timings:
+        write_durations(timings, {**history, **measured})
+    if selection is not None:
+        write_state(state_path, state)
+    if result_cache is not None:
+        result_cache.prune()
 
-    if json_path:
-        write_json(results, json_path)
-    if junit_path:
-        write_junit(results, junit_path)
-    if plan_dir:
-        plan_dir.mkdir(parents=True, exist_ok=True)
-        for result in results:
-            relative_name = str(result.case.path).replace("/", "__").replace("\\", "__")
-            plan_path = plan_dir / f"{relative_name}.plan.json"
-            write_plan(result, plan_path)
+    notes = []
+    if processes <= 1:
+        # Expressions are evaluated and segments served in the worker processes otherwise.
+        cel_stats = expression_cache.stats().since(expression_stats)
+        notes.append(f"CEL cache: {cel_stats.hits} hits, {cel_stats.misses} misses")
+        if result_cache is not None:
+            notes.append(
+                f"Result cache: {result_cache.hits} hits, {result_cache.misses} misses"
+            )
+    failed_teardowns = [item for item in teardowns if not item.status.success]
+    if failed_teardowns:
+        notes.append(f"Fixture teardown failed: {failed_teardowns[0].output.stderr.strip()}")
+    if pool_wait:
+        notes.append(
+            f"Pool wait: {sum(pool_wait):.2f}s total, {max(pool_wait):.2f}s max per test"
+        )
+    printer.finish(notes=notes)
+    if slowest is not None:
+        printer.print_profile(slowest)
 
-    failures = [result for result in results if not result.success]
-    if failures:
+    if printer.failures:
         raise typer.Exit(code=1)
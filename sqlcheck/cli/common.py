@@ -1,8 +1,13 @@
-from sqlcheck.cli.connections import build_connector, resolve_connection_uri
+from sqlcheck.cli.connections import (
+    build_async_connector,
+    build_connector,
+    resolve_connection_uri,
+)
 from sqlcheck.cli.discovery import discover_cases
 from sqlcheck.cli.output import print_results
 
 __all__ = [
+    "build_async_connector",
     "build_connector",
     "discover_cases",
     "print_results",
@@ -3,7 +3,13 @@ from __future__ import annotations
 import os
 import re
 
-from sqlcheck.db_connector import DBConnector, SQLAlchemyConnector
+from sqlcheck.db_connector import (
+    AsyncDBConnector,
+    AsyncSQLAlchemyConnector,
+    DBConnector,
+    PoolOptions,
+    SQLAlchemyConnector,
+)
 
 
 def _connection_env_var(name: str) -> str:
@@ -19,8 +25,42 @@ def resolve_connection_uri(name: str) -> str:
     return value
 
 
-def build_connector(connection: str) -> DBConnector:
+def build_connector(
+    connection: str,
+    max_rows: int | None = None,
+    columnar: bool = False,
+    pool: PoolOptions | None = None,
+    isolation: bool = False,
+    timeout: float | None = None,
+) -> DBConnector:
     connection_uri = resolve_connection_uri(connection)
-    return SQLAlchemyConnector(connection_uri=connection_uri)
+    return SQLAlchemyConnector(
+        connection_uri=connection_uri,
+        max_rows=max_rows,
+        columnar=columnar,
+        pool=pool,
+        isolation=isolation,
+        timeout=timeout,
+    )
 
-__all__ = ["build_connector", "resolve_connection_uri"]
+
+def build_async_connector(
+    connection: str,
+    max_rows: int | None = None,
+    columnar: bool = False,
+    pool: PoolOptions | None = None,
+    isolation: bool = False,
+    timeout: float | None = None,
+) -> AsyncDBConnector:
+    connection_uri = resolve_connection_uri(connection)
+    return AsyncSQLAlchemyConnector(
+        connection_uri=connection_uri,
+        max_rows=max_rows,
+        columnar=columnar,
+        pool=pool,
+        isolation=isolation,
+        timeout=timeout,
+    )
+
+
+__all__ = ["build_async_connector", "build_connector", "resolve_connection_uri"]
@@ -1,19 +1,95 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Iterator, Mapping
 
 import typer
 
-from sqlcheck.discovery import build_test_case, discover_files
-from sqlcheck.models import TestCase
+from sqlcheck.cache import ParseCache
+from sqlcheck.dependencies import dependency_components
+from sqlcheck.discovery import (
+    build_fixture,
+    discover_files,
+    discover_fixtures,
+    iter_test_cases,
+)
+from sqlcheck.models import Fixture, TestCase
+from sqlcheck.sharding import ShardSpec, select_shard
 
 
-def discover_cases(target: Path, pattern: str) -> list[TestCase]:
+def build_parse_cache(cache_dir: Path | None, no_cache: bool) -> ParseCache | None:
+    if cache_dir is None or no_cache:
+        return None
+    return ParseCache(cache_dir)
+
+
+def discover_paths(target: Path, pattern: str) -> list[Path]:
     paths = discover_files(target, pattern)
     if not paths:
         print("No test files found.")
         raise typer.Exit(code=1)
-    return [build_test_case(path) for path in paths]
+    return paths
+
+
+def load_fixtures(target: Path, cache: ParseCache | None = None) -> list[Fixture]:
+    return [build_fixture(path, cache) for path in discover_fixtures(target)]
+
+
+def stream_cases(
+    target: Path,
+    pattern: str,
+    cache: ParseCache | None = None,
+    workers: int = 1,
+    shard: ShardSpec | None = None,
+    durations: Mapping[str, float] | None = None,
+) -> Iterator[TestCase]:
+    paths = discover_paths(target, pattern)
+    if shard is not None:
+        return _shard_cases(paths, shard, durations, cache, workers)
+    return _stream_cases(paths, cache, workers)
+
+
+def _shard_cases(
+    paths: list[Path],
+    shard: ShardSpec,
+    durations: Mapping[str, float] | None,
+    cache: ParseCache | None,
+    workers: int,
+) -> Iterator[TestCase]:
+    # Every file is parsed, so a test and its prerequisites land on the same shard.
+    cases = list(_stream_cases(paths, cache, workers))
+    groups = [
+        [cases[index].path for index in component]
+        for component in dependency_components(cases)
+        if len(component) > 1
+    ]
+    selected = set(select_shard(paths, shard, durations, groups))
+    return iter([case for case in cases if case.path in selected])
+
+
+def _stream_cases(
+    paths: list[Path],
+    cache: ParseCache | None,
+    workers: int,
+) -> Iterator[TestCase]:
+    yield from iter_test_cases(paths, cache, workers)
+    if cache is not None:
+        cache.prune()
+
+
+def discover_cases(
+    target: Path,
+    pattern: str,
+    cache: ParseCache | None = None,
+    workers: int = 1,
+) -> list[TestCase]:
+    return list(stream_cases(target, pattern, cache, workers))
 
 
-__all__ = ["discover_cases"]
+__all__ = [
+    "build_parse_cache",
+    "discover_cases",
+    "discover_paths",
+    "load_fixtures",
+    "stream_cases",
+]
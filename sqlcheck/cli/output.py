@@ -1,74 +1,128 @@
 from __future__ import annotations
 
-from rich import box
+from typing import Iterable
+
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
-from rich.table import Table
 
 from sqlcheck.models import TestResult
+from sqlcheck.profiling import SlowestStatements
 
+# Connection checkouts faster than this are not worth a mention per test.
+POOL_WAIT_REPORT_THRESHOLD_S = 0.01
+# Statements in the --profile listing are cut to this many characters.
+PROFILE_SQL_WIDTH = 60
 
-def print_results(results: list[TestResult], engine: str | None = None) -> None:
-    total = len(results)
-    failures = [result for result in results if not result.success]
-    passed = total - len(failures)
-    console = Console()
 
-    header = "SQLCheck"
-    if engine:
-        header += f" ({engine})"
-    header += f" — {total} tests, {passed} passed"
-    if failures:
-        header += f", {len(failures)} failed"
+class ResultPrinter:
+    """Print one line per result as it arrives, then failure details and a summary.
 
-    if failures:
-        console.print("[bold]Failures:[/bold]")
-        for result in failures:
-            console.print(
-                f"[red]FAIL[/red] {result.case.metadata.name}  [dim]{result.case.path}[/dim]"
-            )
-            for func_result in result.function_results:
-                if not func_result.success:
-                    message = func_result.message or "Expectation failed"
-                    console.print(f"  {message}")
-            if result.output.stderr:
+    Only failed results are retained, so memory does not grow with suite size.
+    """
+
+    def __init__(self, engine: str | None = None, console: Console | None = None) -> None:
+        self.engine = engine
+        self.console = console or Console()
+        self.total = 0
+        self.cached = 0
+        self.failures: list[TestResult] = []
+
+    def add(self, result: TestResult) -> None:
+        self.total += 1
+        if not result.success:
+            self.failures.append(result)
+        status = "PASS" if result.success else "FAIL"
+        status_style = "green" if result.success else "red"
+        if result.status.timed_out and not result.success:
+            status = "TIMEOUT"
+        if result.cached:
+            self.cached += 1
+            status, status_style = "CACHED", "cyan"
+        timing = f"{result.status.duration_s:.2f}s"
+        if result.status.cache_hit:
+            timing += " (result cache)"
+        retries = sum(status.attempts - 1 for status in result.segments)
+        if retries:
+            backoff = sum(status.backoff_s for status in result.segments)
+            timing += f" (retried {retries}x, {backoff:.2f}s backoff)"
+        if result.status.pool_wait_s >= POOL_WAIT_REPORT_THRESHOLD_S:
+            timing += f" (pool wait {result.status.pool_wait_s:.2f}s)"
+        self.console.print(
+            f"[{status_style}]{status}[/{status_style}] "
+            f"{escape(result.case.metadata.name)}  "
+            f"[dim]{timing}  {escape(str(result.case.path))}[/dim]"
+        )
+
+    def finish(self, notes: Iterable[str] = ()) -> None:
+        console = self.console
+        passed = self.total - len(self.failures)
+
+        header = "SQLCheck"
+        if self.engine:
+            header += f" ({self.engine})"
+        header += f" — {self.total} tests, {passed} passed"
+        if self.failures:
+            header += f", {len(self.failures)} failed"
+        if self.cached:
+            header += f" ({self.cached} cached)"
+
+        console.print()
+        if self.failures:
+            console.print("[bold]Failures:[/bold]")
+            for result in self.failures:
                 console.print(
-                    Panel(
-                        result.output.stderr.strip(),
-                        title="STDERR",
-                        border_style="red",
-                    )
+                    f"[red]FAIL[/red] {escape(result.case.metadata.name)}  "
+                    f"[dim]{escape(str(result.case.path))}[/dim]"
                 )
-            if result.output.stdout:
-                console.print(
-                    Panel(
-                        result.output.stdout.strip(),
-                        title="STDOUT",
-                        border_style="yellow",
+                for func_result in result.function_results:
+                    if not func_result.success:
+                        message = func_result.message or "Expectation failed"
+                        console.print(f"  {escape(message)}")
+                if result.output.stderr:
+                    console.print(
+                        Panel(
+                            escape(result.output.stderr.strip()),
+                            title="STDERR",
+                            border_style="red",
+                        )
                     )
-                )
+                if result.output.stdout:
+                    console.print(
+                        Panel(
+                            escape(result.output.stdout.strip()),
+                            title="STDOUT",
+                            border_style="yellow",
+                        )
+                    )
+            console.print()
+
+        console.print(f"[bold]{header}[/bold]")
+        for note in notes:
+            console.print(f"[dim]{escape(note)}[/dim]")
+
+    def print_profile(self, profile: SlowestStatements) -> None:
+        console = self.console
+        phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in profile.phases.items())
         console.print()
+        console.print(f"[bold]Profile[/bold] — {profile.statements} statements: {phases}")
+        for entry in profile.slowest():
+            text = " ".join(entry.text.split())
+            if len(text) > PROFILE_SQL_WIDTH:
+                text = text[: PROFILE_SQL_WIDTH - 1] + "…"
+            console.print(
+                f"{entry.duration_s:8.3f}s  [dim](execute {entry.execute_s:.3f}s, "
+                f"fetch {entry.fetch_s:.3f}s)  {escape(str(entry.path))} "
+                f"segment {entry.segment + 1}, statement {entry.statement + 1}[/dim]"
+            )
+            console.print(f"           {escape(text)}")
 
-    table = Table(box=box.ASCII, show_header=True, header_style="bold")
-    table.add_column("STATUS", style="bold")
-    table.add_column("TEST")
-    table.add_column("DURATION", justify="right")
-    table.add_column("PATH")
 
+def print_results(results: Iterable[TestResult], engine: str | None = None) -> None:
+    printer = ResultPrinter(engine=engine)
     for result in results:
-        duration = f"{result.status.duration_s:.2f}s"
-        status = "PASS" if result.success else "FAIL"
-        status_style = "green" if result.success else "red"
-        table.add_row(
-            f"[{status_style}]{status}[/{status_style}]",
-            result.case.metadata.name,
-            duration,
-            str(result.case.path),
-        )
-
-    console.print(table)
-    console.print()
-    console.print(f"[bold]{header}[/bold]")
+        printer.add(result)
+    printer.finish()
 
 
-__all__ = ["print_results"]
+__all__ = ["ResultPrinter", "print_results"]
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Any, Iterable, Sequence
+
+try:  # NumPy is optional; typed arrays are used without it.
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+_INT_TYPECODE = "q"
+_FLOAT_TYPECODE = "d"
+
+
+def _empty_column(sample: Any) -> array | list[Any]:
+    if isinstance(sample, bool) or sample is None:
+        return []
+    if isinstance(sample, int):
+        return array(_INT_TYPECODE)
+    if isinstance(sample, float):
+        return array(_FLOAT_TYPECODE)
+    return []
+
+
+def _fits(column: array, values: Sequence[Any]) -> bool:
+    """Whether ``values`` can go into ``column`` without changing type.
+
+    ``array`` would silently store ``True`` as ``1`` and ints as floats, so
+    bools (and, for float columns, anything but floats) keep a plain list.
+    """
+    kinds = set(map(type, values))
+    if bool in kinds:
+        return False
+    if column.typecode == _FLOAT_TYPECODE:
+        return all(issubclass(kind, float) for kind in kinds)
+    return True
+
+
+def _extend_column(column: array | list[Any], values: Sequence[Any]) -> array | list[Any]:
+    if isinstance(column, array) and not _fits(column, values):
+        column = column.tolist()
+    if isinstance(column, array):
+        length = len(column)
+        try:
+            column.extend(values)
+            return column
+        except (TypeError, OverflowError):
+            # array.extend() may stop part-way; drop the partial batch and
+            # continue as a plain list.
+            del column[length:]
+            column = column.tolist()
+    column.extend(values)
+    return column
+
+
+class ColumnarBuilder:
+    """Accumulate fetched row batches directly into per-column arrays.
+
+    Integer and float columns are kept in ``array.array`` buffers; a column
+    falls back to a plain list once it sees a null, a bool or a value of
+    another type. Bool columns are always plain lists.
+    """
+
+    def __init__(self, names: Sequence[str]) -> None:
+        self.names = list(names)
+        self._columns: list[array | list[Any]] | None = None
+
+    def extend(self, batch: Sequence[Sequence[Any]]) -> None:
+        if not batch:
+            return
+        values_by_column = list(zip(*batch))
+        if self._columns is None:
+            self._columns = [_empty_column(values[0]) for values in values_by_column]
+        self._columns = [
+            _extend_column(column, values)
+            for column, values in zip(self._columns, values_by_column)
+        ]
+
+    def finish(self) -> "ColumnarResult":
+        columns = self._columns or [[] for _ in self.names]
+        return ColumnarResult(names=self.names, columns=columns)
+
+
+@dataclass(frozen=True)
+class ColumnarResult:
+    names: list[str]
+    columns: list[array | list[Any]]
+
+    @classmethod
+    def from_rows(cls, names: Sequence[str], rows: Iterable[Sequence[Any]]) -> "ColumnarResult":
+        builder = ColumnarBuilder(names)
+        builder.extend(list(rows))
+        return builder.finish()
+
+    @property
+    def row_count(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def column(self, key: str | int) -> array | list[Any]:
+        if isinstance(key, int):
+            if not 0 <= key < len(self.columns):
+                raise KeyError(f"Unknown column index {key}")
+            return self.columns[key]
+        try:
+            return self.columns[self.names.index(key)]
+        except ValueError as exc:
+            raise KeyError(f"Unknown column '{key}'") from exc
+
+    def to_rows(self, limit: int | None = None) -> list[list[Any]]:
+        """Rows as lists; with ``limit`` only the first rows are converted."""
+        columns = self.columns if limit is None else [column[:limit] for column in self.columns]
+        return [list(row) for row in zip(*columns)]
+
+    def sum(self, key: str | int) -> int | float:
+        column = self.column(key)
+        # An int64 sum wraps around silently on overflow; Python ints are exact.
+        if isinstance(column, array) and column.typecode == _INT_TYPECODE:
+            return sum(column)
+        values = _numeric_view(column)
+        if values is not None:
+            return values.sum().item()
+        return sum(_present(column))
+
+    def min(self, key: str | int) -> Any:
+        values = _numeric_view(self.column(key))
+        if values is not None:
+            return values.min().item() if values.size else None
+        present = _present(self.column(key))
+        return min(present) if len(present) else None
+
+    def max(self, key: str | int) -> Any:
+        values = _numeric_view(self.column(key))
+        if values is not None:
+            return values.max().item() if values.size else None
+        present = _present(self.column(key))
+        return max(present) if len(present) else None
+
+    def avg(self, key: str | int) -> float | None:
+        count = len(_present(self.column(key)))
+        return float(self.sum(key)) / count if count else None
+
+    def null_count(self, key: str | int) -> int:
+        column = self.column(key)
+        return 0 if isinstance(column, array) else column.count(None)
+
+    def distinct_count(self, key: str | int) -> int:
+        values = _numeric_view(self.column(key))
+        if values is not None:
+            return int(np.unique(values).size)
+        return len(set(_present(self.column(key))))
+
+
+def _present(column: array | list[Any]) -> array | list[Any]:
+    if isinstance(column, array):
+        return column
+    return [value for value in column if value is not None]
+
+
+def _numeric_view(column: array | list[Any]) -> Any:
+    if np is None or not isinstance(column, array):
+        return None
+    dtype = np.int64 if column.typecode == _INT_TYPECODE else np.float64
+    return np.frombuffer(column, dtype=dtype)
+
+
+__all__ = ["ColumnarBuilder", "ColumnarResult"]
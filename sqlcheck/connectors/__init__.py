@@ -1,5 +1,6 @@
 """Database connector implementations."""
 
-from sqlcheck.connectors.sqlalchemy import SQLAlchemyConnector
+from sqlcheck.connectors.sqlalchemy import PoolOptions, SQLAlchemyConnector
+from sqlcheck.connectors.sqlalchemy_async import AsyncSQLAlchemyConnector
 
-__all__ = ["SQLAlchemyConnector"]
+__all__ = ["AsyncSQLAlchemyConnector", "PoolOptions", "SQLAlchemyConnector"]
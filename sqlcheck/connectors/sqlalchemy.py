@@ -1,24 +1,86 @@
 from __future__ import annotations
 
+import re
 import time
-from contextlib import contextmanager
-from typing import Iterator
+import warnings
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Iterator
 from urllib.parse import urlparse
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, make_url
 from sqlalchemy.exc import NoSuchModuleError, SQLAlchemyError
+from sqlalchemy.pool import QueuePool
 
-from sqlcheck.db_connector import CommandDBConnector, DBSession, ExecutionResult
-from sqlcheck.models import ExecutionOutput, ExecutionStatus, SQLParsed
+from sqlcheck.columnar import ColumnarBuilder, ColumnarResult
+from sqlcheck.connectors.timeouts import (
+    TIMEOUT_ERROR_CODES,
+    StatementWatchdog,
+    Watch,
+    driver_cancel,
+    native_timeout,
+)
+from sqlcheck.db_connector import (
+    SESSION_TEARDOWN_KEY,
+    CommandDBConnector,
+    DBSession,
+    ExecutionResult,
+)
+from sqlcheck.models import ExecutionOutput, ExecutionStatus, SQLParsed, StatementTiming
+from sqlcheck.parser import is_read_only_statement
+from sqlcheck.plans import EXPLAINABLE_PATTERN, PlanError, QueryPlan, explain_sql, parse_plan
+from sqlcheck.retry import classify_error
+
+FETCH_BATCH_SIZE = 1000
+# Connection info key set while a SQLite connection uses explicit BEGIN; holds
+# the pysqlite isolation level to restore.
+_SQLITE_EXPLICIT_BEGIN_KEY = "sqlcheck.sqlite_explicit_begin"
+_STREAMABLE_PATTERN = re.compile(r"^\s*(?:select|with|values|table|show)\b", re.IGNORECASE)
+# Statements that certainly return rows; rows of anything before the last one are dropped.
+_QUERY_PATTERN = re.compile(r"^\s*(?:select|values|table|show)\b", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class PoolOptions:
+    """Connection pool settings; ``None`` keeps the SQLAlchemy default."""
+
+    size: int | None = None
+    max_overflow: int | None = None
+    timeout: float | None = None
+    pre_ping: bool = False
+    recycle: int | None = None
+
+    @classmethod
+    def for_workers(cls, workers: int, **overrides: Any) -> "PoolOptions":
+        """Size the pool so every worker thread can hold a connection at once."""
+        if overrides.get("size") is None:
+            overrides["size"] = max(1, workers)
+        return cls(**overrides)
 
 
 class SQLAlchemyConnector(CommandDBConnector):
     name = "sqlalchemy"
 
-    def __init__(self, connection_uri: str) -> None:
+    def __init__(
+        self,
+        connection_uri: str,
+        max_rows: int | None = None,
+        columnar: bool = False,
+        pool: PoolOptions | None = None,
+        isolation: bool = False,
+        timeout: float | None = None,
+    ) -> None:
         self.connection_uri = connection_uri
+        self.max_rows = max_rows
+        self.columnar = columnar
+        self.pool = pool or PoolOptions()
+        self.isolation = isolation
+        self.timeout = timeout
+        self.watchdog = StatementWatchdog()
         try:
-            self.engine = create_engine(connection_uri)
+            self.engine = create_engine(
+                connection_uri, **_pool_arguments(connection_uri, self.pool)
+            )
         except NoSuchModuleError as exc:
             dialect = _dialect_from_uri(connection_uri)
             hint = _driver_hint(dialect)
@@ -27,55 +89,385 @@ class SQLAlchemyConnector(CommandDBConnector):
                 f"Original error: {exc}"
             )
             raise ValueError(message) from exc
+        event.listen(self.engine, "close", _run_session_teardown)
+        if self.engine.dialect.name == "sqlite":
+            _configure_sqlite_transactions(self.engine)
 
-    def execute(self, sql_parsed: SQLParsed, timeout: float | None = None) -> ExecutionResult:
-        with self.engine.connect() as connection:
-            return self._execute_with_connection(connection, sql_parsed, timeout)
+    def close(self) -> None:
+        self.watchdog.close()
+        self.engine.dispose()
+
+    def identity(self) -> str:
+        return _engine_identity(self.name, self.connection_uri)
+
+    def execute(
+        self,
+        sql_parsed: SQLParsed,
+        timeout: float | None = None,
+        max_rows: int | None = None,
+        columnar: bool | None = None,
+        explain: str | None = None,
+    ) -> ExecutionResult:
+        with self._checkout() as (connection, pool_wait):
+            return self._execute_with_connection(
+                connection, sql_parsed, timeout, max_rows, columnar, pool_wait, explain
+            )
 
     @contextmanager
     def open_session(self) -> Iterator[DBSession]:
-        with self.engine.connect() as connection:
-            def _execute(sql_parsed: SQLParsed, timeout: float | None = None) -> ExecutionResult:
-                return self._execute_with_connection(connection, sql_parsed, timeout)
+        with self._checkout() as (connection, pool_wait):
+            def _execute(
+                sql_parsed: SQLParsed,
+                timeout: float | None = None,
+                max_rows: int | None = None,
+                columnar: bool | None = None,
+                explain: str | None = None,
+            ) -> ExecutionResult:
+                return self._execute_with_connection(
+                    connection, sql_parsed, timeout, max_rows, columnar, pool_wait, explain
+                )
+
+            @contextmanager
+            def _isolate(enabled: bool | None = None) -> Iterator[bool]:
+                if not (self.isolation if enabled is None else enabled):
+                    yield False
+                    return
+                _explicit_sqlite_begin(connection, True)
+                try:
+                    transaction = connection.begin()
+                    try:
+                        yield True
+                    finally:
+                        transaction.rollback()
+                finally:
+                    _explicit_sqlite_begin(connection, False)
 
-            yield DBSession(_execute)
+            yield DBSession(_execute, state=connection.info, isolate=_isolate)
+
+    @contextmanager
+    def _checkout(self) -> Iterator[tuple[Any, float]]:
+        """Check out a pooled connection, timing how long the checkout took."""
+        start = time.perf_counter()
+        with self.engine.connect() as connection:
+            yield connection, time.perf_counter() - start
 
     def _execute_with_connection(
         self,
-        connection: object,
+        connection: Any,
         sql_parsed: SQLParsed,
         timeout: float | None = None,
+        max_rows: int | None = None,
+        columnar: bool | None = None,
+        pool_wait: float = 0.0,
+        explain: str | None = None,
     ) -> ExecutionResult:
-        start = time.perf_counter()
-        stdout = ""
-        stderr = ""
-        rows: list[list[object]] = []
-        returncode = 0
-        success = True
-        try:
-            exec_connection = connection
-            if timeout is not None:
-                exec_connection = connection.execution_options(timeout=timeout)
-            with exec_connection.begin():
-                statements = sql_parsed.statements
-                if not statements:
-                    statements = []
-                for statement in statements or []:
-                    result = exec_connection.exec_driver_sql(statement.text)
-                    if result.returns_rows:
-                        rows = [list(row) for row in result.fetchall()]
-                if not statements and sql_parsed.source.strip():
-                    result = exec_connection.exec_driver_sql(sql_parsed.source)
-                    if result.returns_rows:
-                        rows = [list(row) for row in result.fetchall()]
-        except SQLAlchemyError as exc:
-            success = False
-            returncode = 1
-            stderr = str(exc)
-        duration = time.perf_counter() - start
-        status = ExecutionStatus(success=success, returncode=returncode, duration_s=duration)
-        output = ExecutionOutput(stdout=stdout, stderr=stderr, rows=rows)
-        return ExecutionResult(status=status, output=output)
+        return _execute_statements(
+            connection,
+            sql_parsed,
+            self.timeout if timeout is None else timeout,
+            self.max_rows if max_rows is None else max_rows,
+            self.columnar if columnar is None else columnar,
+            pool_wait,
+            self.watchdog,
+            explain,
+        )
+
+
+def _execute_statements(
+    connection: Any,
+    sql_parsed: SQLParsed,
+    timeout: float | None,
+    limit: int | None,
+    as_columns: bool,
+    pool_wait: float = 0.0,
+    watchdog: StatementWatchdog | None = None,
+    explain: str | None = None,
+) -> ExecutionResult:
+    """Run ``sql_parsed`` in one transaction (a savepoint inside an isolated session).
+
+    ``timeout`` is a deadline for all statements together: ``watchdog``
+    cancels the running statement through the driver once it is overdue.
+    Where the dialect supports it the server also limits each statement to
+    ``timeout`` (see :func:`~sqlcheck.connectors.timeouts.native_timeout`).
+    Only a watchdog cancel or a server timeout error marks the result as
+    timed out; a slow statement that fails for another reason does not. With
+    ``explain`` each explainable statement is EXPLAINed just before it runs
+    (see :func:`_explain_statement`).
+    """
+    start = time.perf_counter()
+    stdout = ""
+    stderr = ""
+    capture = _RowCapture()
+    returncode = 0
+    success = True
+    db_error_code: str | None = None
+    transient = False
+    timings: list[StatementTiming] = []
+    commit_s = 0.0
+    plans: list[QueryPlan] = []
+    native = native_timeout(connection.dialect.name, timeout) if timeout is not None else None
+    watch = Watch(deadline=0.0, cancel=None)
+    nested = connection.in_transaction()
+    try:
+        # Inside an isolated session each call gets a savepoint, so a failing
+        # segment is undone without aborting the enclosing transaction.
+        if nested:
+            transaction = connection.begin_nested()
+        else:
+            transaction = connection.begin()
+        with transaction:
+            if native is not None:
+                connection.exec_driver_sql(native.setup)
+            watching = (
+                watchdog.watch(timeout, driver_cancel(connection.connection.driver_connection))
+                if watchdog is not None and timeout is not None
+                else nullcontext(watch)
+            )
+            texts = _statement_texts(sql_parsed)
+            keep_from = _last_query_index(texts)
+            with watching as watch:
+                for index, text in enumerate(texts):
+                    statement_connection = connection
+                    if (
+                        limit is not None
+                        and index >= keep_from
+                        and _STREAMABLE_PATTERN.match(text)
+                    ):
+                        statement_connection = connection.execution_options(
+                            stream_results=True
+                        )
+                    if explain and EXPLAINABLE_PATTERN.match(text):
+                        plans.append(
+                            _explain_statement(connection, index, text, explain == "analyze")
+                        )
+                    started = time.perf_counter()
+                    executed: float | None = None
+                    try:
+                        result = statement_connection.exec_driver_sql(text)
+                        executed = time.perf_counter()
+                        if result.returns_rows and index < keep_from:
+                            _discard_rows(result)
+                        elif result.returns_rows:
+                            capture = _capture_rows(result, limit, as_columns)
+                    finally:
+                        timings.append(_statement_timing(index, started, executed))
+            committing = time.perf_counter()
+        commit_s = time.perf_counter() - committing
+    except SQLAlchemyError as exc:
+        success = False
+        returncode = 1
+        stderr = str(exc)
+        db_error_code, transient = classify_error(exc)
+    except PlanError as exc:
+        success = False
+        returncode = 1
+        stderr = str(exc)
+    finally:
+        if native is not None and native.reset is not None and (nested or not native.local):
+            _reset_native_timeout(connection, native.reset)
+    duration = time.perf_counter() - start
+    timed_out = (
+        not success
+        and timeout is not None
+        and (watch.fired or db_error_code in TIMEOUT_ERROR_CODES)
+    )
+    if timed_out:
+        stderr = f"Timed out after {timeout:g}s: {stderr}"
+    status = ExecutionStatus(
+        success=success,
+        returncode=returncode,
+        duration_s=duration,
+        pool_wait_s=pool_wait,
+        timed_out=timed_out,
+        db_error_code=db_error_code,
+        # Running into the timeout again is likely; only other errors are retried.
+        transient=transient and not timed_out,
+        statement_timings=timings,
+        commit_s=commit_s,
+    )
+    output = ExecutionOutput(
+        stdout=stdout,
+        stderr=stderr,
+        rows=capture.rows,
+        row_count=capture.row_count,
+        truncated=capture.truncated,
+        columns=capture.columns,
+        columnar=capture.columnar,
+        plans=plans,
+    )
+    return ExecutionResult(status=status, output=output)
+
+
+def _explain_statement(connection: Any, index: int, text: str, analyze: bool) -> QueryPlan:
+    """EXPLAIN the ``index``-th statement on ``connection`` and normalize the plan.
+
+    EXPLAIN ANALYZE executes the statement, so ``analyze`` only applies to
+    statements that do not write (see :func:`~sqlcheck.parser.is_read_only`),
+    which rules out data-modifying CTEs; others get a plain EXPLAIN.
+    """
+    dialect = connection.dialect.name
+    analyze = analyze and is_read_only_statement(text)
+    rows = connection.exec_driver_sql(explain_sql(dialect, text, analyze)).fetchall()
+    return parse_plan(dialect, index, [tuple(row) for row in rows])
+
+
+def _statement_timing(index: int, started: float, executed: float | None) -> StatementTiming:
+    """Split the time since ``started`` at ``executed`` (``None`` when execution failed)."""
+    finished = time.perf_counter()
+    executed = finished if executed is None else executed
+    return StatementTiming(index=index, execute_s=executed - started, fetch_s=finished - executed)
+
+
+def _reset_native_timeout(connection: Any, sql: str) -> None:
+    try:
+        if connection.in_transaction():
+            connection.exec_driver_sql(sql)
+        else:
+            with connection.begin():
+                connection.exec_driver_sql(sql)
+    except SQLAlchemyError as exc:
+        warnings.warn(f"Resetting the statement timeout failed: {exc}", RuntimeWarning)
+
+
+def _statement_texts(sql_parsed: SQLParsed) -> list[str]:
+    texts = [statement.text for statement in sql_parsed.statements]
+    if not texts and sql_parsed.source.strip():
+        texts = [sql_parsed.source]
+    return texts
+
+
+def _last_query_index(texts: list[str]) -> int:
+    """Index of the last statement that is certainly a query, or 0 when there is none.
+
+    A later query replaces the rows of every statement before it, so those
+    are run to completion without being kept.
+    """
+    for index in range(len(texts) - 1, -1, -1):
+        if _QUERY_PATTERN.match(texts[index]):
+            return index
+    return 0
+
+
+def _discard_rows(result: Any) -> None:
+    """Run ``result`` to completion batch by batch, keeping none of its rows."""
+    while result.fetchmany(FETCH_BATCH_SIZE):
+        pass
+    result.close()
+
+
+def _configure_sqlite_transactions(engine: Any) -> None:
+    """Let SQLAlchemy issue BEGIN for SQLite connections in isolated sessions.
+
+    pysqlite only opens a transaction before DML, so DDL would commit
+    immediately and SAVEPOINTs misbehave. This is the recipe from the
+    SQLAlchemy SQLite dialect documentation, applied per connection by
+    :func:`_explicit_sqlite_begin` so that other sessions keep pysqlite's
+    behavior and can run statements such as VACUUM that refuse transactions.
+    """
+    event.listen(engine, "begin", _emit_sqlite_begin)
+
+
+def _emit_sqlite_begin(connection: Any) -> None:
+    if _SQLITE_EXPLICIT_BEGIN_KEY in connection.info:
+        connection.exec_driver_sql("BEGIN")
+
+
+def _explicit_sqlite_begin(connection: Any, enabled: bool) -> None:
+    """Switch a SQLite connection to (or back from) explicit BEGIN; no-op on other dialects."""
+    if connection.dialect.name != "sqlite":
+        return
+    dbapi_connection = connection.connection.dbapi_connection
+    if enabled:
+        connection.info[_SQLITE_EXPLICIT_BEGIN_KEY] = dbapi_connection.isolation_level
+        dbapi_connection.isolation_level = None
+    elif _SQLITE_EXPLICIT_BEGIN_KEY in connection.info:
+        dbapi_connection.isolation_level = connection.info.pop(_SQLITE_EXPLICIT_BEGIN_KEY)
+
+
+def _run_session_teardown(dbapi_connection: Any, connection_record: Any) -> None:
+    """Pool ``close`` hook: run teardown SQL registered on this connection's session state."""
+    teardowns = connection_record.info.pop(SESSION_TEARDOWN_KEY, None)
+    if not teardowns or dbapi_connection is None:
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        for sql_parsed in reversed(teardowns):
+            for text in _statement_texts(sql_parsed):
+                cursor.execute(text)
+        dbapi_connection.commit()
+    except Exception as exc:  # noqa: BLE001 - the connection is going away regardless
+        warnings.warn(f"Session teardown failed: {exc}", RuntimeWarning, stacklevel=2)
+    finally:
+        cursor.close()
+
+
+@dataclass(frozen=True)
+class _RowCapture:
+    rows: list[list[object]] = field(default_factory=list)
+    row_count: int | None = None
+    truncated: bool = False
+    columns: list[str] = field(default_factory=list)
+    columnar: ColumnarResult | None = None
+
+
+def _capture_rows(result: Any, limit: int | None, columnar: bool) -> _RowCapture:
+    """Fetch ``result`` in batches, keeping at most ``limit`` rows.
+
+    Rows past the limit are still fetched so the full row count can be
+    reported, but they are discarded batch by batch. With ``columnar`` the
+    kept rows go straight into per-column arrays instead of row lists.
+    """
+    columns = [str(name) for name in result.keys()]
+    if limit is None and not columnar:
+        rows = [list(row) for row in result.fetchall()]
+        return _RowCapture(rows=rows, row_count=len(rows), columns=columns)
+    rows: list[list[object]] = []
+    builder = ColumnarBuilder(columns) if columnar else None
+    kept = 0
+    row_count = 0
+    while True:
+        batch = result.fetchmany(FETCH_BATCH_SIZE)
+        if not batch:
+            break
+        row_count += len(batch)
+        if limit is not None and kept >= limit:
+            continue
+        if limit is not None:
+            batch = batch[: limit - kept]
+        kept += len(batch)
+        if builder is not None:
+            builder.extend(batch)
+        else:
+            rows.extend(list(row) for row in batch)
+    return _RowCapture(
+        rows=rows,
+        row_count=row_count,
+        truncated=row_count > kept,
+        columns=columns,
+        columnar=builder.finish() if builder is not None else None,
+    )
+
+
+def _pool_arguments(connection_uri: str, options: PoolOptions) -> dict[str, Any]:
+    arguments: dict[str, Any] = {"pool_pre_ping": options.pre_ping}
+    if options.recycle is not None:
+        arguments["pool_recycle"] = options.recycle
+    url = make_url(connection_uri)
+    pool_class = url.get_dialect().get_pool_class(url)
+    # Size limits only apply to queue pools; SQLite memory databases and
+    # NullPool dialects reject them.
+    if issubclass(pool_class, QueuePool):
+        if options.size is not None:
+            arguments["pool_size"] = options.size
+        if options.max_overflow is not None:
+            arguments["max_overflow"] = options.max_overflow
+        if options.timeout is not None:
+            arguments["pool_timeout"] = options.timeout
+    return arguments
+
+
+def _engine_identity(name: str, connection_uri: str) -> str:
+    return f"{name}:{make_url(connection_uri).render_as_string(hide_password=True)}"
 
 
 def _dialect_from_uri(connection_uri: str) -> str:
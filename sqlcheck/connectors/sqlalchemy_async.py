@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from sqlalchemy.exc import InvalidRequestError, NoSuchModuleError
+
+from sqlcheck.connectors.sqlalchemy import (
+    PoolOptions,
+    _configure_sqlite_transactions,
+    _dialect_from_uri,
+    _driver_hint,
+    _engine_identity,
+    _execute_statements,
+    _explicit_sqlite_begin,
+    _pool_arguments,
+)
+from sqlcheck.connectors.timeouts import StatementWatchdog
+from sqlcheck.db_connector import AsyncDBConnector, AsyncDBSession, ExecutionResult
+from sqlcheck.models import SQLParsed
+
+
+class AsyncSQLAlchemyConnector(AsyncDBConnector):
+    """Run tests on an ``sqlalchemy.ext.asyncio`` engine.
+
+    Requires an async driver in the URI (e.g. ``postgresql+asyncpg://``).
+    Statements run through ``AsyncConnection.run_sync`` so row capture
+    behaves exactly like :class:`SQLAlchemyConnector`.
+    """
+
+    name = "sqlalchemy-async"
+
+    def __init__(
+        self,
+        connection_uri: str,
+        max_rows: int | None = None,
+        columnar: bool = False,
+        pool: PoolOptions | None = None,
+        isolation: bool = False,
+        timeout: float | None = None,
+    ) -> None:
+        self.connection_uri = connection_uri
+        self.max_rows = max_rows
+        self.columnar = columnar
+        self.pool = pool or PoolOptions()
+        self.isolation = isolation
+        self.timeout = timeout
+        self.watchdog = StatementWatchdog()
+        try:
+            from sqlalchemy.ext.asyncio import create_async_engine
+        except ImportError as exc:
+            raise ValueError(
+                "The async engine requires greenlet. Install the optional dependency with: "
+                f"pip install sqlcheck[async]. Original error: {exc}"
+            ) from exc
+        try:
+            self.engine = create_async_engine(
+                connection_uri, **_pool_arguments(connection_uri, self.pool)
+            )
+        except NoSuchModuleError as exc:
+            dialect = _dialect_from_uri(connection_uri)
+            hint = _driver_hint(dialect)
+            message = (
+                f"Missing SQLAlchemy driver for '{dialect}'. {hint} "
+                f"Original error: {exc}"
+            )
+            raise ValueError(message) from exc
+        except InvalidRequestError as exc:
+            raise ValueError(
+                "The async engine needs an async driver in the connection URI, "
+                f"e.g. postgresql+asyncpg:// or sqlite+aiosqlite://. Original error: {exc}"
+            ) from exc
+        if self.engine.dialect.name == "sqlite":
+            _configure_sqlite_transactions(self.engine.sync_engine)
+
+    async def execute(
+        self,
+        sql_parsed: SQLParsed,
+        timeout: float | None = None,
+        max_rows: int | None = None,
+        columnar: bool | None = None,
+        explain: str | None = None,
+    ) -> ExecutionResult:
+        async with self._checkout() as (connection, pool_wait):
+            return await self._execute_with_connection(
+                connection, sql_parsed, timeout, max_rows, columnar, pool_wait, explain
+            )
+
+    @asynccontextmanager
+    async def open_session(self) -> AsyncIterator[AsyncDBSession]:
+        async with self._checkout() as (connection, pool_wait):
+            async def _execute(
+                sql_parsed: SQLParsed,
+                timeout: float | None = None,
+                max_rows: int | None = None,
+                columnar: bool | None = None,
+                explain: str | None = None,
+            ) -> ExecutionResult:
+                return await self._execute_with_connection(
+                    connection, sql_parsed, timeout, max_rows, columnar, pool_wait, explain
+                )
+
+            @asynccontextmanager
+            async def _isolate(enabled: bool | None = None) -> AsyncIterator[bool]:
+                if not (self.isolation if enabled is None else enabled):
+                    yield False
+                    return
+                await connection.run_sync(_explicit_sqlite_begin, True)
+                try:
+                    transaction = await connection.begin()
+                    try:
+                        yield True
+                    finally:
+                        await transaction.rollback()
+                finally:
+                    await connection.run_sync(_explicit_sqlite_begin, False)
+
+            yield AsyncDBSession(_execute, isolate=_isolate)
+
+    async def close(self) -> None:
+        self.watchdog.close()
+        await self.engine.dispose()
+
+    def identity(self) -> str:
+        return _engine_identity(self.name, self.connection_uri)
+
+    @asynccontextmanager
+    async def _checkout(self) -> AsyncIterator[tuple[Any, float]]:
+        start = time.perf_counter()
+        async with self.engine.connect() as connection:
+            yield connection, time.perf_counter() - start
+
+    async def _execute_with_connection(
+        self,
+        connection: Any,
+        sql_parsed: SQLParsed,
+        timeout: float | None = None,
+        max_rows: int | None = None,
+        columnar: bool | None = None,
+        pool_wait: float = 0.0,
+        explain: str | None = None,
+    ) -> ExecutionResult:
+        return await connection.run_sync(
+            _execute_statements,
+            sql_parsed,
+            self.timeout if timeout is None else timeout,
+            self.max_rows if max_rows is None else max_rows,
+            self.columnar if columnar is None else columnar,
+            pool_wait,
+            self.watchdog,
+            explain,
+        )
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import heapq
+import inspect
+import itertools
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+# Error codes of statements the server aborted for running past their timeout:
+# PostgreSQL query_canceled, MySQL ER_QUERY_TIMEOUT, MariaDB ER_STATEMENT_TIMEOUT.
+TIMEOUT_ERROR_CODES = frozenset({"57014", "3024", "1969"})
+
+@dataclass(frozen=True)
+class NativeTimeout:
+    """SQL that makes the server enforce a statement timeout for this connection.
+
+    ``setup`` runs inside the segment's transaction, before its statements;
+    ``reset`` runs afterwards. A ``local`` setting ends with the transaction,
+    so it only needs resetting when the segment ran in a savepoint of an
+    enclosing transaction (an isolated session), which it would outlive.
+    """
+
+    setup: str
+    reset: str | None = None
+    local: bool = False
+
+
+def native_timeout(dialect: str, timeout: float) -> NativeTimeout | None:
+    """Server-side timeout for ``dialect``, or ``None`` when it has none we can set.
+
+    Servers limit each statement on its own, so this only backs up the
+    watchdog, whose deadline covers the whole segment. MySQL's
+    ``MAX_EXECUTION_TIME`` only applies to read-only SELECT statements.
+    """
+    milliseconds = max(1, int(timeout * 1000))
+    if dialect == "postgresql":
+        return NativeTimeout(
+            f"SET LOCAL statement_timeout = {milliseconds}",
+            "SET LOCAL statement_timeout = DEFAULT",
+            local=True,
+        )
+    if dialect == "mysql":
+        return NativeTimeout(
+            f"SET SESSION MAX_EXECUTION_TIME = {milliseconds}",
+            "SET SESSION MAX_EXECUTION_TIME = DEFAULT",
+        )
+    if dialect == "mariadb":
+        return NativeTimeout(
+            f"SET SESSION max_statement_time = {milliseconds / 1000:.3f}",
+            "SET SESSION max_statement_time = DEFAULT",
+        )
+    if dialect == "snowflake":
+        return NativeTimeout(
+            f"ALTER SESSION SET STATEMENT_TIMEOUT_IN_SECONDS = {max(1, round(timeout))}",
+            "ALTER SESSION UNSET STATEMENT_TIMEOUT_IN_SECONDS",
+        )
+    return None
+
+
+def driver_cancel(driver_connection: Any) -> Callable[[], Any] | None:
+    """A thread-safe call that aborts the statement running on a DBAPI connection.
+
+    sqlite3 and DuckDB connections have ``interrupt()``; psycopg, psycopg2
+    and oracledb connections have ``cancel()``. Async wrappers such as
+    aiosqlite keep the underlying sqlite3 connection in ``_conn``.
+    """
+    for candidate in (driver_connection, getattr(driver_connection, "_conn", None)):
+        for name in ("interrupt", "cancel"):
+            method = getattr(candidate, name, None)
+            if callable(method) and not inspect.iscoroutinefunction(method):
+                return method
+    return None
+
+
+@dataclass(eq=False)
+class Watch:
+    """One watched statement; ``fired`` is set once the watchdog cancelled it."""
+
+    deadline: float
+    cancel: Callable[[], Any] | None
+    fired: bool = False
+    done: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class StatementWatchdog:
+    """Background thread that cancels statements still running past their deadline.
+
+    Cancelling frees the worker thread and its pooled connection as soon as
+    the driver aborts the statement, even when the server never enforces
+    the timeout itself. The thread starts with the first watched statement.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._heap: list[tuple[float, int, Watch]] = []
+        self._counter = itertools.count()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    @contextmanager
+    def watch(self, timeout: float | None, cancel: Callable[[], Any] | None) -> Iterator[Watch]:
+        watch = Watch(deadline=time.monotonic() + (timeout or 0.0), cancel=cancel)
+        if timeout is None or cancel is None:
+            yield watch
+            return
+        with self._condition:
+            heapq.heappush(self._heap, (watch.deadline, next(self._counter), watch))
+            if self._thread is None or not self._thread.is_alive():
+                self._closed = False
+                self._thread = threading.Thread(
+                    target=self._run, name="sqlcheck-watchdog", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+        try:
+            yield watch
+        finally:
+            # Waits for a cancel in progress, so it cannot hit the next statement.
+            with watch.lock:
+                watch.done = True
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed:
+                    while self._heap and self._heap[0][2].done:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    delay = self._heap[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._condition.wait(delay)
+                if self._closed:
+                    return
+                watch = heapq.heappop(self._heap)[2]
+            self._cancel(watch)
+
+    @staticmethod
+    def _cancel(watch: Watch) -> None:
+        with watch.lock:
+            if watch.done or watch.cancel is None:
+                return
+            watch.fired = True
+            try:
+                watch.cancel()
+            except Exception as exc:  # noqa: BLE001 - the statement keeps running
+                warnings.warn(f"Cancelling a statement failed: {exc}", RuntimeWarning)
+
+
+__all__ = [
+    "NativeTimeout",
+    "StatementWatchdog",
+    "TIMEOUT_ERROR_CODES",
+    "Watch",
+    "driver_cancel",
+    "native_timeout",
+]
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from contextlib import contextmanager
-from dataclasses import dataclass
-from typing import Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Protocol
 
 from sqlcheck.models import ExecutionOutput, ExecutionStatus, SQLParsed
 
@@ -13,32 +13,131 @@ class ExecutionResult:
     output: ExecutionOutput
 
 
+# Session state key for teardown SQL (``SQLParsed``) to run when the
+# underlying connection is closed.
+SESSION_TEARDOWN_KEY = "sqlcheck.teardown"
+
+
+def _no_isolation(enabled: bool | None = None) -> nullcontext[bool]:
+    return nullcontext(False)
+
+
+class SessionExecute(Protocol):
+    """Signature of :attr:`DBSession.execute`, matching :meth:`DBConnector.execute`."""
+
+    def __call__(
+        self,
+        sql_parsed: SQLParsed,
+        timeout: float | None = None,
+        max_rows: int | None = None,
+        columnar: bool | None = None,
+        explain: str | None = None,
+    ) -> ExecutionResult: ...
+
+
+class AsyncSessionExecute(Protocol):
+    """Signature of :attr:`AsyncDBSession.execute`."""
+
+    def __call__(
+        self,
+        sql_parsed: SQLParsed,
+        timeout: float | None = None,
+        max_rows: int | None = None,
+        columnar: bool | None = None,
+        explain: str | None = None,
+    ) -> Awaitable[ExecutionResult]: ...
+
+
 @dataclass(frozen=True)
 class DBSession:
-    execute: Callable[[SQLParsed, float | None], ExecutionResult]
+    execute: SessionExecute
+    # Per-connection state; lives as long as the underlying connection, so
+    # pooled connectors share it across sessions on the same connection.
+    state: dict[str, Any] = field(default_factory=dict)
+    # ``with session.isolate(enabled) as isolated:`` rolls back everything
+    # executed inside the block and yields whether it does; ``enabled=None``
+    # uses the connector default. Connectors without transactions leave it a
+    # no-op that yields ``False``.
+    isolate: Callable[[bool | None], Any] = _no_isolation
 
 
 class DBConnector:
     name = "base"
 
-    def execute(self, sql_parsed: SQLParsed, timeout: float | None = None) -> ExecutionResult:
+    def execute(
+        self,
+        sql_parsed: SQLParsed,
+        timeout: float | None = None,
+        max_rows: int | None = None,
+        columnar: bool | None = None,
+        explain: str | None = None,
+    ) -> ExecutionResult:
         raise NotImplementedError
 
     @contextmanager
     def open_session(self) -> Iterator[DBSession]:
         yield DBSession(self.execute)
 
+    def identity(self) -> str:
+        """Identify the target database, e.g. in result cache keys."""
+        return self.name
+
+    def close(self) -> None:
+        """Release connections; runs any pending session teardown."""
+
 
 class CommandDBConnector(DBConnector):
     pass
 
 
-from sqlcheck.connectors.sqlalchemy import SQLAlchemyConnector
+@dataclass(frozen=True)
+class AsyncDBSession:
+    execute: AsyncSessionExecute
+    # ``async with session.isolate(enabled):``; see :class:`DBSession`.
+    isolate: Callable[[bool | None], Any] = _no_isolation
+
+
+class AsyncDBConnector:
+    """Asyncio counterpart of :class:`DBConnector` for ``--engine async``."""
+
+    name = "base"
+
+    async def execute(
+        self,
+        sql_parsed: SQLParsed,
+        timeout: float | None = None,
+        max_rows: int | None = None,
+        columnar: bool | None = None,
+        explain: str | None = None,
+    ) -> ExecutionResult:
+        raise NotImplementedError
+
+    @asynccontextmanager
+    async def open_session(self) -> AsyncIterator[AsyncDBSession]:
+        yield AsyncDBSession(self.execute)
+
+    def identity(self) -> str:
+        """Identify the target database, e.g. in result cache keys."""
+        return self.name
+
+    async def close(self) -> None:
+        """Release resources bound to the running event loop."""
+
+
+from sqlcheck.connectors.sqlalchemy import PoolOptions, SQLAlchemyConnector
+from sqlcheck.connectors.sqlalchemy_async import AsyncSQLAlchemyConnector
 
 __all__ = [
+    "AsyncDBConnector",
+    "AsyncDBSession",
+    "AsyncSQLAlchemyConnector",
+    "AsyncSessionExecute",
     "CommandDBConnector",
     "DBConnector",
     "DBSession",
     "ExecutionResult",
+    "PoolOptions",
+    "SESSION_TEARDOWN_KEY",
     "SQLAlchemyConnector",
+    "SessionExecute",
 ]
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Mapping, Sequence
+
+from sqlcheck.models import TestCase
+
+
+class DependencyError(ValueError):
+    pass
+
+
+def provided_keys(case: TestCase) -> list[str]:
+    """Keys other tests can list in ``depends_on``: the test name and its ``provides``."""
+    return [case.metadata.name, *case.metadata.provides]
+
+
+@dataclass
+class DependencyGraph:
+    """Prerequisite edges between cases, by index into the case list.
+
+    ``blocked`` maps cases that can never run to the reason: an unknown or
+    already failed prerequisite, or membership in a dependency cycle.
+    """
+
+    prerequisites: list[set[int]]
+    dependents: list[list[int]]
+    blocked: dict[int, str] = field(default_factory=dict)
+    cycles: list[list[int]] = field(default_factory=list)
+
+
+def build_dependency_graph(
+    cases: Sequence[TestCase],
+    outcomes: Mapping[str, bool] | None = None,
+) -> DependencyGraph:
+    """Link each case to the cases providing its ``depends_on`` keys.
+
+    ``outcomes`` holds keys provided by tests that already finished (``True``
+    when they all passed); those satisfy or block a dependency without an edge.
+    """
+    outcomes = outcomes or {}
+    providers: dict[str, list[int]] = defaultdict(list)
+    for index, case in enumerate(cases):
+        for key in provided_keys(case):
+            providers[key].append(index)
+
+    prerequisites: list[set[int]] = [set() for _ in cases]
+    dependents: list[list[int]] = [[] for _ in cases]
+    blocked: dict[int, str] = {}
+    for index, case in enumerate(cases):
+        for key in case.metadata.depends_on:
+            if key in outcomes and not outcomes[key]:
+                blocked.setdefault(index, f"prerequisite '{key}' did not pass")
+            elif key not in outcomes and key not in providers:
+                blocked.setdefault(index, f"unknown dependency '{key}'")
+            for provider in providers.get(key, []):
+                if provider not in prerequisites[index]:
+                    prerequisites[index].add(provider)
+                    dependents[provider].append(index)
+
+    cycles = find_cycles(prerequisites)
+    for cycle in cycles:
+        names = " -> ".join(cases[index].metadata.name for index in [*cycle, cycle[0]])
+        for index in cycle:
+            blocked.setdefault(index, f"dependency cycle {names}")
+    return DependencyGraph(prerequisites, dependents, blocked, cycles)
+
+
+def find_cycles(prerequisites: Sequence[set[int]]) -> list[list[int]]:
+    """Strongly connected components that form cycles (Tarjan, iterative)."""
+    index_of: dict[int, int] = {}
+    lowlink: dict[int, int] = {}
+    stack: list[int] = []
+    on_stack: set[int] = set()
+    cycles: list[list[int]] = []
+    counter = 0
+    for root in range(len(prerequisites)):
+        if root in index_of:
+            continue
+        work = [(root, iter(sorted(prerequisites[root])))]
+        index_of[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, edges = work[-1]
+            for target in edges:
+                if target not in index_of:
+                    index_of[target] = lowlink[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(sorted(prerequisites[target]))))
+                    break
+                if target in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[target])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in prerequisites[node]:
+                        cycles.append(sorted(component))
+    return cycles
+
+
+def dependency_components(cases: Sequence[TestCase]) -> list[list[int]]:
+    """Indexes of cases linked through ``depends_on``, in input order, one list per group.
+
+    Cases without dependencies form groups of one.
+    """
+    parent = list(range(len(cases)))
+
+    def _root(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for index, prerequisites in enumerate(build_dependency_graph(cases).prerequisites):
+        for provider in prerequisites:
+            parent[_root(provider)] = _root(index)
+    components: dict[int, list[int]] = defaultdict(list)
+    for index in range(len(cases)):
+        components[_root(index)].append(index)
+    return sorted(components.values())
+
+
+def validate_dependencies(cases: Sequence[TestCase]) -> None:
+    """Raise :class:`DependencyError` for unknown dependencies or cycles."""
+    graph = build_dependency_graph(cases)
+    if not graph.blocked:
+        return
+    problems = [
+        f"{cases[index].path}: {reason}" for index, reason in sorted(graph.blocked.items())
+    ]
+    raise DependencyError("Invalid test dependencies:\n" + "\n".join(problems))
+
+
+__all__ = [
+    "DependencyError",
+    "DependencyGraph",
+    "build_dependency_graph",
+    "dependency_components",
+    "find_cycles",
+    "provided_keys",
+    "validate_dependencies",
+]
@@ -1,32 +1,152 @@
 from __future__ import annotations
 
+import concurrent.futures
+import multiprocessing
+from functools import partial
 from pathlib import Path
+from typing import Callable, Iterator, Sequence, TypeVar
 
-from sqlcheck.models import DirectiveCall, TestCase, TestMetadata
-from sqlcheck.parser import ParsedFile, parse_file, summarize_directives
+from sqlcheck.cache import ParseCache
+from sqlcheck.models import DirectiveCall, Fixture, SQLParsed, TestCase, TestMetadata
+from sqlcheck.parser import (
+    DirectiveParseError,
+    ParsedFile,
+    parse_source,
+    summarize_directives,
+)
+
+T = TypeVar("T")
+
+# Files under a directory with this name are fixtures, not tests.
+FIXTURE_DIR = "_fixtures"
+FIXTURE_SCOPES = ("run", "worker")
 
 
 def discover_files(target: Path, pattern: str) -> list[Path]:
     if target.is_file():
         return [target]
-    return sorted(target.rglob(pattern))
+    return [path for path in sorted(target.rglob(pattern)) if FIXTURE_DIR not in path.parts]
+
+
+def discover_fixtures(target: Path) -> list[Path]:
+    root = target if target.is_dir() else target.parent
+    return sorted(root.rglob(f"{FIXTURE_DIR}/*.sql"))
 
 
-def build_test_case(path: Path) -> TestCase:
-    parsed: ParsedFile = parse_file(path)
-    directives = parsed.directives or [DirectiveCall(name="success", args=(), kwargs={}, raw="")]
-    summary = summarize_directives(directives)
+def _default_directives(parsed: ParsedFile) -> list[DirectiveCall]:
+    return parsed.directives or [DirectiveCall(name="success", args=(), kwargs={}, raw="")]
+
+
+def _parse_test_source(path: Path, source: str) -> tuple[ParsedFile, TestMetadata]:
+    parsed = parse_source(source)
+    summary = summarize_directives(_default_directives(parsed))
     metadata = TestMetadata(
         name=summary["name"] or path.stem,
         tags=summary["tags"],
         serial=summary["serial"],
         timeout=summary["timeout"],
         retries=summary["retries"],
+        depends_on=summary["depends_on"],
+        provides=summary["provides"],
+        fixtures=summary["fixtures"],
+        isolated=summary["isolated"],
+        retry_backoff=summary["retry_backoff"],
+    )
+    return parsed, metadata
+
+
+def parse_test_file(
+    path: Path,
+    cache: ParseCache | None = None,
+) -> tuple[ParsedFile, TestMetadata]:
+    if cache is not None:
+        return cache.load(path, _parse_test_source)
+    return _parse_test_source(path, path.read_text(encoding="utf-8"))
+
+
+def _parse_fixture_source(path: Path, source: str) -> Fixture:
+    parsed = parse_source(source)
+    kwargs: dict[str, object] = {}
+    for directive in parsed.directives:
+        if directive.name == "fixture":
+            kwargs.update(directive.kwargs)
+    scope = str(kwargs.get("scope", "run"))
+    if scope not in FIXTURE_SCOPES:
+        expected = ", ".join(FIXTURE_SCOPES)
+        raise DirectiveParseError(
+            f"Invalid fixture scope '{scope}' in {path}. Expected one of: {expected}"
+        )
+    setup: list[SQLParsed] = []
+    teardown: list[SQLParsed] = []
+    for segment in parsed.segments:
+        (teardown if segment.directive.name == "teardown" else setup).append(segment.sql_parsed)
+    return Fixture(
+        name=str(kwargs.get("name", path.stem)),
+        path=path,
+        scope=scope,
+        setup=_join_sql(setup),
+        teardown=_join_sql(teardown) if teardown else None,
+    )
+
+
+def _join_sql(parts: Sequence[SQLParsed]) -> SQLParsed:
+    return SQLParsed(
+        source="".join(part.source for part in parts),
+        statements=[statement for part in parts for statement in part.statements],
     )
+
+
+def build_fixture(path: Path, cache: ParseCache | None = None) -> Fixture:
+    """Parse a fixture file: ``{{ fixture(...) }}`` setup SQL, then ``{{ teardown() }}`` SQL."""
+    if cache is not None:
+        return cache.load(path, _parse_fixture_source)
+    return _parse_fixture_source(path, path.read_text(encoding="utf-8"))
+
+
+def build_test_case(path: Path, cache: ParseCache | None = None) -> TestCase:
+    parsed, metadata = parse_test_file(path, cache)
     return TestCase(
         path=path,
         sql_parsed=parsed.sql_parsed,
-        directives=directives,
+        directives=_default_directives(parsed),
         segments=parsed.segments,
         metadata=metadata,
     )
+
+
+def _map_paths(
+    func: Callable[[Path], T],
+    paths: Sequence[Path],
+    workers: int,
+) -> Iterator[T]:
+    """Apply ``func`` to ``paths`` across a process pool, yielding in path order.
+
+    Results are yielded as soon as every earlier path is done, so consumers can
+    start on the first files while later ones are still being parsed. Workers are
+    spawned rather than forked because the caller may already be running SQL on
+    other threads.
+    """
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield func(path)
+        return
+    chunksize = max(1, min(32, len(paths) // (workers * 4)))
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        yield from executor.map(func, paths, chunksize=chunksize)
+
+
+def iter_parsed_files(
+    paths: Sequence[Path],
+    cache: ParseCache | None = None,
+    workers: int = 1,
+) -> Iterator[tuple[ParsedFile, TestMetadata]]:
+    return _map_paths(partial(parse_test_file, cache=cache), paths, workers)
+
+
+def iter_test_cases(
+    paths: Sequence[Path],
+    cache: ParseCache | None = None,
+    workers: int = 1,
+) -> Iterator[TestCase]:
+    return _map_paths(partial(build_test_case, cache=cache), paths, workers)
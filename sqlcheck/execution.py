@@ -1,72 +1,982 @@
 from __future__ import annotations
 
+import asyncio
 import concurrent.futures
-from typing import Iterable
+import heapq
+import multiprocessing
+import queue
+import threading
+import time
+import traceback
+from collections import defaultdict, deque
+from dataclasses import fields, replace
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Mapping, Sequence
 
-from sqlcheck.db_connector import DBConnector, ExecutionResult
+from sqlcheck.benchmarking import BenchmarkRun, benchmark_runs
+from sqlcheck.cache import ResultCache
+from sqlcheck.db_connector import (
+    AsyncDBConnector,
+    AsyncDBSession,
+    DBConnector,
+    DBSession,
+    ExecutionResult,
+)
+from sqlcheck.dependencies import DependencyError, build_dependency_graph, provided_keys
+from sqlcheck.fixtures import FixtureError, FixtureManager
 from sqlcheck.function_context import execution_context
-from sqlcheck.function_registry import FunctionRegistry
-from sqlcheck.models import FunctionResult, TestCase, TestResult
+from sqlcheck.function_registry import FunctionRegistry, default_registry
+from sqlcheck.models import (
+    ExecutionOutput,
+    ExecutionStatus,
+    FunctionResult,
+    SQLSegment,
+    TestCase,
+    TestResult,
+)
+from sqlcheck.parser import is_read_only
+from sqlcheck.plugins import load_plugins
+from sqlcheck.retry import RetryPolicy
+from sqlcheck.sharding import estimate_durations
+
+# Directive kwargs consumed by the runner rather than passed to the function.
+RUNNER_KWARGS = frozenset({"exit_on_failure", "max_rows", "columnar", "cache", "explain"})
+
+
+def _execute_kwargs(case: TestCase, segment: SQLSegment) -> dict[str, Any]:
+    execute_kwargs: dict[str, Any] = {"timeout": case.metadata.timeout}
+    if segment.directive.kwargs.get("max_rows") is not None:
+        execute_kwargs["max_rows"] = int(segment.directive.kwargs["max_rows"])
+    if segment.directive.kwargs.get("columnar") is not None:
+        execute_kwargs["columnar"] = bool(segment.directive.kwargs["columnar"])
+    explain = _explain_mode(segment)
+    if explain is not None:
+        execute_kwargs["explain"] = explain
+    return execute_kwargs
+
+
+def _explain_mode(segment: SQLSegment) -> str | None:
+    """``"plan"`` or ``"analyze"`` when the segment's plans are captured, else ``None``.
+
+    ``plan()`` always captures them (``analyze=True`` for EXPLAIN ANALYZE);
+    any other directive opts in with ``explain=True`` or ``explain="analyze"``.
+    """
+    kwargs = segment.directive.kwargs
+    setting = kwargs.get("explain")
+    if setting is None and segment.directive.name == "plan":
+        setting = "analyze" if kwargs.get("analyze") else True
+    if not setting:
+        return None
+    return "analyze" if setting == "analyze" else "plan"
+
+
+def _evaluate_segment(
+    segment: SQLSegment,
+    execution: ExecutionResult,
+    registry: FunctionRegistry,
+    path: Path | None = None,
+) -> tuple[FunctionResult, bool]:
+    """Run the segment's directive; return its result and whether to stop the case."""
+    exit_on_failure = segment.directive.kwargs.get("exit_on_failure", True)
+    func = registry.resolve(segment.directive.name)
+    kwargs = {
+        key: value
+        for key, value in segment.directive.kwargs.items()
+        if key not in RUNNER_KWARGS
+    }
+    with execution_context(
+        segment.sql_parsed, execution.status, execution.output, path, registry.update_baselines
+    ):
+        result = func(*segment.directive.args, **kwargs)
+    return result, bool(exit_on_failure and not result.success)
+
+
+def _build_result(
+    case: TestCase,
+    execution: ExecutionResult | None,
+    function_results: list[FunctionResult],
+    cache_hit: bool = False,
+    segments: list[ExecutionStatus] | None = None,
+) -> TestResult:
+    if execution is None:
+        raise RuntimeError("Execution never started")
+    return TestResult(
+        case=case,
+        status=replace(execution.status, cache_hit=cache_hit),
+        output=execution.output,
+        function_results=function_results,
+        segments=segments or [],
+    )
+
+
+def _evaluated(execution: ExecutionResult, started: float) -> ExecutionStatus:
+    """Segment status with the time its directive took to evaluate since ``started``."""
+    return replace(execution.status, evaluate_s=time.perf_counter() - started)
+
+
+def _with_attempts(execution: ExecutionResult, attempt: int, backoff: float) -> ExecutionResult:
+    status = replace(execution.status, attempts=attempt + 1, backoff_s=backoff)
+    return ExecutionResult(status=status, output=execution.output)
+
+
+def _execute_with_retries(
+    session: DBSession,
+    segment: SQLSegment,
+    execute_kwargs: Mapping[str, Any],
+    policy: RetryPolicy,
+) -> ExecutionResult:
+    """Execute ``segment``, retrying transient errors after a backoff (see ``sqlcheck.retry``)."""
+    backoff = 0.0
+    attempt = 0
+    while True:
+        execution = session.execute(segment.sql_parsed, **execute_kwargs)
+        if not policy.should_retry(execution.status, attempt):
+            return _with_attempts(execution, attempt, backoff)
+        delay = policy.delay(attempt)
+        time.sleep(delay)
+        backoff += delay
+        attempt += 1
+
+
+async def _execute_with_retries_async(
+    session: AsyncDBSession,
+    segment: SQLSegment,
+    execute_kwargs: Mapping[str, Any],
+    policy: RetryPolicy,
+) -> ExecutionResult:
+    backoff = 0.0
+    attempt = 0
+    while True:
+        execution = await session.execute(segment.sql_parsed, **execute_kwargs)
+        if not policy.should_retry(execution.status, attempt):
+            return _with_attempts(execution, attempt, backoff)
+        delay = policy.delay(attempt)
+        await asyncio.sleep(delay)
+        backoff += delay
+        attempt += 1
+
+
+def _benchmark(
+    session: DBSession,
+    segment: SQLSegment,
+    execute_kwargs: Mapping[str, Any],
+    execution: ExecutionResult,
+) -> ExecutionResult:
+    """Re-run a ``benchmark()`` segment on the same session, recording its samples.
+
+    ``execution`` is the first of ``warmup + repeat`` runs; see
+    :class:`~sqlcheck.benchmarking.BenchmarkRun`.
+    """
+    runs = benchmark_runs(segment)
+    if runs is None:
+        return execution
+    benchmark = BenchmarkRun(*runs)
+    first = last = execution
+    while benchmark.record(last.status):
+        last = session.execute(segment.sql_parsed, **execute_kwargs)
+    return ExecutionResult(status=benchmark.status(first.status, last.status), output=last.output)
+
+
+async def _benchmark_async(
+    session: AsyncDBSession,
+    segment: SQLSegment,
+    execute_kwargs: Mapping[str, Any],
+    execution: ExecutionResult,
+) -> ExecutionResult:
+    runs = benchmark_runs(segment)
+    if runs is None:
+        return execution
+    benchmark = BenchmarkRun(*runs)
+    first = last = execution
+    while benchmark.record(last.status):
+        last = await session.execute(segment.sql_parsed, **execute_kwargs)
+    return ExecutionResult(status=benchmark.status(first.status, last.status), output=last.output)
+
+
+def _cache_ttl(
+    segment: SQLSegment, result_cache: ResultCache | None, isolated: bool = False
+) -> float | None:
+    """Seconds a cached result of ``segment`` stays valid; ``None`` when it must execute.
+
+    ``cache=True`` (or a number of seconds) opts a segment in, ``cache=False``
+    out; unset segments are cached when the cache is in read-only mode and
+    their SQL only reads. A cached segment is not executed, so in an
+    ``isolated`` session, whose writes are rolled back after every run, a
+    segment that writes always executes: later segments may need its writes.
+    """
+    # Benchmarks measure the database, so they always execute.
+    if result_cache is None or segment.directive.name == "benchmark":
+        return None
+    if isolated and not is_read_only(segment.sql_parsed):
+        return None
+    setting = segment.directive.kwargs.get("cache")
+    if setting is None:
+        read_only = result_cache.read_only and is_read_only(segment.sql_parsed)
+        return result_cache.ttl if read_only else None
+    if isinstance(setting, bool):
+        return result_cache.ttl if setting else None
+    return float(setting)
+
+
+def _cache_key(
+    connector: DBConnector | AsyncDBConnector,
+    segment: SQLSegment,
+    execute_kwargs: Mapping[str, Any],
+) -> str:
+    statements = [statement.text for statement in segment.sql_parsed.statements]
+    # The timeout does not change the result, only whether one is produced.
+    options = sorted((key, value) for key, value in execute_kwargs.items() if key != "timeout")
+    return repr((connector.identity(), statements or segment.sql_parsed.source, options))
+
+
+def _load_cached(
+    result_cache: ResultCache | None,
+    key: str | None,
+    ttl: float | None,
+) -> ExecutionResult | None:
+    if result_cache is None or key is None:
+        return None
+    start = time.perf_counter()
+    cached = result_cache.get(key, ttl)
+    if cached is None:
+        return None
+    status = replace(
+        cached.status, duration_s=time.perf_counter() - start, pool_wait_s=0.0, cache_hit=True
+    )
+    return ExecutionResult(status=status, output=cached.output)
+
+
+def _store_cached(
+    result_cache: ResultCache | None,
+    key: str | None,
+    execution: ExecutionResult,
+) -> None:
+    # Errors may be transient; only successful results are reused.
+    if result_cache is not None and key is not None and execution.status.success:
+        result_cache.put(key, execution)
+
+
+def _isolation(case: TestCase) -> bool | None:
+    """Per-test isolation override; tests that provide data for others must commit it."""
+    if case.metadata.isolated is None and case.metadata.provides:
+        return False
+    return case.metadata.isolated
 
 
 def run_test_case(
     case: TestCase,
     connector: DBConnector,
     registry: FunctionRegistry,
+    fixtures: FixtureManager | None = None,
+    result_cache: ResultCache | None = None,
 ) -> TestResult:
     execution: ExecutionResult | None = None
     function_results: list[FunctionResult] = []
+    segments: list[ExecutionStatus] = []
+    policy = RetryPolicy.for_case(case)
+    executed = False
     with connector.open_session() as session:
-        for segment in case.segments:
-            for attempt in range(case.metadata.retries + 1):
-                execution = session.execute(segment.sql_parsed, timeout=case.metadata.timeout)
-                if execution.status.success or attempt >= case.metadata.retries:
+        if case.metadata.fixtures:
+            try:
+                if fixtures is None:
+                    raise FixtureError("no fixtures are loaded")
+                fixtures.prepare(case.metadata.fixtures, session)
+            except FixtureError as exc:
+                return _skipped_result(case, str(exc), name="fixtures")
+        with session.isolate(_isolation(case)) as isolated:
+            for segment in case.segments:
+                execute_kwargs = _execute_kwargs(case, segment)
+                ttl = _cache_ttl(segment, result_cache, bool(isolated))
+                key = _cache_key(connector, segment, execute_kwargs) if ttl else None
+                execution = _load_cached(result_cache, key, ttl)
+                if execution is None:
+                    executed = True
+                    execution = _execute_with_retries(session, segment, execute_kwargs, policy)
+                    execution = _benchmark(session, segment, execute_kwargs, execution)
+                    _store_cached(result_cache, key, execution)
+                evaluating = time.perf_counter()
+                result, stop = _evaluate_segment(segment, execution, registry, case.path)
+                segments.append(_evaluated(execution, evaluating))
+                function_results.append(result)
+                if stop:
                     break
+    return _build_result(case, execution, function_results, not executed, segments)
+
+
+async def run_test_case_async(
+    case: TestCase,
+    connector: AsyncDBConnector,
+    registry: FunctionRegistry,
+    result_cache: ResultCache | None = None,
+) -> TestResult:
+    execution: ExecutionResult | None = None
+    function_results: list[FunctionResult] = []
+    segments: list[ExecutionStatus] = []
+    policy = RetryPolicy.for_case(case)
+    executed = False
+    async with connector.open_session() as session, session.isolate(_isolation(case)) as isolated:
+        for segment in case.segments:
+            execute_kwargs = _execute_kwargs(case, segment)
+            ttl = _cache_ttl(segment, result_cache, bool(isolated))
+            key = _cache_key(connector, segment, execute_kwargs) if ttl else None
+            execution = _load_cached(result_cache, key, ttl)
             if execution is None:
-                raise RuntimeError("Execution never started")
-            status = execution.status
-            output = execution.output
-            exit_on_failure = segment.directive.kwargs.get("exit_on_failure", True)
-            func = registry.resolve(segment.directive.name)
-            kwargs = {
-                key: value
-                for key, value in segment.directive.kwargs.items()
-                if key != "exit_on_failure"
-            }
-            with execution_context(segment.sql_parsed, status, output):
-                result = func(*segment.directive.args, **kwargs)
+                executed = True
+                execution = await _execute_with_retries_async(
+                    session, segment, execute_kwargs, policy
+                )
+                execution = await _benchmark_async(session, segment, execute_kwargs, execution)
+                _store_cached(result_cache, key, execution)
+            evaluating = time.perf_counter()
+            result, stop = _evaluate_segment(segment, execution, registry, case.path)
+            segments.append(_evaluated(execution, evaluating))
             function_results.append(result)
-            if exit_on_failure and not result.success:
+            if stop:
                 break
-    if execution is None:
-        raise RuntimeError("Execution never started")
+    return _build_result(case, execution, function_results, not executed, segments)
+
+
+def iter_results(
+    cases: Iterable[TestCase],
+    connector: DBConnector,
+    registry: FunctionRegistry,
+    workers: int,
+    durations: Mapping[str, float] | None = None,
+    fixtures: FixtureManager | None = None,
+    result_cache: ResultCache | None = None,
+) -> Iterator[TestResult]:
+    """Run cases and yield each result as soon as it finishes.
+
+    ``cases`` is consumed once, so it may be a stream: cases are read while
+    earlier ones run, keeping ``workers`` tests running and at most as many
+    more queued, so a slow test only holds up its own thread. Results come
+    in completion order; :func:`run_cases` restores input order. See
+    :func:`_schedule` for ``depends_on`` and serial cases. With
+    ``durations`` (timing history) the cases are scheduled longest first
+    instead; see :func:`iter_scheduled_results`. ``fixtures`` sets up the
+    fixtures each case lists before it runs; ``result_cache`` serves
+    cacheable segments without executing them.
+    """
+    if durations is not None:
+        yield from iter_scheduled_results(
+            cases, connector, registry, workers, durations, fixtures, result_cache
+        )
+        return
+    yield from _schedule(
+        cases, connector, registry, workers, fixtures, result_cache, lookahead=max(1, workers)
+    )
+
+
+def iter_scheduled_results(
+    cases: Iterable[TestCase],
+    connector: DBConnector,
+    registry: FunctionRegistry,
+    workers: int,
+    durations: Mapping[str, float],
+    fixtures: FixtureManager | None = None,
+    result_cache: ResultCache | None = None,
+) -> Iterator[TestResult]:
+    """Run cases longest-expected-first, yielding results as they finish.
+
+    Expected durations come from ``durations`` (see
+    :func:`sqlcheck.sharding.estimate_durations`), so the slowest tests no
+    longer form the tail of the run. Ordering needs every case, so
+    ``cases`` is read in full before the first test starts.
+    """
+    cases = list(cases)
+    expected = estimate_durations([case.path for case in cases], durations)
+    yield from _schedule(
+        cases, connector, registry, workers, fixtures, result_cache, expected=expected
+    )
+
+
+def require_thread_engine(case: TestCase) -> None:
+    """Raise ``DependencyError`` when ``case`` needs features only the thread engine has."""
+    for key in ("depends_on", "fixtures"):
+        if getattr(case.metadata, key):
+            raise DependencyError(
+                f"{case.path}: {key} is only supported by the thread engine "
+                "(--engine threads without --processes)"
+            )
+
+
+def _skipped_result(case: TestCase, reason: str, name: str = "depends_on") -> TestResult:
+    """A failed result for a test that never ran; ``name`` is the setting that stopped it."""
     return TestResult(
         case=case,
-        status=execution.status,
-        output=execution.output,
-        function_results=function_results,
+        status=ExecutionStatus(success=False, returncode=1, duration_s=0.0),
+        output=ExecutionOutput(stdout="", stderr=""),
+        function_results=[
+            FunctionResult(name=name, success=False, message=f"Skipped: {reason}")
+        ],
+    )
+
+
+def _schedule(
+    cases: Iterable[TestCase],
+    connector: DBConnector,
+    registry: FunctionRegistry,
+    workers: int,
+    fixtures: FixtureManager | None = None,
+    result_cache: ResultCache | None = None,
+    lookahead: int | None = None,
+    expected: Mapping[Path, float] | None = None,
+) -> Iterator[TestResult]:
+    """Run a stream of cases on ``workers`` threads, yielding results as they finish.
+
+    Cases are read while at most ``lookahead`` ready cases wait for a
+    thread (the whole stream first when ``None``). A case with
+    ``depends_on`` is held until every case read so far that provides one
+    of its keys has passed, and is skipped (reported as failed) as soon as
+    one fails or is skipped. Unknown keys and dependency cycles can only be
+    told apart from late providers once the stream ends, so those cases are
+    skipped then; a provider read after its dependents started is not
+    waited for. Serial cases run alone, in the gaps where no parallel case
+    is ready. Ready cases go longest-``expected``-first, otherwise in input
+    order.
+    """
+    seen: list[TestCase] = []
+    providers: dict[str, list[int]] = defaultdict(list)
+    wanted: dict[str, list[int]] = defaultdict(list)
+    held: dict[int, set[int]] = {}
+    unresolved: dict[int, set[str]] = {}
+    dependents: dict[int, list[int]] = defaultdict(list)
+    passed: dict[int, bool] = {}
+    ready: list[tuple[float, int]] = []
+    ready_serial: list[tuple[float, int]] = []
+    finished: deque[TestResult] = deque()
+    running: dict[concurrent.futures.Future[TestResult], int] = {}
+    limit = max(1, workers)
+
+    def _release(index: int) -> None:
+        priority = -expected[seen[index].path] if expected else 0.0
+        heapq.heappush(ready_serial if seen[index].metadata.serial else ready, (priority, index))
+
+    def _finish(index: int, result: TestResult) -> None:
+        stack = [(index, result)]
+        while stack:
+            current, outcome = stack.pop()
+            passed[current] = outcome.success
+            finished.append(outcome)
+            reason = f"prerequisite '{seen[current].metadata.name}' did not pass"
+            for dependent in dependents.pop(current, []):
+                if dependent not in held:
+                    continue
+                if not outcome.success:
+                    del held[dependent]
+                    unresolved.pop(dependent, None)
+                    stack.append((dependent, _skipped_result(seen[dependent], reason)))
+                    continue
+                held[dependent].discard(current)
+                if not held[dependent] and dependent not in unresolved:
+                    del held[dependent]
+                    _release(dependent)
+
+    def _skip(index: int, reason: str) -> None:
+        held.pop(index, None)
+        unresolved.pop(index, None)
+        _finish(index, _skipped_result(seen[index], reason))
+
+    def _admit(case: TestCase) -> None:
+        index = len(seen)
+        seen.append(case)
+        for key in provided_keys(case):
+            providers[key].append(index)
+            for dependent in wanted.get(key, ()):
+                if dependent in held:
+                    if index not in held[dependent]:
+                        held[dependent].add(index)
+                        dependents[index].append(dependent)
+                    missing = unresolved.get(dependent)
+                    if missing is not None:
+                        missing.discard(key)
+                        if not missing:
+                            del unresolved[dependent]
+        prerequisites: set[int] = set()
+        missing: set[str] = set()
+        failed: str | None = None
+        keys = dict.fromkeys(case.metadata.depends_on)
+        for key in keys:
+            wanted[key].append(index)
+            if key not in providers:
+                missing.add(key)
+        # A provider may supply several of the keys; each is waited for once.
+        for provider in dict.fromkeys(p for key in keys for p in providers.get(key, ())):
+            if provider not in passed:
+                prerequisites.add(provider)
+                dependents[provider].append(index)
+            elif not passed[provider] and failed is None:
+                failed = f"prerequisite '{seen[provider].metadata.name}' did not pass"
+        if failed is not None:
+            _finish(index, _skipped_result(case, failed))
+        elif prerequisites or missing:
+            held[index] = prerequisites
+            if missing:
+                unresolved[index] = missing
+        else:
+            _release(index)
+
+    def _close_stream() -> None:
+        if not held:
+            return
+        graph = build_dependency_graph(seen)
+        for index, reason in sorted(graph.blocked.items()):
+            if index in held:
+                _skip(index, reason)
+
+    iterator = iter(cases)
+    reader: concurrent.futures.Future[TestCase | None] | None = None
+    exhausted = False
+    exclusive = False
+
+    with (
+        concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor,
+        concurrent.futures.ThreadPoolExecutor(max_workers=1) as reads,
+    ):
+
+        def _start(index: int) -> None:
+            future = executor.submit(
+                run_test_case, seen[index], connector, registry, fixtures, result_cache
+            )
+            running[future] = index
+
+        def _fill() -> None:
+            nonlocal exclusive
+            if exclusive:
+                return
+            while ready and len(running) < limit:
+                _start(heapq.heappop(ready)[1])
+            if not running and ready_serial:
+                _start(heapq.heappop(ready_serial)[1])
+                exclusive = True
+
+        while True:
+            if reader is None and not exhausted and (
+                lookahead is None or len(ready) + len(ready_serial) < lookahead
+            ):
+                # Read in a thread of its own, so a slow stream never holds up results.
+                reader = reads.submit(next, iterator, None)
+            if exhausted or lookahead is not None:
+                _fill()
+            while finished:
+                yield finished.popleft()
+            if not running and reader is None:
+                break
+            completed, _ = concurrent.futures.wait(
+                [*running, *([reader] if reader else [])],
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+            if reader is not None and reader in completed:
+                case = reader.result()
+                reader = None
+                if case is None:
+                    exhausted = True
+                    _close_stream()
+                else:
+                    _admit(case)
+            for future in sorted(
+                (future for future in completed if future in running), key=running.__getitem__
+            ):
+                _finish(running.pop(future), future.result())
+            if not running:
+                exclusive = False
+
+
+async def aiter_results(
+    cases: Iterable[TestCase],
+    connector: AsyncDBConnector,
+    registry: FunctionRegistry,
+    concurrency: int,
+    result_cache: ResultCache | None = None,
+) -> AsyncIterator[TestResult]:
+    """Async counterpart of :func:`iter_results`.
+
+    Up to ``concurrency`` tests execute at once and results come as they
+    finish. A serial case runs alone once no parallel case is running or
+    waiting. ``cases`` is advanced in a worker thread next to the running
+    tests, so a slow parse neither stalls the loop nor idles a slot.
+    """
+    limit = max(1, concurrency)
+    queued: deque[TestCase] = deque()
+    serial_cases: deque[TestCase] = deque()
+    running: dict[asyncio.Future[TestResult], None] = {}
+    reader: asyncio.Future[TestCase | None] | None = None
+    iterator = iter(cases)
+    exhausted = False
+    exclusive = False
+
+    def _start(case: TestCase) -> None:
+        task = asyncio.ensure_future(run_test_case_async(case, connector, registry, result_cache))
+        running[task] = None
+
+    try:
+        while True:
+            if reader is None and not exhausted and len(queued) + len(serial_cases) < limit:
+                reader = asyncio.ensure_future(asyncio.to_thread(next, iterator, None))
+            if not exclusive:
+                while queued and len(running) < limit:
+                    _start(queued.popleft())
+                if not running and serial_cases:
+                    _start(serial_cases.popleft())
+                    exclusive = True
+            if not running and reader is None:
+                break
+            waiting: list[asyncio.Future[Any]] = [*running, *([reader] if reader else [])]
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            if reader is not None and reader in done:
+                case = reader.result()
+                reader = None
+                if case is None:
+                    exhausted = True
+                else:
+                    require_thread_engine(case)
+                    (serial_cases if case.metadata.serial else queued).append(case)
+            for task in [task for task in running if task in done]:
+                del running[task]
+                yield task.result()
+            if not running:
+                exclusive = False
+    finally:
+        for task in running:
+            task.cancel()
+        if reader is not None:
+            reader.cancel()
+
+
+def iter_results_async(
+    cases: Iterable[TestCase],
+    connector: AsyncDBConnector,
+    registry: FunctionRegistry,
+    concurrency: int,
+    result_cache: ResultCache | None = None,
+) -> Iterator[TestResult]:
+    """Drive :func:`aiter_results` on a private event loop, yielding synchronously.
+
+    The loop runs in a background thread, so tests keep running while the
+    caller handles a result. The connector is closed on the same loop once
+    the results are exhausted or the caller stops early.
+    """
+    loop = asyncio.new_event_loop()
+    results: queue.SimpleQueue[TestResult | BaseException | None] = queue.SimpleQueue()
+
+    async def _pump() -> None:
+        try:
+            async for result in aiter_results(
+                cases, connector, registry, concurrency, result_cache
+            ):
+                results.put(result)
+        finally:
+            await connector.close()
+
+    def _drive() -> None:
+        try:
+            loop.run_until_complete(task)
+            results.put(None)
+        except BaseException as exc:
+            results.put(exc)
+
+    task = loop.create_task(_pump())
+    thread = threading.Thread(target=_drive, name="sqlcheck-async", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = results.get()
+            if item is None:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        if not task.done():
+            loop.call_soon_threadsafe(task.cancel)
+        thread.join()
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+PackedResult = tuple[
+    tuple[Any, ...], tuple[Any, ...], list[tuple[Any, ...]], list[tuple[Any, ...]]
+]
+
+
+def _astuple(value: Any) -> tuple[Any, ...]:
+    """Shallow field tuple of a dataclass (unlike ``dataclasses.astuple``, no deep copy)."""
+    return tuple(getattr(value, item.name) for item in fields(value))
+
+
+def _pack_result(result: TestResult) -> PackedResult:
+    """Everything but the case, which the parent process already holds."""
+    return (
+        _astuple(result.status),
+        _astuple(result.output),
+        [_astuple(item) for item in result.function_results],
+        [_astuple(item) for item in result.segments],
     )
 
 
+def _unpack_result(case: TestCase, packed: PackedResult) -> TestResult:
+    status, output, function_results, segments = packed
+    return TestResult(
+        case=case,
+        status=ExecutionStatus(*status),
+        output=ExecutionOutput(*output),
+        function_results=[FunctionResult(*item) for item in function_results],
+        segments=[ExecutionStatus(*item) for item in segments],
+    )
+
+
+def _process_worker(
+    connector_factory: Callable[[], DBConnector | AsyncDBConnector],
+    plugins: Sequence[str],
+    result_cache: ResultCache | None,
+    update_baselines: bool,
+    workers: int,
+    tasks: Any,
+    results: Any,
+) -> None:
+    """Body of a --processes worker: run ``(index, case)`` items from ``tasks`` until ``None``.
+
+    The connector and registry are built once and kept for the whole run.
+    Each result goes to ``results`` as ``(index, packed)``, or as
+    ``(index, traceback)`` when the runner itself raised.
+    """
+    registry = default_registry(update_baselines)
+    load_plugins(plugins, registry)
+    connector = connector_factory()
+    if isinstance(connector, AsyncDBConnector):
+        asyncio.run(_serve_async(connector, registry, result_cache, workers, tasks, results))
+    else:
+        _serve(connector, registry, result_cache, workers, tasks, results)
+
+
+def _serve(
+    connector: DBConnector,
+    registry: FunctionRegistry,
+    result_cache: ResultCache | None,
+    workers: int,
+    tasks: Any,
+    results: Any,
+) -> None:
+    slots = threading.Semaphore(max(1, workers))
+
+    def _run(index: int, case: TestCase) -> None:
+        try:
+            result = run_test_case(case, connector, registry, result_cache=result_cache)
+            results.put((index, _pack_result(result)))
+        except Exception:
+            results.put((index, traceback.format_exc()))
+        finally:
+            slots.release()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            slots.acquire()
+            task = tasks.get()
+            if task is None:
+                break
+            executor.submit(_run, *task)
+    connector.close()
+
+
+async def _serve_async(
+    connector: AsyncDBConnector,
+    registry: FunctionRegistry,
+    result_cache: ResultCache | None,
+    workers: int,
+    tasks: Any,
+    results: Any,
+) -> None:
+    slots = asyncio.Semaphore(max(1, workers))
+    running: set[asyncio.Future[None]] = set()
+
+    async def _run(index: int, case: TestCase) -> None:
+        try:
+            result = await run_test_case_async(case, connector, registry, result_cache)
+            results.put((index, _pack_result(result)))
+        except Exception:
+            results.put((index, traceback.format_exc()))
+        finally:
+            slots.release()
+
+    try:
+        while True:
+            await slots.acquire()
+            task = await asyncio.to_thread(tasks.get)
+            if task is None:
+                break
+            job = asyncio.ensure_future(_run(*task))
+            running.add(job)
+            job.add_done_callback(running.discard)
+        if running:
+            await asyncio.wait(list(running))
+    finally:
+        await connector.close()
+
+
+def _receive(results: Any, pool: Sequence[multiprocessing.process.BaseProcess]) -> Any:
+    """Next item from ``results``, failing instead of hanging when a worker process died."""
+    while True:
+        try:
+            return results.get(timeout=1.0)
+        except queue.Empty:
+            for process in pool:
+                if not process.is_alive():
+                    raise RuntimeError(
+                        f"sqlcheck worker process exited with code {process.exitcode}"
+                    ) from None
+
+
+def iter_results_processes(
+    cases: Iterable[TestCase],
+    connector_factory: Callable[[], DBConnector | AsyncDBConnector],
+    plugins: Sequence[str],
+    processes: int,
+    workers: int,
+    result_cache: ResultCache | None = None,
+    update_baselines: bool = False,
+) -> Iterator[TestResult]:
+    """Run cases across ``processes`` worker processes, yielding results as they finish.
+
+    Each process builds one connector from ``connector_factory`` (which
+    must be picklable) and its own registry with ``plugins`` loaded, and
+    keeps both for the whole run. Cases are sent one at a time and each
+    process runs ``workers`` of them at once (threads, or concurrent tests
+    for an async connector), with at most two per slot in flight, so a slow
+    test only holds up its own slot. Results come back without their case,
+    as packed field tuples. A serial case runs alone once no parallel case
+    is running or waiting. ``update_baselines`` is set on each process's
+    registry.
+    """
+    context = multiprocessing.get_context("spawn")
+    tasks = context.Queue()
+    results = context.Queue()
+    limit = max(1, processes) * max(1, workers) * 2
+    pool = [
+        context.Process(
+            target=_process_worker,
+            args=(
+                connector_factory,
+                tuple(plugins),
+                result_cache,
+                update_baselines,
+                workers,
+                tasks,
+                results,
+            ),
+            daemon=True,
+        )
+        for _ in range(max(1, processes))
+    ]
+    for process in pool:
+        process.start()
+
+    queued: deque[tuple[int, TestCase]] = deque()
+    serial_cases: deque[tuple[int, TestCase]] = deque()
+    in_flight: dict[int, TestCase] = {}
+    iterator = enumerate(cases)
+    exhausted = False
+    exclusive = False
+
+    def _send(index: int, case: TestCase) -> None:
+        in_flight[index] = case
+        tasks.put((index, case))
+
+    try:
+        while True:
+            while not exhausted and len(queued) + len(serial_cases) < limit:
+                item = next(iterator, None)
+                if item is None:
+                    exhausted = True
+                    break
+                require_thread_engine(item[1])
+                (serial_cases if item[1].metadata.serial else queued).append(item)
+            if not exclusive:
+                while queued and len(in_flight) < limit:
+                    _send(*queued.popleft())
+                if not in_flight and serial_cases:
+                    _send(*serial_cases.popleft())
+                    exclusive = True
+            if not in_flight:
+                if exhausted:
+                    break
+                continue
+            index, packed = _receive(results, pool)
+            case = in_flight.pop(index)
+            if isinstance(packed, str):
+                raise RuntimeError(f"{case.path}: sqlcheck worker process failed\n{packed}")
+            yield _unpack_result(case, packed)
+            if not in_flight:
+                exclusive = False
+    finally:
+        for _ in pool:
+            tasks.put(None)
+        # Keep draining so workers can flush their results and exit.
+        while any(process.is_alive() for process in pool):
+            try:
+                results.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        for process in pool:
+            process.join()
+
+
+def _in_input_order(
+    cases: Iterable[TestCase],
+    run: Callable[[Iterable[TestCase]], Iterable[TestResult]],
+) -> list[TestResult]:
+    """Collect ``run(cases)``, which yields in completion order, back into input order."""
+    order: dict[int, int] = {}
+
+    def _numbered() -> Iterator[TestCase]:
+        for case in cases:
+            order.setdefault(id(case), len(order))
+            yield case
+
+    return sorted(run(_numbered()), key=lambda result: order[id(result.case)])
+
+
 def run_cases(
     cases: Iterable[TestCase],
     connector: DBConnector,
     registry: FunctionRegistry,
     workers: int,
+    durations: Mapping[str, float] | None = None,
+    fixtures: FixtureManager | None = None,
+    result_cache: ResultCache | None = None,
 ) -> list[TestResult]:
-    parallel_cases = [case for case in cases if not case.metadata.serial]
-    serial_cases = [case for case in cases if case.metadata.serial]
-    results: list[TestResult] = []
+    return _in_input_order(
+        cases,
+        lambda stream: iter_results(
+            stream, connector, registry, workers, durations, fixtures, result_cache
+        ),
+    )
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
-        future_map = {
-            executor.submit(run_test_case, case, connector, registry): case
-            for case in parallel_cases
-        }
-        for future in concurrent.futures.as_completed(future_map):
-            results.append(future.result())
 
-    for case in serial_cases:
-        results.append(run_test_case(case, connector, registry))
+def run_cases_async(
+    cases: Iterable[TestCase],
+    connector: AsyncDBConnector,
+    registry: FunctionRegistry,
+    concurrency: int,
+    result_cache: ResultCache | None = None,
+) -> list[TestResult]:
+    return _in_input_order(
+        cases,
+        lambda stream: iter_results_async(stream, connector, registry, concurrency, result_cache),
+    )
+
 
-    return results
+def run_cases_processes(
+    cases: Iterable[TestCase],
+    connector_factory: Callable[[], DBConnector | AsyncDBConnector],
+    plugins: Sequence[str],
+    processes: int,
+    workers: int,
+    result_cache: ResultCache | None = None,
+    update_baselines: bool = False,
+) -> list[TestResult]:
+    return _in_input_order(
+        cases,
+        lambda stream: iter_results_processes(
+            stream, connector_factory, plugins, processes, workers, result_cache, update_baselines
+        ),
+    )
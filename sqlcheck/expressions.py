@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Iterable
+
+DEFAULT_CACHE_SIZE = 1024
+
+_REFERENCE_PATTERN = re.compile(
+    "|".join(
+        [
+            r"[rRbB]{0,2}(?:'{3}.*?'{3}|\"{3}.*?\"{3}|'(?:[^'\\\n]|\\.)*'|\"(?:[^\"\\\n]|\\.)*\")",
+            r"//[^\n]*",
+            r"\.\s*[A-Za-z_]\w*",
+            r"(?P<name>[A-Za-z_]\w*)",
+            r".",
+        ]
+    ),
+    re.DOTALL,
+)
+
+
+@lru_cache(maxsize=1024)
+def referenced_names(source: str) -> frozenset[str]:
+    """Top-level identifiers (variables and functions) used by a CEL expression.
+
+    Names inside string literals and comments, and field names after ``.``, are
+    skipped. The result may include extra names (e.g. macro variables) but never
+    misses a referenced one. Each distinct expression is scanned once.
+    """
+    return frozenset(
+        match.group("name")
+        for match in _REFERENCE_PATTERN.finditer(source)
+        if match.group("name")
+    )
+
+
+# The variables an expression needs, as (name, builder) pairs run on each evaluation.
+ContextPlan = tuple[tuple[str, Callable[[Any], Any]], ...]
+
+
+@dataclass(frozen=True)
+class PreparedExpression:
+    """What evaluating an expression needs besides its context, worked out once."""
+
+    source: str
+    references: frozenset[str]
+    plan: ContextPlan
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    def since(self, earlier: "CacheStats") -> "CacheStats":
+        return CacheStats(hits=self.hits - earlier.hits, misses=self.misses - earlier.misses)
+
+
+class ExpressionCache:
+    """Thread-safe LRU cache of prepared expressions keyed by source text.
+
+    ``planner`` turns the names an expression references into its context
+    plan. The installed CEL release has no compile step, so the expression
+    text is still parsed by ``cel.evaluate`` on each call.
+    """
+
+    def __init__(
+        self,
+        planner: Callable[[Iterable[str]], ContextPlan],
+        maxsize: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self.planner = planner
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, PreparedExpression] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, source: str) -> PreparedExpression:
+        with self._lock:
+            prepared = self._entries.get(source)
+            if prepared is not None:
+                self._entries.move_to_end(source)
+                self._hits += 1
+                return prepared
+            self._misses += 1
+        # Prepare outside the lock; a concurrent miss on the same source
+        # prepares it twice and keeps the last copy.
+        references = referenced_names(source)
+        prepared = PreparedExpression(source, references, self.planner(references))
+        with self._lock:
+            self._entries[source] = prepared
+            self._entries.move_to_end(source)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return prepared
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(hits=self._hits, misses=self._misses)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+__all__ = [
+    "CacheStats",
+    "ContextPlan",
+    "DEFAULT_CACHE_SIZE",
+    "ExpressionCache",
+    "PreparedExpression",
+    "referenced_names",
+]
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import threading
+from typing import Iterable, Sequence
+
+from sqlcheck.db_connector import SESSION_TEARDOWN_KEY, DBConnector, DBSession, ExecutionResult
+from sqlcheck.models import Fixture
+
+# Session state key for the names of worker fixtures already set up on a connection.
+_APPLIED_KEY = "sqlcheck.fixtures"
+
+
+class FixtureError(RuntimeError):
+    pass
+
+
+class FixtureManager:
+    """Set up fixtures the first time a test needs them.
+
+    ``run`` fixtures execute once per run on their own connection and are
+    torn down by :meth:`teardown`. ``worker`` fixtures execute once per
+    connection, inside the session of the first test that uses that
+    connection; their teardown runs when the connector closes the connection.
+    """
+
+    def __init__(self, fixtures: Iterable[Fixture], connector: DBConnector) -> None:
+        self.fixtures: dict[str, Fixture] = {}
+        for fixture in fixtures:
+            if fixture.name in self.fixtures:
+                raise ValueError(
+                    f"Duplicate fixture '{fixture.name}' in {fixture.path} "
+                    f"and {self.fixtures[fixture.name].path}"
+                )
+            self.fixtures[fixture.name] = fixture
+        self.connector = connector
+        self._locks = {name: threading.Lock() for name in self.fixtures}
+        self._results: dict[str, ExecutionResult] = {}
+        self._setup_order: list[str] = []
+
+    def prepare(self, names: Sequence[str], session: DBSession) -> None:
+        """Set up the named fixtures for ``session``; raise FixtureError if one fails."""
+        for name in names:
+            fixture = self.fixtures.get(name)
+            if fixture is None:
+                raise FixtureError(f"unknown fixture '{name}'")
+            if fixture.scope == "worker":
+                execution = self._setup_worker(fixture, session)
+            else:
+                execution = self._setup_run(fixture)
+            if execution is not None and not execution.status.success:
+                message = execution.output.stderr.strip() or "setup failed"
+                raise FixtureError(f"fixture '{name}' failed: {message}")
+
+    def teardown(self) -> list[ExecutionResult]:
+        """Tear down run fixtures in reverse setup order."""
+        results = []
+        for name in reversed(self._setup_order):
+            fixture = self.fixtures[name]
+            if fixture.teardown is not None and self._results[name].status.success:
+                results.append(self.connector.execute(fixture.teardown))
+        self._setup_order.clear()
+        self._results.clear()
+        return results
+
+    def _setup_run(self, fixture: Fixture) -> ExecutionResult:
+        with self._locks[fixture.name]:
+            if fixture.name not in self._results:
+                self._results[fixture.name] = self.connector.execute(fixture.setup)
+                self._setup_order.append(fixture.name)
+            return self._results[fixture.name]
+
+    def _setup_worker(self, fixture: Fixture, session: DBSession) -> ExecutionResult | None:
+        applied = session.state.setdefault(_APPLIED_KEY, set())
+        if fixture.name in applied:
+            return None
+        execution = session.execute(fixture.setup)
+        if execution.status.success:
+            applied.add(fixture.name)
+            if fixture.teardown is not None:
+                session.state.setdefault(SESSION_TEARDOWN_KEY, []).append(fixture.teardown)
+        return execution
+
+
+__all__ = ["FixtureError", "FixtureManager"]
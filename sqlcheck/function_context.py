@@ -3,6 +3,7 @@ from __future__ import annotations
 from contextlib import contextmanager
 from contextvars import ContextVar
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Iterator
 
 from sqlcheck.models import ExecutionOutput, ExecutionStatus, SQLParsed
@@ -18,6 +19,10 @@ class ExecutionContext:
     sql_parsed: SQLParsed
     status: ExecutionStatus
     output: ExecutionOutput
+    # The test file, e.g. to resolve paths a directive names relative to it.
+    path: Path | None = None
+    # Rewrite plan and benchmark baselines instead of comparing (--update-baselines).
+    update_baselines: bool = False
 
 
 @contextmanager
@@ -25,8 +30,18 @@ def execution_context(
     sql_parsed: SQLParsed,
     status: ExecutionStatus,
     output: ExecutionOutput,
+    path: Path | None = None,
+    update_baselines: bool = False,
 ) -> Iterator[None]:
-    token = _context.set(ExecutionContext(sql_parsed=sql_parsed, status=status, output=output))
+    token = _context.set(
+        ExecutionContext(
+            sql_parsed=sql_parsed,
+            status=status,
+            output=output,
+            path=path,
+            update_baselines=update_baselines,
+        )
+    )
     try:
         yield
     finally:
@@ -3,7 +3,9 @@ from __future__ import annotations
 from typing import Callable
 
 from sqlcheck.functions.assess import assess
+from sqlcheck.functions.benchmark import benchmark
 from sqlcheck.functions.fail import fail
+from sqlcheck.functions.plan import plan
 from sqlcheck.functions.success import success
 from sqlcheck.models import FunctionResult
 
@@ -11,8 +13,10 @@ FunctionType = Callable[..., FunctionResult]
 
 
 class FunctionRegistry:
-    def __init__(self) -> None:
+    def __init__(self, update_baselines: bool = False) -> None:
         self._functions: dict[str, Callable[..., FunctionResult]] = {}
+        # Handed to functions through the execution context; see ExecutionContext.
+        self.update_baselines = update_baselines
 
     def register(self, name: str, func: Callable[..., FunctionResult]) -> None:
         self._functions[name] = func
@@ -23,9 +27,11 @@ class FunctionRegistry:
         return self._functions[name]
 
 
-def default_registry() -> FunctionRegistry:
-    registry = FunctionRegistry()
+def default_registry(update_baselines: bool = False) -> FunctionRegistry:
+    registry = FunctionRegistry(update_baselines=update_baselines)
     registry.register("success", success)
     registry.register("fail", fail)
     registry.register("assess", assess)
+    registry.register("plan", plan)
+    registry.register("benchmark", benchmark)
     return registry
@@ -1,9 +1,13 @@
 from sqlcheck.functions.assess import assess
+from sqlcheck.functions.benchmark import benchmark
 from sqlcheck.functions.fail import fail
+from sqlcheck.functions.plan import plan
 from sqlcheck.functions.success import success
 
 __all__ = [
     "assess",
+    "benchmark",
     "fail",
+    "plan",
     "success",
 ]
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-from typing import Any
+from functools import cached_property
+from typing import Any, Callable, Iterable
 
 from cel import evaluate
 
+from sqlcheck.benchmarking import BenchmarkStats
+from sqlcheck.columnar import ColumnarResult
+from sqlcheck.expressions import ContextPlan, ExpressionCache
 from sqlcheck.function_context import current_context
-from sqlcheck.models import FunctionResult
+from sqlcheck.models import ExecutionOutput, FunctionResult
+from sqlcheck.plans import QueryPlan
 
 
 def assess(
@@ -29,7 +34,8 @@ def assess(
         )
     context = current_context()
     try:
-        result = evaluate(expression, _build_evaluation_context(context))
+        prepared = expression_cache.get(expression)
+        result = evaluate(expression, _run_plan(context, prepared.plan))
     except Exception as exc:  # noqa: BLE001 - surface CEL evaluation errors
         return FunctionResult(
             name="assess",
@@ -51,6 +57,12 @@ def assess(
     return FunctionResult(name="assess", success=True)
 
 
+def combine_expressions(base: str, match: Any) -> str:
+    if not match:
+        return base
+    return f"({base}) && ({match})"
+
+
 def _resolve_match_expression(
     match: str | None,
     check: str | None,
@@ -60,28 +72,139 @@ def _resolve_match_expression(
     return match or check, None
 
 
-def _build_evaluation_context(context: Any) -> dict[str, Any]:
-    status = context.status
-    output = context.output
-    sql_parsed = context.sql_parsed
-    status_label = "success" if status.success else "fail"
+class _EvaluationFields:
+    """Builds CEL variables on demand; shared values are materialized once."""
+
+    def __init__(self, context: Any) -> None:
+        self.status = context.status
+        self.output = context.output
+        self.sql_parsed = context.sql_parsed
+
+    @cached_property
+    def rows(self) -> list[list[Any]]:
+        return self.output.row_values()
+
+    @cached_property
+    def column_functions(self) -> dict[str, Any]:
+        return _column_functions(self.output)
+
+    @cached_property
+    def plan(self) -> QueryPlan | None:
+        """The plan of the segment's last explained statement, usually its query."""
+        return self.output.plans[-1] if self.output.plans else None
+
+    @cached_property
+    def benchmark(self) -> BenchmarkStats:
+        """Statistics over a benchmark's measured runs, or over the single execution."""
+        return BenchmarkStats.from_seconds(self.status.samples_s or [self.status.duration_s])
+
+    def uses_index(self, name: str) -> bool:
+        return self.plan is not None and self.plan.uses_index(name)
+
+
+_FIELDS: dict[str, Callable[[_EvaluationFields], Any]] = {
+    "status": lambda fields: "success" if fields.status.success else "fail",
+    "success": lambda fields: fields.status.success,
+    "returncode": lambda fields: fields.status.returncode,
+    "error_code": lambda fields: str(fields.status.returncode),
+    "duration_s": lambda fields: fields.status.duration_s,
+    "elapsed_ms": lambda fields: int(fields.status.duration_s * 1000),
+    "timed_out": lambda fields: fields.status.timed_out,
+    "attempts": lambda fields: fields.status.attempts,
+    "db_error_code": lambda fields: fields.status.db_error_code or "",
+    "statement_durations": lambda fields: [
+        timing.duration_s for timing in fields.status.statement_timings
+    ],
+    "samples_ms": lambda fields: fields.benchmark.samples_ms,
+    "min_ms": lambda fields: fields.benchmark.min_ms,
+    "median_ms": lambda fields: fields.benchmark.median_ms,
+    "p95_ms": lambda fields: fields.benchmark.p95_ms,
+    "mean_ms": lambda fields: fields.benchmark.mean_ms,
+    "max_ms": lambda fields: fields.benchmark.max_ms,
+    "stdout": lambda fields: fields.output.stdout,
+    "stderr": lambda fields: fields.output.stderr,
+    "error_message": lambda fields: fields.output.stderr,
+    "rows": lambda fields: fields.rows,
+    "row_count": lambda fields: fields.output.total_rows,
+    "truncated": lambda fields: fields.output.truncated,
+    "columns": lambda fields: fields.output.columns,
+    "output": lambda fields: {
+        "stdout": fields.output.stdout,
+        "stderr": fields.output.stderr,
+        "rows": fields.rows,
+        "row_count": fields.output.total_rows,
+        "truncated": fields.output.truncated,
+    },
+    "sql": lambda fields: fields.sql_parsed.source,
+    "statements": lambda fields: [statement.text for statement in fields.sql_parsed.statements],
+    "statement_count": lambda fields: len(fields.sql_parsed.statements),
+    "col": lambda fields: fields.column_functions["col"],
+    "col_sum": lambda fields: fields.column_functions["col_sum"],
+    "col_min": lambda fields: fields.column_functions["col_min"],
+    "col_max": lambda fields: fields.column_functions["col_max"],
+    "col_avg": lambda fields: fields.column_functions["col_avg"],
+    "null_count": lambda fields: fields.column_functions["null_count"],
+    "distinct_count": lambda fields: fields.column_functions["distinct_count"],
+    "plan": lambda fields: fields.plan.to_payload() if fields.plan is not None else None,
+    "plans": lambda fields: [plan.to_payload() for plan in fields.output.plans],
+    "uses_index": lambda fields: fields.uses_index,
+}
+# Functions called as methods of a variable, e.g. ``plan.uses_index('ix')``.
+# CEL resolves them from the context, so they come with the variable.
+_METHODS: dict[str, tuple[str, ...]] = {"plan": ("uses_index",)}
+
+
+def _context_plan(names: Iterable[str] | None = None) -> ContextPlan:
+    """The variables to build for an expression referencing ``names`` (all when ``None``)."""
+    wanted = set(_FIELDS if names is None else names)
+    for name in list(wanted):
+        wanted.update(_METHODS.get(name, ()))
+    return tuple((name, _FIELDS[name]) for name in sorted(wanted) if name in _FIELDS)
+
+
+def _run_plan(context: Any, plan: ContextPlan) -> dict[str, Any]:
+    fields = _EvaluationFields(context)
+    return {name: build(fields) for name, build in plan}
+
+
+def _build_evaluation_context(
+    context: Any,
+    names: Iterable[str] | None = None,
+) -> dict[str, Any]:
+    """Build the CEL variables for ``context``.
+
+    With ``names`` (the identifiers an expression references) only those
+    variables are built, so e.g. ``success == true`` never copies rows or
+    statement texts.
+    """
+    return _run_plan(context, _context_plan(names))
+
+
+# Shared by every worker thread of the run.
+expression_cache = ExpressionCache(_context_plan)
+
+
+def _column_functions(output: ExecutionOutput) -> dict[str, Any]:
+    """Column aggregates evaluated in Python, e.g. ``col_sum('amount') > 0``.
+
+    They run over the columnar capture (or a columnar view built once from
+    ``rows``), so CEL never has to iterate the rows itself.
+    """
+    columnar: list[ColumnarResult] = []
+
+    def view() -> ColumnarResult:
+        if not columnar:
+            columnar.append(
+                output.columnar or ColumnarResult.from_rows(output.columns, output.rows)
+            )
+        return columnar[0]
+
     return {
-        "status": status_label,
-        "success": status.success,
-        "returncode": status.returncode,
-        "error_code": str(status.returncode),
-        "duration_s": status.duration_s,
-        "elapsed_ms": int(status.duration_s * 1000),
-        "stdout": output.stdout,
-        "stderr": output.stderr,
-        "error_message": output.stderr,
-        "rows": output.rows,
-        "output": {
-            "stdout": output.stdout,
-            "stderr": output.stderr,
-            "rows": output.rows,
-        },
-        "sql": sql_parsed.source,
-        "statements": [statement.text for statement in sql_parsed.statements],
-        "statement_count": len(sql_parsed.statements),
+        "col": lambda key: list(view().column(key)),
+        "col_sum": lambda key: view().sum(key),
+        "col_min": lambda key: view().min(key),
+        "col_max": lambda key: view().max(key),
+        "col_avg": lambda key: view().avg(key),
+        "null_count": lambda key: view().null_count(key),
+        "distinct_count": lambda key: view().distinct_count(key),
     }
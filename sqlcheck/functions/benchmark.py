@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlcheck.baselines import BaselineError, resolve_baseline, sync_baseline
+from sqlcheck.benchmarking import (
+    DEFAULT_TOLERANCE,
+    METRICS,
+    BenchmarkStats,
+    benchmark_settings,
+    compare_benchmark,
+)
+from sqlcheck.function_context import current_context
+from sqlcheck.functions.assess import assess, combine_expressions
+from sqlcheck.models import FunctionResult
+
+
+def benchmark(
+    *_args: Any,
+    match: str | None = None,
+    baseline: str | None = None,
+    metric: str = "median_ms",
+    tolerance: float = DEFAULT_TOLERANCE,
+    **_kwargs: Any,
+) -> FunctionResult:
+    """Assert on the timings of a segment the runner executed ``warmup + repeat`` times.
+
+    ``match`` sees ``min_ms``, ``median_ms``, ``p95_ms``, ``mean_ms``,
+    ``max_ms`` and ``samples_ms``, e.g. ``p95_ms < 200``. ``baseline`` names a
+    JSON file, relative to the test file: the test fails when ``metric``
+    exceeds the stored value by more than ``tolerance``. A missing baseline
+    fails the test unless the run updates baselines.
+    """
+    if metric not in METRICS:
+        return FunctionResult(
+            name="benchmark",
+            success=False,
+            message=f"Unknown benchmark metric '{metric}', expected one of {METRICS}",
+        )
+    try:
+        benchmark_settings(_kwargs)
+    except ValueError as exc:
+        return FunctionResult(name="benchmark", success=False, message=str(exc))
+    result = assess(match=combine_expressions("success == true", match))
+    if not result.success:
+        return FunctionResult(name="benchmark", success=False, message=result.message)
+    if baseline is None:
+        return FunctionResult(name="benchmark", success=True)
+    context = current_context()
+    stats = BenchmarkStats.from_seconds(
+        context.status.samples_s or [context.status.duration_s]
+    )
+    path = resolve_baseline(baseline, context.path)
+    try:
+        stored = sync_baseline(path, stats.to_payload(), context.update_baselines)
+    except BaselineError as exc:
+        return FunctionResult(name="benchmark", success=False, message=str(exc))
+    if stored is None:
+        return FunctionResult(
+            name="benchmark", success=True, message=f"Wrote benchmark baseline {path}"
+        )
+    regression = compare_benchmark(stats, stored, metric, float(tolerance))
+    if regression is not None:
+        return FunctionResult(
+            name="benchmark", success=False, message=f"Slower than {path}: {regression}"
+        )
+    return FunctionResult(name="benchmark", success=True)
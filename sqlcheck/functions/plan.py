@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlcheck.baselines import BaselineError, resolve_baseline, sync_baseline
+from sqlcheck.function_context import current_context
+from sqlcheck.functions.assess import assess, combine_expressions
+from sqlcheck.models import FunctionResult
+from sqlcheck.plans import DEFAULT_COST_TOLERANCE, compare_plans
+
+
+def plan(
+    *_args: Any,
+    match: str | None = None,
+    baseline: str | None = None,
+    tolerance: float = DEFAULT_COST_TOLERANCE,
+    **_kwargs: Any,
+) -> FunctionResult:
+    """Assert on the EXPLAIN plans of the segment's statements.
+
+    The runner captures the plans (``analyze=True`` runs EXPLAIN ANALYZE).
+    ``match`` checks them with CEL, e.g. ``plan.uses_index('ix_orders')``.
+    ``baseline`` names a JSON file, relative to the test file, holding the
+    accepted plans: the test fails when a plan changes shape or its total
+    cost grows by more than ``tolerance``. A missing baseline fails the test
+    unless the run updates baselines.
+    """
+    result = assess(match=combine_expressions("success == true", match))
+    if not result.success:
+        return FunctionResult(name="plan", success=False, message=result.message)
+    context = current_context()
+    plans = context.output.plans
+    if not plans:
+        return FunctionResult(
+            name="plan", success=False, message="No statement of the segment could be explained"
+        )
+    if baseline is None:
+        return FunctionResult(name="plan", success=True)
+    path = resolve_baseline(baseline, context.path)
+    payload = [plan.to_payload() for plan in plans]
+    try:
+        stored = sync_baseline(path, payload, context.update_baselines)
+    except BaselineError as exc:
+        return FunctionResult(name="plan", success=False, message=str(exc))
+    if stored is None:
+        return FunctionResult(name="plan", success=True, message=f"Wrote plan baseline {path}")
+    problems = compare_plans(plans, stored, float(tolerance))
+    if problems:
+        return FunctionResult(
+            name="plan",
+            success=False,
+            message=f"Plan regressed against {path}: " + "; ".join(problems),
+        )
+    return FunctionResult(name="plan", success=True)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from sqlcheck.functions.assess import assess
+from sqlcheck.functions.assess import assess, combine_expressions
 from sqlcheck.models import FunctionResult
 
 
@@ -11,8 +11,5 @@ def success(
     match: str | None = None,
     **_kwargs: Any,
 ) -> FunctionResult:
-    expression = "success == true"
-    if match:
-        expression = f"({expression}) && ({match})"
-    result = assess(match=expression)
+    result = assess(match=combine_expressions("success == true", match))
     return FunctionResult(name="success", success=result.success, message=result.message)
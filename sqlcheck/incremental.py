@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Sequence
+
+from sqlcheck.dependencies import build_dependency_graph
+from sqlcheck.models import (
+    ExecutionOutput,
+    ExecutionStatus,
+    Fixture,
+    FunctionResult,
+    TestCase,
+    TestResult,
+)
+from sqlcheck.sharding import duration_key, write_json_atomic
+
+STATE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Selection:
+    """Cases that must run, plus cached results for the ones that can be skipped."""
+
+    run: list[TestCase]
+    cached: list[TestResult]
+    fingerprints: dict[str, str]
+
+
+def referenced_files(
+    cases: Sequence[TestCase],
+    fixtures: Iterable[Fixture] = (),
+) -> list[set[Path]]:
+    """Files each case depends on: itself, its fixtures and all its prerequisites' files."""
+    fixture_paths = {fixture.name: fixture.path for fixture in fixtures}
+    graph = build_dependency_graph(cases)
+    referenced: list[set[Path]] = []
+    for index, case in enumerate(cases):
+        files = {case.path}
+        files.update(
+            fixture_paths[name] for name in case.metadata.fixtures if name in fixture_paths
+        )
+        seen = {index}
+        pending = list(graph.prerequisites[index])
+        while pending:
+            prerequisite = pending.pop()
+            if prerequisite in seen:
+                continue
+            seen.add(prerequisite)
+            files.add(cases[prerequisite].path)
+            pending.extend(graph.prerequisites[prerequisite])
+        referenced.append(files)
+    return referenced
+
+
+def fingerprint(files: Iterable[Path], digests: dict[Path, str] | None = None) -> str:
+    """Hash of the paths and contents of ``files``; ``digests`` memoizes per-file hashes."""
+    digests = {} if digests is None else digests
+    combined = hashlib.blake2b(digest_size=16)
+    for path in sorted(files, key=duration_key):
+        if path not in digests:
+            try:
+                digests[path] = hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+            except FileNotFoundError:
+                digests[path] = "missing"
+        combined.update(f"{duration_key(path)}\0{digests[path]}\n".encode("utf-8"))
+    return combined.hexdigest()
+
+
+def changed_files(ref: str, cwd: Path | None = None) -> set[Path]:
+    """Files changed since git ``ref`` (committed, staged, unstaged or untracked)."""
+    try:
+        root = _git(["rev-parse", "--show-toplevel"], cwd).strip()
+        names = _git(["diff", "--name-only", ref, "--"], cwd).splitlines()
+        names += _git(["ls-files", "--others", "--exclude-standard"], Path(root)).splitlines()
+    except (OSError, subprocess.CalledProcessError) as exc:
+        detail = getattr(exc, "stderr", None) or str(exc)
+        raise ValueError(f"Cannot list files changed since '{ref}': {detail.strip()}") from exc
+    return {(Path(root) / name).resolve() for name in names if name}
+
+
+def _git(args: list[str], cwd: Path | None) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def load_state(path: Path) -> dict[str, dict[str, Any]]:
+    """Read a state file written by :func:`write_state`; missing or stale files are empty."""
+    if not path.is_file():
+        return {}
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if payload.get("version") != STATE_VERSION:
+        return {}
+    return payload["tests"]
+
+
+def write_state(path: Path, state: Mapping[str, Mapping[str, Any]]) -> None:
+    write_json_atomic(path, {"version": STATE_VERSION, "tests": dict(sorted(state.items()))})
+
+
+def select_affected(
+    cases: Sequence[TestCase],
+    fixtures: Iterable[Fixture],
+    state: Mapping[str, Mapping[str, Any]],
+    changed: set[Path] | None = None,
+) -> Selection:
+    """Split cases into those to run and those whose last passing result still holds.
+
+    A case is skipped only when ``state`` records a passing result for it
+    with the current fingerprint of its referenced files. With ``changed``
+    (see :func:`changed_files`) a case also runs when any referenced file
+    changed. Prerequisites of a case that runs always run too, so their
+    data is in place.
+    """
+    references = referenced_files(cases, fixtures)
+    digests: dict[Path, str] = {}
+    fingerprints: dict[str, str] = {}
+    selected: set[int] = set()
+    reasons: dict[int, str] = {}
+    for index, case in enumerate(cases):
+        key = duration_key(case.path)
+        fingerprints[key] = fingerprint(references[index], digests)
+        entry = state.get(key)
+        if entry is None or not entry.get("success"):
+            selected.add(index)
+        elif entry.get("fingerprint") != fingerprints[key]:
+            selected.add(index)
+        elif changed is not None and any(path.resolve() in changed for path in references[index]):
+            selected.add(index)
+        elif changed is not None:
+            reasons[index] = "no referenced file changed"
+        else:
+            reasons[index] = "unchanged since the last passing run"
+
+    graph = build_dependency_graph(cases)
+    pending = list(selected)
+    while pending:
+        for prerequisite in graph.prerequisites[pending.pop()]:
+            if prerequisite not in selected:
+                selected.add(prerequisite)
+                pending.append(prerequisite)
+
+    cached = [
+        cached_result(case, reasons[index], state.get(duration_key(case.path)))
+        for index, case in enumerate(cases)
+        if index not in selected
+    ]
+    run = [case for index, case in enumerate(cases) if index in selected]
+    return Selection(run=run, cached=cached, fingerprints=fingerprints)
+
+
+def cached_result(
+    case: TestCase,
+    reason: str,
+    entry: Mapping[str, Any] | None = None,
+) -> TestResult:
+    duration = float(entry.get("duration_s", 0.0)) if entry else 0.0
+    return TestResult(
+        case=case,
+        status=ExecutionStatus(success=True, returncode=0, duration_s=duration),
+        output=ExecutionOutput(stdout="", stderr=""),
+        function_results=[
+            FunctionResult(name="cached", success=True, message=f"Cached: {reason}")
+        ],
+        cached=True,
+    )
+
+
+def record_result(
+    state: dict[str, dict[str, Any]],
+    result: TestResult,
+    fingerprints: Mapping[str, str],
+) -> None:
+    """Store ``result`` in ``state``; cached results keep their entry."""
+    if result.cached:
+        return
+    key = duration_key(result.case.path)
+    state[key] = {
+        "fingerprint": fingerprints.get(key),
+        "success": result.success,
+        "duration_s": result.status.duration_s,
+    }
+
+
+__all__ = [
+    "STATE_VERSION",
+    "Selection",
+    "cached_result",
+    "changed_files",
+    "fingerprint",
+    "load_state",
+    "record_result",
+    "referenced_files",
+    "select_affected",
+    "write_state",
+]
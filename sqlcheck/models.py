@@ -2,7 +2,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from sqlcheck.columnar import ColumnarResult
+    from sqlcheck.plans import QueryPlan
 
 
 @dataclass(frozen=True)
@@ -40,6 +44,22 @@ class TestMetadata:
     serial: bool = False
     timeout: float | None = None
     retries: int = 0
+    depends_on: list[str] = field(default_factory=list)
+    provides: list[str] = field(default_factory=list)
+    fixtures: list[str] = field(default_factory=list)
+    # None follows the connector default (``--isolation``).
+    isolated: bool | None = None
+    # Base delay before the first retry; None uses the RetryPolicy default.
+    retry_backoff: float | None = None
+
+
+@dataclass(frozen=True)
+class Fixture:
+    name: str
+    path: Path
+    scope: str
+    setup: SQLParsed
+    teardown: SQLParsed | None = None
 
 
 @dataclass(frozen=True)
@@ -51,11 +71,43 @@ class TestCase:
     metadata: TestMetadata
 
 
+@dataclass(frozen=True)
+class StatementTiming:
+    """Time one statement of a segment spent executing and fetching its rows."""
+
+    index: int
+    execute_s: float
+    fetch_s: float = 0.0
+
+    @property
+    def duration_s(self) -> float:
+        return self.execute_s + self.fetch_s
+
+
 @dataclass(frozen=True)
 class ExecutionStatus:
     success: bool
     returncode: int
     duration_s: float
+    pool_wait_s: float = 0.0
+    # Every segment was served from the result cache instead of the database.
+    cache_hit: bool = False
+    # The statement ran past its timeout and was cancelled or aborted by the server.
+    timed_out: bool = False
+    # SQLSTATE (or driver error number) of a failed execution, and whether
+    # the error is transient, i.e. worth retrying (see sqlcheck.retry).
+    db_error_code: str | None = None
+    transient: bool = False
+    # Executions including retries, and seconds spent backing off between them.
+    attempts: int = 1
+    backoff_s: float = 0.0
+    # Phases of the last attempt: per-statement execute/fetch times, the
+    # commit (or rollback) at the end, and the evaluation of the directive.
+    statement_timings: list[StatementTiming] = field(default_factory=list)
+    commit_s: float = 0.0
+    evaluate_s: float = 0.0
+    # Durations of the measured runs of a ``benchmark()`` segment, after warmup.
+    samples_s: list[float] = field(default_factory=list)
 
 
 @dataclass(frozen=True)
@@ -63,6 +115,29 @@ class ExecutionOutput:
     stdout: str
     stderr: str
     rows: list[list[Any]] = field(default_factory=list)
+    row_count: int | None = None
+    truncated: bool = False
+    columns: list[str] = field(default_factory=list)
+    columnar: ColumnarResult | None = None
+    # EXPLAIN plans of the segment's statements, captured by ``plan()`` or ``explain=``.
+    plans: list[QueryPlan] = field(default_factory=list)
+
+    @property
+    def captured_rows(self) -> int:
+        """Number of rows held, as row lists or in the columnar capture."""
+        if self.columnar is not None and not self.rows:
+            return self.columnar.row_count
+        return len(self.rows)
+
+    @property
+    def total_rows(self) -> int:
+        return self.captured_rows if self.row_count is None else self.row_count
+
+    def row_values(self, limit: int | None = None) -> list[list[Any]]:
+        """At most ``limit`` captured rows, materialized from the columnar capture when needed."""
+        if self.columnar is not None and not self.rows:
+            return self.columnar.to_rows(limit)
+        return self.rows if limit is None else self.rows[:limit]
 
 
 @dataclass(frozen=True)
@@ -78,6 +153,10 @@ class TestResult:
     status: ExecutionStatus
     output: ExecutionOutput
     function_results: list[FunctionResult]
+    # Not executed: the last passing result still applies (see sqlcheck.incremental).
+    cached: bool = False
+    # Status of each executed segment, in order; ``status`` is the last one's.
+    segments: list[ExecutionStatus] = field(default_factory=list)
 
     @property
     def success(self) -> bool:
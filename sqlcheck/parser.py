@@ -9,46 +9,75 @@ from typing import Any, Iterable
 from sqlcheck.models import DirectiveCall, SQLParsed, SQLSegment, SQLStatement
 
 DIRECTIVE_PATTERN = re.compile(r"\{\{\s*(.+?)\s*\}\}", re.DOTALL)
+# Each match consumes a run of plain SQL plus the next token, so the regex engine
+# (not Python) walks over everything that cannot end a statement.
+_TOKEN_PATTERN = re.compile(
+    r"""
+    [^;'"\\$/-]*+
+    (?:
+      '[^'\\]*(?:\\.[^'\\]*)*'
+    | "[^"\\]*(?:\\.[^"\\]*)*"
+    | --[^\n]*\n
+    | /\*.*?\*/
+    | \$(?<!\w\$)(?P<tag>(?:[A-Za-z_]\w*)?)\$.*?\$(?P=tag)\$
+    | \\.
+    | (?P<delim>;)
+    | (?P<open>['"\\]|--|/\*|\$(?<!\w\$)(?:[A-Za-z_]\w*)?\$)
+    | [/$-]
+    | \Z
+    )
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+_NON_SPACE_PATTERN = re.compile(r"\S")
+_LEADING_COMMENTS_PATTERN = re.compile(r"\A(?:\s+|--[^\n]*(?:\n|\Z)|/\*.*?\*/)*", re.DOTALL)
+_QUERY_PATTERN = re.compile(r"(?:select|with|values|table|show|explain|describe)\b", re.IGNORECASE)
+# Any of these makes a query statement writable: SELECT ... INTO, data-modifying
+# CTEs, EXPLAIN ANALYZE of DML, row locks.
+_WRITE_KEYWORD_PATTERN = re.compile(
+    r"\b(?:insert|update|delete|merge|into|create|drop|alter|truncate|call|copy|lock)\b",
+    re.IGNORECASE,
+)
 
 
 class DirectiveParseError(ValueError):
     pass
 
 
-def _split_statements(sql: str) -> list[SQLStatement]:
+def _scan_delimiters(sql: str, start: int, end: int) -> tuple[list[int], bool]:
+    """Return the offsets of top-level ``;`` in ``sql[start:end]``.
+
+    Quoted strings, comments and dollar-quoted bodies are consumed whole by
+    ``_TOKEN_PATTERN``, so a ``;`` inside them never ends a statement. The second
+    element is False when the range ends inside one of them, i.e. when scanning
+    cannot resume cleanly at ``end``.
+    """
+    delimiters: list[int] = []
+    for match in _TOKEN_PATTERN.finditer(sql, start, end):
+        kind = match.lastgroup
+        if kind == "delim":
+            delimiters.append(match.end() - 1)
+        elif kind == "open":
+            return delimiters, False
+    return delimiters, True
+
+
+def _build_statements(sql: str, start: int, end: int, delimiters: list[int]) -> list[SQLStatement]:
     statements: list[SQLStatement] = []
-    buffer: list[str] = []
-    start = 0
-    in_single = False
-    in_double = False
-    escape = False
-    for idx, char in enumerate(sql):
-        if escape:
-            buffer.append(char)
-            escape = False
-            continue
-        if char == "\\":
-            escape = True
-            buffer.append(char)
-            continue
-        if char == "'" and not in_double:
-            in_single = not in_single
-        elif char == '"' and not in_single:
-            in_double = not in_double
-        if char == ";" and not in_single and not in_double:
-            text = "".join(buffer).strip()
-            if text:
-                statements.append(SQLStatement(len(statements), text, start, idx))
-            buffer = []
-            start = idx + 1
-        else:
-            buffer.append(char)
-    tail = "".join(buffer).strip()
-    if tail:
-        statements.append(SQLStatement(len(statements), tail, start, len(sql)))
+    cursor = start
+    for idx in [*delimiters, end]:
+        text = sql[cursor:idx].strip()
+        if text:
+            statements.append(SQLStatement(len(statements), text, cursor - start, idx - start))
+        cursor = idx + 1
     return statements
 
 
+def _split_statements(sql: str) -> list[SQLStatement]:
+    delimiters, _ = _scan_delimiters(sql, 0, len(sql))
+    return _build_statements(sql, 0, len(sql), delimiters)
+
+
 def _literal_eval(node: ast.AST) -> Any:
     try:
         return ast.literal_eval(node)
@@ -77,62 +106,27 @@ def _parse_func_name(node: ast.AST) -> str:
     raise DirectiveParseError("Unsupported function name in directive")
 
 
+def _parse_directive_match(match: re.Match[str]) -> DirectiveCall:
+    raw = match.group(0)
+    inner = match.group(1)
+    try:
+        parsed = ast.parse(inner, mode="eval")
+    except SyntaxError as exc:
+        raise DirectiveParseError(f"Invalid directive syntax: {inner}") from exc
+    name, args, kwargs = _parse_callable(parsed.body)
+    return DirectiveCall(name=name, args=args, kwargs=kwargs, raw=raw)
+
+
 def parse_directives(source: str) -> list[DirectiveCall]:
-    directives: list[DirectiveCall] = []
-    for match in DIRECTIVE_PATTERN.finditer(source):
-        raw = match.group(0)
-        inner = match.group(1)
-        try:
-            parsed = ast.parse(inner, mode="eval")
-        except SyntaxError as exc:
-            raise DirectiveParseError(f"Invalid directive syntax: {inner}") from exc
-        name, args, kwargs = _parse_callable(parsed.body)
-        directives.append(DirectiveCall(name=name, args=args, kwargs=kwargs, raw=raw))
-    return directives
+    return [_parse_directive_match(match) for match in DIRECTIVE_PATTERN.finditer(source)]
 
 
 def strip_directives(source: str) -> str:
     return DIRECTIVE_PATTERN.sub("", source)
 
 
-def _segment_sql(source: str, directives: list[DirectiveCall]) -> list[SQLSegment]:
-    segments: list[SQLSegment] = []
-    matches = list(DIRECTIVE_PATTERN.finditer(source))
-    if len(matches) != len(directives):
-        raise DirectiveParseError("Directive list does not match source")
-    cursor = 0
-    pending_directive: DirectiveCall | None = None
-    pending_sql = ""
-
-    def build_segment(directive: DirectiveCall, sql_text: str) -> None:
-        sql_source = strip_directives(sql_text)
-        statements = _split_statements(sql_source)
-        segments.append(SQLSegment(sql_parsed=SQLParsed(source=sql_source, statements=statements), directive=directive))
-
-    for match, directive in zip(matches, directives, strict=True):
-        sql_chunk = source[cursor : match.start()]
-        pending_sql += sql_chunk
-        if pending_directive is not None and strip_directives(pending_sql).strip():
-            build_segment(pending_directive, pending_sql)
-            pending_directive = None
-            pending_sql = ""
-        elif pending_directive is None and strip_directives(pending_sql).strip():
-            build_segment(directive, pending_sql)
-            pending_sql = ""
-            cursor = match.end()
-            continue
-        pending_directive = directive
-        cursor = match.end()
-    pending_sql += source[cursor:]
-    if pending_directive is not None:
-        build_segment(pending_directive, pending_sql)
-        pending_sql = ""
-    if strip_directives(pending_sql).strip():
-        build_segment(
-            DirectiveCall(name="success", args=(), kwargs={}, raw=""),
-            pending_sql,
-        )
-    return segments
+def _has_sql(sql: str, start: int, end: int) -> bool:
+    return _NON_SPACE_PATTERN.search(sql, start, end) is not None
 
 
 @dataclass(frozen=True)
@@ -142,18 +136,98 @@ class ParsedFile:
     segments: list[SQLSegment]
 
 
-def parse_file(path: Path) -> ParsedFile:
-    source = path.read_text(encoding="utf-8")
-    directives = parse_directives(source)
+def parse_source(source: str) -> ParsedFile:
+    """Parse a SQL test source into statements, directives and segments.
+
+    Directives are located once; the stripped SQL is then scanned segment by
+    segment and the full-file statement list is assembled from the same scan.
+    """
+    matches = list(DIRECTIVE_PATTERN.finditer(source))
+    directives = [_parse_directive_match(match) for match in matches]
     if any(directive.name == "config" for directive in directives):
         raise DirectiveParseError("config() is not supported; use exit_on_failure on directives")
-    sql_source = strip_directives(source)
-    statements = _split_statements(sql_source)
+
+    chunks: list[str] = []
+    chunk_ends: list[int] = []
+    cursor = 0
+    length = 0
+    for match in matches:
+        chunk = source[cursor : match.start()]
+        chunks.append(chunk)
+        length += len(chunk)
+        chunk_ends.append(length)
+        cursor = match.end()
+    chunks.append(source[cursor:])
+    sql_source = "".join(chunks)
+
+    segments: list[SQLSegment] = []
+    delimiters: list[int] = []
+    resumable = True
+
+    def build_segment(directive: DirectiveCall, start: int, end: int) -> None:
+        nonlocal resumable
+        segment_delimiters, clean = _scan_delimiters(sql_source, start, end)
+        delimiters.extend(segment_delimiters)
+        resumable = resumable and (clean or end == len(sql_source))
+        statements = _build_statements(sql_source, start, end, segment_delimiters)
+        segments.append(
+            SQLSegment(
+                sql_parsed=SQLParsed(source=sql_source[start:end], statements=statements),
+                directive=directive,
+            )
+        )
+
+    pending_directive: DirectiveCall | None = None
+    pending_start = 0
+    for directive, chunk_end in zip(directives, chunk_ends, strict=True):
+        has_sql = _has_sql(sql_source, pending_start, chunk_end)
+        if pending_directive is not None and has_sql:
+            build_segment(pending_directive, pending_start, chunk_end)
+            pending_start = chunk_end
+        elif pending_directive is None and has_sql:
+            build_segment(directive, pending_start, chunk_end)
+            pending_start = chunk_end
+            continue
+        pending_directive = directive
+    if pending_directive is not None:
+        build_segment(pending_directive, pending_start, len(sql_source))
+        pending_start = len(sql_source)
+    if _has_sql(sql_source, pending_start, len(sql_source)):
+        build_segment(
+            DirectiveCall(name="success", args=(), kwargs={}, raw=""),
+            pending_start,
+            len(sql_source),
+        )
+
+    if not resumable:
+        delimiters, _ = _scan_delimiters(sql_source, 0, len(sql_source))
+    statements = _build_statements(sql_source, 0, len(sql_source), delimiters)
     sql_parsed = SQLParsed(source=sql_source, statements=statements)
-    segments = _segment_sql(source, directives)
     return ParsedFile(sql_parsed=sql_parsed, directives=directives, segments=segments)
 
 
+def parse_file(path: Path) -> ParsedFile:
+    return parse_source(path.read_text(encoding="utf-8"))
+
+
+def is_read_only(sql_parsed: SQLParsed) -> bool:
+    """Whether every statement is a query that cannot write.
+
+    Conservative and keyword based: a query mentioning a writing keyword
+    anywhere (even in a string literal) is treated as writable, and side
+    effects inside functions cannot be detected.
+    """
+    if not sql_parsed.statements:
+        return False
+    return all(is_read_only_statement(statement.text) for statement in sql_parsed.statements)
+
+
+def is_read_only_statement(text: str) -> bool:
+    """:func:`is_read_only` for one statement's text."""
+    text = _LEADING_COMMENTS_PATTERN.sub("", text)
+    return bool(_QUERY_PATTERN.match(text)) and not _WRITE_KEYWORD_PATTERN.search(text)
+
+
 def summarize_directives(directives: Iterable[DirectiveCall]) -> dict[str, Any]:
     summary: dict[str, Any] = {
         "serial": False,
@@ -161,6 +235,11 @@ def summarize_directives(directives: Iterable[DirectiveCall]) -> dict[str, Any]:
         "retries": 0,
         "tags": [],
         "name": None,
+        "depends_on": [],
+        "provides": [],
+        "fixtures": [],
+        "isolated": None,
+        "retry_backoff": None,
     }
     for directive in directives:
         if "serial" in directive.kwargs:
@@ -169,12 +248,20 @@ def summarize_directives(directives: Iterable[DirectiveCall]) -> dict[str, Any]:
             summary["timeout"] = max(summary["timeout"] or 0, float(directive.kwargs["timeout"]))
         if "retries" in directive.kwargs:
             summary["retries"] = max(summary["retries"], int(directive.kwargs["retries"]))
-        if "tags" in directive.kwargs:
-            tags = directive.kwargs["tags"]
-            if isinstance(tags, str):
-                summary["tags"].append(tags)
-            else:
-                summary["tags"].extend(list(tags))
+        if "retry_backoff" in directive.kwargs:
+            backoff = float(directive.kwargs["retry_backoff"])
+            summary["retry_backoff"] = max(summary["retry_backoff"] or 0.0, backoff)
+        if "isolated" in directive.kwargs:
+            # Any segment that must commit opts the whole test out.
+            isolated = bool(directive.kwargs["isolated"])
+            summary["isolated"] = isolated and summary["isolated"] is not False
+        for key in ("tags", "depends_on", "provides", "fixtures"):
+            if key in directive.kwargs:
+                values = directive.kwargs[key]
+                if isinstance(values, str):
+                    summary[key].append(values)
+                else:
+                    summary[key].extend(list(values))
         if "name" in directive.kwargs and not summary["name"]:
             summary["name"] = str(directive.kwargs["name"])
     return summary
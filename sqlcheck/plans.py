@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping, Sequence
+
+# Statements EXPLAIN accepts on every supported dialect.
+EXPLAINABLE_PATTERN = re.compile(
+    r"^\s*(?:select|with|values|table|insert|update|delete|merge)\b", re.IGNORECASE
+)
+DEFAULT_COST_TOLERANCE = 0.2
+
+_SQLITE_DETAIL = re.compile(r"^(?P<operation>[A-Z][A-Z ]*?)\s+(?P<relation>\S+)(?P<rest>.*)$")
+_SQLITE_INDEX = re.compile(r"USING (?:AUTOMATIC )?(?:COVERING )?INDEX (?P<index>\w+)")
+
+
+class PlanError(RuntimeError):
+    """EXPLAIN could not be run or its output could not be read."""
+
+
+@dataclass(frozen=True)
+class PlanNode:
+    """One operator of a query plan, normalized across dialects."""
+
+    operation: str
+    depth: int = 0
+    relation: str | None = None
+    index: str | None = None
+    cost: float | None = None
+    rows: float | None = None
+
+    def shape(self) -> str:
+        """Cost-free description used to compare plans, e.g. ``Index Scan on t using ix``."""
+        text = "  " * self.depth + self.operation
+        if self.relation:
+            text += f" on {self.relation}"
+        if self.index:
+            text += f" using {self.index}"
+        return text
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """Normalized plan of the ``statement``-th statement of a segment."""
+
+    statement: int
+    nodes: list[PlanNode] = field(default_factory=list)
+    total_cost: float | None = None
+
+    @property
+    def indexes(self) -> list[str]:
+        return [node.index for node in self.nodes if node.index]
+
+    @property
+    def operations(self) -> list[str]:
+        return [node.operation for node in self.nodes]
+
+    def shape(self) -> list[str]:
+        return [node.shape() for node in self.nodes]
+
+    def uses_index(self, name: str) -> bool:
+        return name.lower() in (index.lower() for index in self.indexes)
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "statement": self.statement,
+            "total_cost": self.total_cost,
+            "operations": self.operations,
+            "indexes": self.indexes,
+            "shape": self.shape(),
+            "nodes": [
+                {
+                    "operation": node.operation,
+                    "depth": node.depth,
+                    "relation": node.relation,
+                    "index": node.index,
+                    "cost": node.cost,
+                    "rows": node.rows,
+                }
+                for node in self.nodes
+            ],
+        }
+
+
+def explain_sql(dialect: str, statement: str, analyze: bool = False) -> str:
+    """The EXPLAIN statement for ``statement`` on ``dialect``.
+
+    ``analyze`` executes the statement to measure actual costs, so callers
+    must roll it back.
+    """
+    statement = statement.strip().rstrip(";")
+    if dialect == "postgresql":
+        options = "ANALYZE, FORMAT JSON" if analyze else "FORMAT JSON"
+        return f"EXPLAIN ({options}) {statement}"
+    if dialect in {"mysql", "mariadb"}:
+        return f"EXPLAIN ANALYZE {statement}" if analyze else f"EXPLAIN FORMAT=JSON {statement}"
+    if dialect == "sqlite":
+        return f"EXPLAIN QUERY PLAN {statement}"
+    if dialect == "duckdb":
+        return f"EXPLAIN (ANALYZE, FORMAT JSON) {statement}" if analyze else (
+            f"EXPLAIN (FORMAT JSON) {statement}"
+        )
+    return f"EXPLAIN ANALYZE {statement}" if analyze else f"EXPLAIN {statement}"
+
+
+def parse_plan(dialect: str, statement: int, rows: Sequence[Sequence[Any]]) -> QueryPlan:
+    """Normalize the rows returned by :func:`explain_sql` into a :class:`QueryPlan`."""
+    try:
+        if dialect == "postgresql":
+            return _parse_postgres(statement, rows)
+        if dialect in {"mysql", "mariadb"} and rows and _is_json(rows[0][0]):
+            return _parse_mysql(statement, rows)
+        if dialect == "sqlite":
+            return _parse_sqlite(statement, rows)
+        if dialect == "duckdb":
+            return _parse_duckdb(statement, rows)
+    except (KeyError, IndexError, TypeError, ValueError) as exc:
+        raise PlanError(f"Unrecognized {dialect} EXPLAIN output: {exc}") from exc
+    return _parse_text(statement, rows)
+
+
+def compare_plans(
+    current: Sequence[QueryPlan],
+    baseline: Sequence[Mapping[str, Any]],
+    tolerance: float = DEFAULT_COST_TOLERANCE,
+) -> list[str]:
+    """Regressions of ``current`` against baseline payloads (see ``QueryPlan.to_payload``).
+
+    A plan regresses when its shape (operators, relations and indexes)
+    changed, or when its total cost grew by more than ``tolerance``.
+    """
+    problems: list[str] = []
+    expected = {entry["statement"]: entry for entry in baseline}
+    for plan in current:
+        entry = expected.get(plan.statement)
+        label = f"statement {plan.statement + 1}"
+        if entry is None:
+            problems.append(f"{label}: not in the baseline")
+            continue
+        if plan.shape() != list(entry.get("shape", [])):
+            problems.append(
+                f"{label}: plan changed from {entry.get('shape')} to {plan.shape()}"
+            )
+        cost = entry.get("total_cost")
+        if cost is not None and plan.total_cost is not None:
+            if plan.total_cost > cost * (1 + tolerance):
+                problems.append(
+                    f"{label}: cost {plan.total_cost:g} exceeds baseline {cost:g} "
+                    f"by more than {tolerance:.0%}"
+                )
+    return problems
+
+
+def _is_json(value: Any) -> bool:
+    return isinstance(value, (dict, list)) or (
+        isinstance(value, str) and value.lstrip()[:1] in {"{", "["}
+    )
+
+
+def _load(value: Any) -> Any:
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+
+def _number(value: Any) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_postgres(statement: int, rows: Sequence[Sequence[Any]]) -> QueryPlan:
+    document = _load(rows[0][0])
+    root = (document[0] if isinstance(document, list) else document)["Plan"]
+    nodes: list[PlanNode] = []
+
+    def visit(node: Mapping[str, Any], depth: int) -> None:
+        nodes.append(
+            PlanNode(
+                operation=node["Node Type"],
+                depth=depth,
+                relation=node.get("Relation Name"),
+                index=node.get("Index Name"),
+                cost=_number(node.get("Total Cost")),
+                rows=_number(node.get("Plan Rows")),
+            )
+        )
+        for child in node.get("Plans", []):
+            visit(child, depth + 1)
+
+    visit(root, 0)
+    return QueryPlan(statement=statement, nodes=nodes, total_cost=_number(root.get("Total Cost")))
+
+
+def _parse_mysql(statement: int, rows: Sequence[Sequence[Any]]) -> QueryPlan:
+    block = _load(rows[0][0])["query_block"]
+    nodes: list[PlanNode] = []
+
+    def visit(value: Any, depth: int) -> None:
+        if isinstance(value, list):
+            for item in value:
+                visit(item, depth)
+            return
+        if not isinstance(value, dict):
+            return
+        if "table_name" in value:
+            cost_info = value.get("cost_info", {})
+            nodes.append(
+                PlanNode(
+                    operation=str(value.get("access_type", "table")),
+                    depth=depth,
+                    relation=value["table_name"],
+                    index=value.get("key"),
+                    cost=_number(cost_info.get("prefix_cost")),
+                    rows=_number(value.get("rows_examined_per_scan")),
+                )
+            )
+            depth += 1
+        for key, child in value.items():
+            if key != "cost_info":
+                visit(child, depth)
+
+    visit(block, 0)
+    total = _number(block.get("cost_info", {}).get("query_cost"))
+    return QueryPlan(statement=statement, nodes=nodes, total_cost=total)
+
+
+def _parse_sqlite(statement: int, rows: Sequence[Sequence[Any]]) -> QueryPlan:
+    depths: dict[int, int] = {0: -1}
+    nodes: list[PlanNode] = []
+    for node_id, parent, _unused, detail in rows:
+        depth = depths.get(parent, -1) + 1
+        depths[node_id] = depth
+        match = _SQLITE_DETAIL.match(detail)
+        if match and match.group("operation") in {"SCAN", "SEARCH"}:
+            index = _SQLITE_INDEX.search(match.group("rest"))
+            nodes.append(
+                PlanNode(
+                    operation=match.group("operation"),
+                    depth=depth,
+                    relation=match.group("relation"),
+                    index=index.group("index") if index else None,
+                )
+            )
+        else:
+            nodes.append(PlanNode(operation=detail, depth=depth))
+    return QueryPlan(statement=statement, nodes=nodes)
+
+
+def _parse_duckdb(statement: int, rows: Sequence[Sequence[Any]]) -> QueryPlan:
+    document = _load(rows[0][1])
+    nodes: list[PlanNode] = []
+
+    def visit(node: Mapping[str, Any], depth: int) -> None:
+        operation = (node.get("name") or node.get("operator_name") or "").strip()
+        # EXPLAIN ANALYZE wraps the plan in a query node and an EXPLAIN_ANALYZE operator.
+        if operation and operation != "EXPLAIN_ANALYZE":
+            extra = node.get("extra_info") or {}
+            table = extra.get("Table")
+            nodes.append(
+                PlanNode(
+                    operation=operation,
+                    depth=depth,
+                    relation=table.rsplit(".", 1)[-1] if isinstance(table, str) else None,
+                    index=extra.get("Index") if isinstance(extra.get("Index"), str) else None,
+                    rows=_number(
+                        node.get("operator_cardinality", extra.get("Estimated Cardinality"))
+                    ),
+                )
+            )
+            depth += 1
+        for child in node.get("children", []):
+            visit(child, depth)
+
+    for root in document if isinstance(document, list) else [document]:
+        visit(root, 0)
+    return QueryPlan(statement=statement, nodes=nodes)
+
+
+def _parse_text(statement: int, rows: Iterable[Sequence[Any]]) -> QueryPlan:
+    nodes = [
+        PlanNode(operation=line.strip(), depth=(len(line) - len(line.lstrip())) // 2)
+        for row in rows
+        for line in str(row[-1]).splitlines()
+        if line.strip()
+    ]
+    return QueryPlan(statement=statement, nodes=nodes)
+
+
+__all__ = [
+    "DEFAULT_COST_TOLERANCE",
+    "EXPLAINABLE_PATTERN",
+    "PlanError",
+    "PlanNode",
+    "QueryPlan",
+    "compare_plans",
+    "explain_sql",
+    "parse_plan",
+]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlcheck.models import TestResult
+
+DEFAULT_PROFILE_SIZE = 10
+PHASES = ("pool wait", "execute", "fetch", "commit", "evaluate", "backoff")
+
+
+@dataclass(frozen=True)
+class StatementProfile:
+    """One executed statement, as listed by ``--profile``."""
+
+    duration_s: float
+    execute_s: float
+    fetch_s: float
+    path: Path
+    segment: int
+    statement: int
+    text: str
+
+
+class SlowestStatements:
+    """Keep the ``size`` slowest statements seen across a run, plus time per phase.
+
+    Only the current top ``size`` entries are retained, so memory does not
+    grow with the suite. Segments served from a cache are ignored.
+    """
+
+    def __init__(self, size: int = DEFAULT_PROFILE_SIZE) -> None:
+        self.size = size
+        self.statements = 0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self._heap: list[tuple[float, int, StatementProfile]] = []
+        self._counter = itertools.count()
+
+    def add(self, result: TestResult) -> None:
+        if result.cached:
+            return
+        self.phases["pool wait"] += result.status.pool_wait_s
+        for segment_index, (segment, status) in enumerate(
+            zip(result.case.segments, result.segments)
+        ):
+            if status.cache_hit:
+                continue
+            self.phases["commit"] += status.commit_s
+            self.phases["evaluate"] += status.evaluate_s
+            self.phases["backoff"] += status.backoff_s
+            statements = segment.sql_parsed.statements
+            for timing in status.statement_timings:
+                self.statements += 1
+                self.phases["execute"] += timing.execute_s
+                self.phases["fetch"] += timing.fetch_s
+                if len(self._heap) >= self.size and timing.duration_s <= self._heap[0][0]:
+                    continue
+                text = (
+                    statements[timing.index].text
+                    if timing.index < len(statements)
+                    else segment.sql_parsed.source
+                )
+                entry = StatementProfile(
+                    duration_s=timing.duration_s,
+                    execute_s=timing.execute_s,
+                    fetch_s=timing.fetch_s,
+                    path=result.case.path,
+                    segment=segment_index,
+                    statement=timing.index,
+                    text=text.strip(),
+                )
+                item = (timing.duration_s, next(self._counter), entry)
+                if len(self._heap) < self.size:
+                    heapq.heappush(self._heap, item)
+                else:
+                    heapq.heapreplace(self._heap, item)
+
+    def slowest(self) -> list[StatementProfile]:
+        """The retained statements, slowest first."""
+        return [entry for _, _, entry in sorted(self._heap, reverse=True)]
+
+
+__all__ = ["DEFAULT_PROFILE_SIZE", "PHASES", "SlowestStatements", "StatementProfile"]
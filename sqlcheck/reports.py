@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-import json
+import shutil
+import tempfile
+import textwrap
 from dataclasses import asdict
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Iterable, Iterator, Sequence
 from xml.etree import ElementTree
 
-from sqlcheck.models import TestCase, TestResult
+from sqlcheck import serialization
+from sqlcheck.models import ExecutionOutput, FunctionResult, SQLParsed, TestCase, TestResult
 
 
 def build_plan_payload(case: TestCase) -> dict[str, Any]:
@@ -17,10 +20,9 @@ def build_plan_payload(case: TestCase) -> dict[str, Any]:
         "serial": case.metadata.serial,
         "timeout": case.metadata.timeout,
         "retries": case.metadata.retries,
-        "statements": [
-            {"index": stmt.index, "text": stmt.text, "start": stmt.start, "end": stmt.end}
-            for stmt in case.sql_parsed.statements
-        ],
+        "depends_on": case.metadata.depends_on,
+        "provides": case.metadata.provides,
+        "statements": build_statements_payload(case.sql_parsed),
         "directives": [
             {"name": directive.name, "args": directive.args, "kwargs": directive.kwargs}
             for directive in case.directives
@@ -28,62 +30,318 @@ def build_plan_payload(case: TestCase) -> dict[str, Any]:
     }
 
 
-def write_plan(result: TestResult, path: Path) -> None:
-    payload = build_plan_payload(result.case)
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+def build_result_payload(result: TestResult, max_rows: int | None = None) -> dict[str, Any]:
+    return {
+        "path": str(result.case.path),
+        "name": result.case.metadata.name,
+        "tags": result.case.metadata.tags,
+        "serial": result.case.metadata.serial,
+        "timeout": result.case.metadata.timeout,
+        "retries": result.case.metadata.retries,
+        "depends_on": result.case.metadata.depends_on,
+        "provides": result.case.metadata.provides,
+        "status": asdict(result.status),
+        "segments": [asdict(status) for status in result.segments],
+        "output": build_output_payload(result.output, max_rows),
+        "function_results": [asdict(item) for item in result.function_results],
+        "success": result.success,
+        "cached": result.cached,
+        "statements": build_statements_payload(result.case.sql_parsed),
+    }
+
+
+def build_statements_payload(sql_parsed: SQLParsed) -> list[dict[str, Any]]:
+    return [
+        {"index": stmt.index, "text": stmt.text, "start": stmt.start, "end": stmt.end}
+        for stmt in sql_parsed.statements
+    ]
 
 
-def write_case_plan(case: TestCase, path: Path) -> None:
+def build_output_payload(output: ExecutionOutput, max_rows: int | None = None) -> dict[str, Any]:
+    """Serialize ``output``; ``max_rows`` keeps at most that many rows (0 leaves them out).
+
+    Rows dropped here mark the payload ``truncated`` and ``row_count`` keeps
+    the total, as for rows dropped at capture time.
+    """
+    rows = output.row_values(max_rows)
+    truncated = output.truncated or (max_rows is not None and output.captured_rows > max_rows)
+    return {
+        "stdout": output.stdout,
+        "stderr": output.stderr,
+        "rows": rows,
+        "row_count": output.total_rows,
+        "truncated": truncated,
+        "columns": output.columns,
+        "plans": [plan.to_payload() for plan in output.plans],
+    }
+
+
+def plan_file_name(case: TestCase) -> str:
+    relative_name = str(case.path).replace("/", "__").replace("\\", "__")
+    return f"{relative_name}.plan.json"
+
+
+def write_plan(result: TestResult, path: Path, indent: bool = False) -> None:
+    write_case_plan(result.case, path, indent)
+
+
+def write_case_plan(case: TestCase, path: Path, indent: bool = False) -> None:
     payload = build_plan_payload(case)
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-
-
-def write_json(results: list[TestResult], path: Path) -> None:
-    payload = []
-    for result in results:
-        payload.append(
-            {
-                "path": str(result.case.path),
-                "name": result.case.metadata.name,
-                "tags": result.case.metadata.tags,
-                "serial": result.case.metadata.serial,
-                "timeout": result.case.metadata.timeout,
-                "retries": result.case.metadata.retries,
-                "status": asdict(result.status),
-                "output": asdict(result.output),
-                "function_results": [asdict(item) for item in result.function_results],
-                "success": result.success,
-                "statements": [
-                    {"index": stmt.index, "text": stmt.text, "start": stmt.start, "end": stmt.end}
-                    for stmt in result.case.sql_parsed.statements
-                ],
-            }
-        )
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    path.write_text(serialization.dumps(payload, indent), encoding="utf-8")
+
+
+class ReportWriter:
+    """Incremental report writer: ``add`` each result as it finishes, then ``close``."""
+
+    def add(self, result: TestResult) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+class JSONReportWriter(ReportWriter):
+    """Stream a JSON array, one compact entry per line unless ``indent``."""
+
+    def __init__(self, path: Path, max_rows: int | None = None, indent: bool = False) -> None:
+        self._handle: IO[str] = path.open("w", encoding="utf-8")
+        self._handle.write("[")
+        self.max_rows = max_rows
+        self.indent = indent
+        self.count = 0
+
+    def add(self, result: TestResult) -> None:
+        self.add_payload(build_result_payload(result, self.max_rows))
+
+    def add_payload(self, payload: dict[str, Any]) -> None:
+        entry = serialization.dumps(payload, self.indent)
+        self._handle.write(",\n" if self.count else "\n")
+        self._handle.write(textwrap.indent(entry, "  ") if self.indent else entry)
+        self.count += 1
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self._handle.write("\n]" if self.count else "]")
+        self._handle.close()
+
+
+class JSONLReportWriter(ReportWriter):
+    """Write one compact JSON object per line, flushed as each result finishes.
+
+    Unlike :class:`JSONReportWriter` the file is valid after every line, so
+    it can be tailed during a run and read back after an interrupted one.
+    """
+
+    def __init__(self, path: Path, max_rows: int | None = None) -> None:
+        self._handle: IO[str] = path.open("w", encoding="utf-8")
+        self.max_rows = max_rows
+        self.count = 0
+
+    def add(self, result: TestResult) -> None:
+        self.add_payload(build_result_payload(result, self.max_rows))
+
+    def add_payload(self, payload: dict[str, Any]) -> None:
+        self._handle.write(serialization.dumps(payload) + "\n")
+        self._handle.flush()
+        self.count += 1
+
+    def close(self) -> None:
+        self._handle.close()
 
 
-def write_junit(results: list[TestResult], path: Path) -> None:
-    testsuite = ElementTree.Element("testsuite", name="sqlcheck")
-    testsuite.set("tests", str(len(results)))
-    testsuite.set("failures", str(sum(1 for result in results if not result.success)))
+class JUnitReportWriter(ReportWriter):
+    """Stream ``<testcase>`` elements to a spool file.
 
-    for result in results:
-        testcase = ElementTree.SubElement(
-            testsuite,
-            "testcase",
-            name=result.case.metadata.name,
-            classname=str(result.case.path),
-            time=f"{result.status.duration_s:.3f}",
+    The ``<testsuite>`` totals are only known at the end, so the header is
+    written on ``close`` and the spooled cases are copied after it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._spool: IO[str] = tempfile.TemporaryFile("w+", encoding="utf-8")
+        self.tests = 0
+        self.failures = 0
+        self.skipped = 0
+
+    def add(self, result: TestResult) -> None:
+        messages = [
+            item.message
+            for item in result.function_results
+            if not item.success and item.message
+        ]
+        self.add_element(
+            _junit_testcase(
+                name=result.case.metadata.name,
+                classname=str(result.case.path),
+                duration_s=result.status.duration_s,
+                failure="\n".join(messages) if not result.success else None,
+                skipped=_cached_message(result.function_results) if result.cached else None,
+                cache_hit=result.status.cache_hit,
+                retries=sum(status.attempts - 1 for status in result.segments),
+            )
         )
-        if not result.success:
-            failure = ElementTree.SubElement(testcase, "failure")
-            messages = [
-                item.message
-                for item in result.function_results
-                if not item.success and item.message
-            ]
-            detail = "\n".join(messages)
-            failure.text = detail
-
-    tree = ElementTree.ElementTree(testsuite)
-    tree.write(path, encoding="utf-8", xml_declaration=True)
+
+    def add_payload(self, payload: dict[str, Any]) -> None:
+        """Add a result from a JSON report entry (see ``build_result_payload``)."""
+        messages = [
+            item["message"]
+            for item in payload["function_results"]
+            if not item["success"] and item.get("message")
+        ]
+        self.add_element(
+            _junit_testcase(
+                name=payload["name"],
+                classname=payload["path"],
+                duration_s=payload["status"]["duration_s"],
+                failure="\n".join(messages) if not payload["success"] else None,
+                skipped=(
+                    _cached_message(FunctionResult(**item) for item in payload["function_results"])
+                    if payload.get("cached")
+                    else None
+                ),
+                cache_hit=payload["status"].get("cache_hit", False),
+                retries=sum(
+                    status.get("attempts", 1) - 1 for status in payload.get("segments", [])
+                ),
+            )
+        )
+
+    def add_element(self, testcase: ElementTree.Element) -> None:
+        if testcase.find("failure") is not None or testcase.find("error") is not None:
+            self.failures += 1
+        if testcase.find("skipped") is not None:
+            self.skipped += 1
+        self.tests += 1
+        self._spool.write(ElementTree.tostring(testcase, encoding="unicode"))
+
+    def close(self) -> None:
+        if self._spool.closed:
+            return
+        self._spool.seek(0)
+        with self.path.open("w", encoding="utf-8") as handle:
+            handle.write("<?xml version='1.0' encoding='utf-8'?>\n")
+            handle.write(
+                f'<testsuite name="sqlcheck" tests="{self.tests}" failures="{self.failures}" '
+                f'skipped="{self.skipped}">'
+            )
+            shutil.copyfileobj(self._spool, handle)
+            handle.write("</testsuite>")
+        self._spool.close()
+
+
+def _junit_testcase(
+    name: str,
+    classname: str,
+    duration_s: float,
+    failure: str | None,
+    skipped: str | None = None,
+    cache_hit: bool = False,
+    retries: int = 0,
+) -> ElementTree.Element:
+    testcase = ElementTree.Element(
+        "testcase", name=name, classname=classname, time=f"{duration_s:.3f}"
+    )
+    if cache_hit or retries:
+        properties = ElementTree.SubElement(testcase, "properties")
+        if cache_hit:
+            ElementTree.SubElement(properties, "property", name="result_cache", value="hit")
+        if retries:
+            ElementTree.SubElement(properties, "property", name="retries", value=str(retries))
+    if failure is not None:
+        ElementTree.SubElement(testcase, "failure").text = failure
+    if skipped is not None:
+        ElementTree.SubElement(testcase, "skipped", message=skipped)
+    return testcase
+
+
+def _cached_message(function_results: Iterable[FunctionResult]) -> str:
+    return next(
+        (item.message for item in function_results if item.name == "cached" and item.message),
+        "Cached",
+    )
+
+
+class PlanReportWriter(ReportWriter):
+    def __init__(self, plan_dir: Path, indent: bool = False) -> None:
+        self.plan_dir = plan_dir
+        self.indent = indent
+        plan_dir.mkdir(parents=True, exist_ok=True)
+
+    def add(self, result: TestResult) -> None:
+        write_plan(result, self.plan_dir / plan_file_name(result.case), self.indent)
+
+
+class PlanFileWriter(JSONReportWriter):
+    """Bundle every plan into one JSON array instead of a file per test."""
+
+    def __init__(self, path: Path, indent: bool = False) -> None:
+        super().__init__(path, indent=indent)
+
+    def add(self, result: TestResult) -> None:
+        self.add_payload(build_plan_payload(result.case))
+
+
+def _write_all(writer: ReportWriter, results: Iterable[TestResult]) -> None:
+    with writer:
+        for result in results:
+            writer.add(result)
+
+
+def write_json(results: Iterable[TestResult], path: Path) -> None:
+    _write_all(JSONReportWriter(path), results)
+
+
+def write_jsonl(results: Iterable[TestResult], path: Path) -> None:
+    _write_all(JSONLReportWriter(path), results)
+
+
+def write_junit(results: Iterable[TestResult], path: Path) -> None:
+    _write_all(JUnitReportWriter(path), results)
+
+
+def iter_json_report(path: Path) -> Iterator[dict[str, Any]]:
+    """Result payloads of a JSON report, or of a JSON Lines report (``.jsonl``)."""
+    if path.suffix.lower() == ".jsonl":
+        with path.open(encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    yield serialization.loads(line)
+        return
+    yield from serialization.loads(path.read_bytes())
+
+
+def iter_junit_report(path: Path) -> Iterator[ElementTree.Element]:
+    for _, element in ElementTree.iterparse(path):
+        if element.tag == "testcase":
+            yield element
+            # The caller is done with it; drop its children and text to bound memory.
+            element.clear()
+
+
+def merge_json_reports(reports: Sequence[Path], path: Path) -> int:
+    """Concatenate JSON reports (e.g. one per shard) in the given order."""
+    with JSONReportWriter(path) as writer:
+        for report in reports:
+            for payload in iter_json_report(report):
+                writer.add_payload(payload)
+        return writer.count
+
+
+def merge_junit_reports(reports: Sequence[Path], path: Path) -> int:
+    """Merge JUnit XML reports, or JSON reports converted to JUnit, into one suite."""
+    with JUnitReportWriter(path) as writer:
+        for report in reports:
+            if report.suffix.lower() == ".xml":
+                for testcase in iter_junit_report(report):
+                    writer.add_element(testcase)
+            else:
+                for payload in iter_json_report(report):
+                    writer.add_payload(payload)
+        return writer.tests
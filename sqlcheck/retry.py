@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import random
+import re
+from dataclasses import dataclass
+from typing import Any
+
+from sqlcheck.models import ExecutionStatus, TestCase
+
+DEFAULT_BACKOFF_S = 0.5
+DEFAULT_MAX_BACKOFF_S = 30.0
+
+# SQLSTATEs worth retrying: serialization failures, deadlocks, lock timeouts,
+# server restarts and connection limits. Class 08 (connection exceptions)
+# is transient as a whole.
+TRANSIENT_SQLSTATES = frozenset(
+    {
+        "40001",  # serialization_failure (also SQL Server deadlocks via ODBC)
+        "40P01",  # PostgreSQL deadlock_detected
+        "55P03",  # PostgreSQL lock_not_available
+        "53300",  # PostgreSQL too_many_connections
+        "57P01",  # PostgreSQL admin_shutdown
+        "57P02",  # PostgreSQL crash_shutdown
+        "57P03",  # PostgreSQL cannot_connect_now
+        "HYT00",  # ODBC timeout expired while waiting for a lock or login
+    }
+)
+TRANSIENT_SQLSTATE_CLASSES = ("08",)
+# Driver error numbers for databases that do not expose a SQLSTATE.
+TRANSIENT_ERROR_CODES = frozenset(
+    {
+        "1040",  # MySQL too many connections
+        "1205",  # MySQL lock wait timeout
+        "1213",  # MySQL deadlock
+        "2006",  # MySQL server has gone away
+        "2013",  # MySQL lost connection during query
+        "ORA-00060",  # deadlock detected
+        "ORA-08177",  # cannot serialize access
+        "ORA-03113",  # end-of-file on communication channel
+        "ORA-03135",  # connection lost contact
+    }
+)
+# Drivers without error codes (SQLite, DuckDB) only describe the error.
+_TRANSIENT_MESSAGE = re.compile(
+    r"database is locked|database table is locked|write-write conflict|"
+    r"deadlock detected|could not serialize access",
+    re.IGNORECASE,
+)
+_SQLSTATE_PATTERN = re.compile(r"[0-9A-Z]{5}")
+
+
+def error_code(error: BaseException) -> str | None:
+    """SQLSTATE of a DBAPI error, or the driver's own error number when it has none."""
+    for attribute in ("sqlstate", "pgcode"):  # psycopg / asyncpg, psycopg2
+        value = getattr(error, attribute, None)
+        if isinstance(value, str) and value:
+            return value
+    args: tuple[Any, ...] = getattr(error, "args", ())
+    if not args:
+        return None
+    first = args[0]
+    if isinstance(first, int) and not isinstance(first, bool):  # pymysql, mysqlclient
+        return str(first)
+    code = getattr(first, "code", None)  # oracledb
+    if isinstance(code, int):
+        return f"ORA-{code:05d}"
+    if isinstance(first, str) and _SQLSTATE_PATTERN.fullmatch(first):  # pyodbc
+        return first
+    return None
+
+
+def classify_error(error: BaseException) -> tuple[str | None, bool]:
+    """Error code of a (SQLAlchemy-wrapped) database error and whether it is transient.
+
+    Transient errors, such as deadlocks, serialization failures and dropped
+    connections, may succeed when retried. Everything else, including
+    syntax errors, missing objects and timeouts, is permanent.
+    """
+    original = getattr(error, "orig", None) or error
+    code = error_code(original)
+    if getattr(error, "connection_invalidated", False):
+        return code, True
+    if code is not None and (
+        code in TRANSIENT_SQLSTATES
+        or code in TRANSIENT_ERROR_CODES
+        or (len(code) == 5 and code.startswith(TRANSIENT_SQLSTATE_CLASSES))
+    ):
+        return code, True
+    return code, bool(_TRANSIENT_MESSAGE.search(str(original)))
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry transient execution errors with exponential backoff and full jitter.
+
+    Attempt ``n`` (from 0) waits a random time between 0 and
+    ``min(max_backoff_s, backoff_s * 2 ** n)`` seconds before the next one.
+    """
+
+    retries: int = 0
+    backoff_s: float = DEFAULT_BACKOFF_S
+    max_backoff_s: float = DEFAULT_MAX_BACKOFF_S
+
+    @classmethod
+    def for_case(cls, case: TestCase) -> "RetryPolicy":
+        backoff = case.metadata.retry_backoff
+        return cls(
+            retries=case.metadata.retries,
+            backoff_s=DEFAULT_BACKOFF_S if backoff is None else backoff,
+        )
+
+    def should_retry(self, status: ExecutionStatus, attempt: int) -> bool:
+        return not status.success and status.transient and attempt < self.retries
+
+    def delay(self, attempt: int, rng: random.Random | None = None) -> float:
+        cap = min(self.max_backoff_s, self.backoff_s * 2**attempt)
+        return (rng or random).uniform(0.0, cap)
+
+
+__all__ = [
+    "DEFAULT_BACKOFF_S",
+    "DEFAULT_MAX_BACKOFF_S",
+    "RetryPolicy",
+    "TRANSIENT_ERROR_CODES",
+    "TRANSIENT_SQLSTATES",
+    "TRANSIENT_SQLSTATE_CLASSES",
+    "classify_error",
+    "error_code",
+]
@@ -1,4 +1,28 @@
 from sqlcheck.discovery import build_test_case, discover_files
-from sqlcheck.execution import run_cases, run_test_case
+from sqlcheck.execution import (
+    aiter_results,
+    iter_results,
+    iter_results_async,
+    iter_results_processes,
+    require_thread_engine,
+    run_cases,
+    run_cases_async,
+    run_cases_processes,
+    run_test_case,
+    run_test_case_async,
+)
 
-__all__ = ["build_test_case", "discover_files", "run_cases", "run_test_case"]
+__all__ = [
+    "aiter_results",
+    "build_test_case",
+    "discover_files",
+    "iter_results",
+    "iter_results_async",
+    "iter_results_processes",
+    "require_thread_engine",
+    "run_cases",
+    "run_cases_async",
+    "run_cases_processes",
+    "run_test_case",
+    "run_test_case_async",
+]
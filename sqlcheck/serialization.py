@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from functools import cache
+from importlib import import_module
+from typing import Any, Callable
+
+BACKEND_ENV = "SQLCHECK_JSON_BACKEND"
+# Tried in this order when no backend is requested.
+BACKENDS = ("orjson", "json")
+
+
+@dataclass(frozen=True)
+class JSONBackend:
+    """A JSON implementation: ``dumps`` returns text, compact unless ``indent``."""
+
+    name: str
+    dumps: Callable[[Any, bool], str]
+    loads: Callable[[str | bytes], Any]
+
+
+def _default(value: Any) -> Any:
+    """Encode values JSON has no type for, the way orjson encodes dates."""
+    isoformat = getattr(value, "isoformat", None)
+    if isoformat is not None:
+        return isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    return str(value)
+
+
+def _stdlib_backend() -> JSONBackend:
+    def dumps(value: Any, indent: bool = False) -> str:
+        if indent:
+            return json.dumps(value, indent=2, default=_default)
+        return json.dumps(value, separators=(",", ":"), default=_default)
+
+    return JSONBackend(name="json", dumps=dumps, loads=json.loads)
+
+
+def _orjson_backend() -> JSONBackend:
+    orjson = import_module("orjson")
+    fallback = _stdlib_backend().dumps
+
+    def dumps(value: Any, indent: bool = False) -> str:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(value, default=_default, option=option).decode("utf-8")
+        except TypeError:
+            # orjson rejects integers beyond 64 bits (e.g. HUGEINT, NUMERIC columns).
+            return fallback(value, indent)
+
+    return JSONBackend(name="orjson", dumps=dumps, loads=orjson.loads)
+
+
+_LOADERS: dict[str, Callable[[], JSONBackend]] = {
+    "orjson": _orjson_backend,
+    "json": _stdlib_backend,
+}
+
+
+@cache
+def load_backend(name: str | None = None) -> JSONBackend:
+    """Return the named backend, or the first installed one of :data:`BACKENDS`.
+
+    ``name`` defaults to the ``SQLCHECK_JSON_BACKEND`` environment variable.
+    A named backend that is not installed raises ``ImportError``.
+    """
+    name = name or os.environ.get(BACKEND_ENV)
+    if name:
+        if name not in _LOADERS:
+            raise ValueError(f"Unknown JSON backend '{name}', expected one of {BACKENDS}")
+        return _LOADERS[name]()
+    for candidate in BACKENDS[:-1]:
+        try:
+            return _LOADERS[candidate]()
+        except ImportError:
+            continue
+    return _stdlib_backend()
+
+
+def dumps(value: Any, indent: bool = False) -> str:
+    """Serialize ``value`` with the active backend; compact unless ``indent``."""
+    return load_backend().dumps(value, indent)
+
+
+def loads(data: str | bytes) -> Any:
+    return load_backend().loads(data)
+
+
+__all__ = [
+    "BACKENDS",
+    "BACKEND_ENV",
+    "JSONBackend",
+    "dumps",
+    "load_backend",
+    "loads",
+]
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Sequence
+
+from sqlcheck import serialization
+
+_SHARD_PATTERN = re.compile(r"^\s*(\d+)\s*/\s*(\d+)\s*$")
+
+# Weight of a test without recorded history when nothing is known at all.
+DEFAULT_DURATION_S = 1.0
+
+
+@dataclass(frozen=True)
+class ShardSpec:
+    """One of ``count`` shards, numbered from 1 as in ``--shard 2/4``."""
+
+    index: int
+    count: int
+
+    @classmethod
+    def parse(cls, spec: str) -> "ShardSpec":
+        match = _SHARD_PATTERN.match(spec)
+        if not match:
+            raise ValueError(f"Invalid shard '{spec}'. Expected INDEX/COUNT, e.g. 1/4.")
+        index, count = int(match.group(1)), int(match.group(2))
+        if count < 1 or not 1 <= index <= count:
+            raise ValueError(f"Invalid shard '{spec}'. INDEX must be between 1 and COUNT.")
+        return cls(index=index, count=count)
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def duration_key(path: Path | str) -> str:
+    return Path(path).as_posix()
+
+
+def load_durations(sources: Iterable[Path]) -> dict[str, float]:
+    """Read per-test durations from JSON reports or timing files.
+
+    A JSON report (a list of result payloads) or JSON Lines report (``.jsonl``)
+    contributes each result's ``status.duration_s``; a timing file is an object mapping test paths to
+    seconds. Later sources override earlier ones. Data that is neither raises ``ValueError``.
+    """
+    durations: dict[str, float] = {}
+    for source in sources:
+        text = source.read_text(encoding="utf-8")
+        if source.suffix.lower() == ".jsonl":
+            payload = [serialization.loads(line) for line in text.splitlines() if line.strip()]
+        else:
+            payload = serialization.loads(text)
+        if isinstance(payload, dict):
+            items = payload.items()
+        elif isinstance(payload, list):
+            items = (
+                (entry["path"], entry["status"]["duration_s"])
+                for entry in payload
+                if isinstance(entry, dict) and "path" in entry and "status" in entry
+            )
+        else:
+            raise ValueError(f"Unrecognized timing data in {source}")
+        try:
+            for path, seconds in items:
+                durations[duration_key(path)] = float(seconds)
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Unrecognized timing data in {source}: {exc!r}") from exc
+    return durations
+
+
+def write_durations(path: Path, durations: Mapping[str, float]) -> None:
+    """Atomically write a timing file readable by :func:`load_durations`."""
+    write_json_atomic(path, dict(sorted(durations.items())))
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Write ``data`` as indented JSON via a temporary file, never leaving it half-written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = json.dumps(data, indent=2) + "\n"
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(payload)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def estimate_durations(
+    paths: Iterable[Path],
+    durations: Mapping[str, float] | None = None,
+) -> dict[Path, float]:
+    """Expected duration per path; paths without history get the mean known duration."""
+    durations = durations or {}
+    paths = list(paths)
+    known = [durations[key] for key in map(duration_key, paths) if key in durations]
+    fallback = sum(known) / len(known) if known else DEFAULT_DURATION_S
+    return {path: durations.get(duration_key(path), fallback) for path in paths}
+
+
+def assign_shards(
+    paths: Sequence[Path],
+    count: int,
+    durations: Mapping[str, float] | None = None,
+    groups: Iterable[Sequence[Path]] = (),
+) -> list[list[Path]]:
+    """Partition ``paths`` into ``count`` shards of similar total duration.
+
+    Paths in one of ``groups`` (tests linked through ``depends_on``) stay on
+    one shard and are placed as a unit weighing their summed duration.
+    Longest units are placed first, each on the currently lightest shard
+    (ties go to the lower shard). Tests without history weigh the mean known
+    duration, so with no history at all shards are balanced by file count.
+    Ordering is fully determined by the inputs, so every CI node computes the
+    same partition; each shard keeps discovery order.
+    """
+    weights = estimate_durations(paths, durations)
+    unit_of = {path: (path,) for path in paths}
+    for group in groups:
+        members = tuple(path for path in group if path in unit_of)
+        for path in members:
+            unit_of[path] = members
+    units = {unit: sum(weights[path] for path in unit) for unit in unit_of.values()}
+    totals = [0.0] * count
+    assigned: dict[Path, int] = {}
+    for unit in sorted(units, key=lambda item: (-units[item], duration_key(item[0]))):
+        shard = min(range(count), key=lambda index: (totals[index], index))
+        totals[shard] += units[unit]
+        assigned.update((path, shard) for path in unit)
+    shards: list[list[Path]] = [[] for _ in range(count)]
+    for path in paths:
+        shards[assigned[path]].append(path)
+    return shards
+
+
+def select_shard(
+    paths: Sequence[Path],
+    shard: ShardSpec,
+    durations: Mapping[str, float] | None = None,
+    groups: Iterable[Sequence[Path]] = (),
+) -> list[Path]:
+    return assign_shards(paths, shard.count, durations, groups)[shard.index - 1]
+
+
+__all__ = [
+    "ShardSpec",
+    "assign_shards",
+    "duration_key",
+    "estimate_durations",
+    "load_durations",
+    "select_shard",
+    "write_durations",
+    "write_json_atomic",
+]
@@ -0,0 +1,69 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlcheck.benchmarking import BenchmarkStats, compare_benchmark
+from sqlcheck.db_connector import SQLAlchemyConnector
+from sqlcheck.function_registry import default_registry
+from sqlcheck.runner import build_test_case, run_cases, run_test_case
+
+
+class TestBenchmarking(unittest.TestCase):
+    def test_stats_use_nearest_rank_percentile(self) -> None:
+        stats = BenchmarkStats.from_seconds([i / 1000 for i in range(1, 21)])
+        self.assertAlmostEqual(stats.min_ms, 1.0)
+        self.assertAlmostEqual(stats.median_ms, 10.5)
+        self.assertAlmostEqual(stats.p95_ms, 19.0)
+        self.assertAlmostEqual(stats.max_ms, 20.0)
+        self.assertIsNone(compare_benchmark(stats, {"median_ms": 9.0}, tolerance=0.2))
+        self.assertIn(
+            "p95_ms 19.00 exceeds baseline 10.00",
+            compare_benchmark(stats, {"p95_ms": 10.0}, metric="p95_ms"),
+        )
+
+    def test_benchmark_repeats_segment_on_one_session(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            sql_path = root / "bench.sql"
+            sql_path.write_text(
+                "CREATE TABLE runs (id INTEGER);\n"
+                "{{ success() }}\n"
+                "INSERT INTO runs VALUES (1);\n"
+                "SELECT COUNT(*) FROM runs;\n"
+                "{{ benchmark(repeat=3, warmup=2, baseline=\"perf/bench.json\", "
+                "match=\"samples_ms.size() == 3 && p95_ms >= median_ms && rows[0][0] == 5\") }}\n",
+                encoding="utf-8",
+            )
+            result = run_test_case(
+                build_test_case(sql_path),
+                SQLAlchemyConnector("sqlite:///:memory:"),
+                default_registry(update_baselines=True),
+            )
+            self.assertTrue(result.success, result.function_results)
+            self.assertEqual(len(result.segments[-1].samples_s), 3)
+            baseline_path = root / "perf" / "bench.json"
+            self.assertEqual(json.loads(baseline_path.read_text(encoding="utf-8"))["repeat"], 3)
+
+            baseline_path.write_text(json.dumps({"median_ms": 0.0}), encoding="utf-8")
+            result = run_test_case(
+                build_test_case(sql_path),
+                SQLAlchemyConnector("sqlite:///:memory:"),
+                default_registry(),
+            )
+            self.assertFalse(result.success)
+            self.assertIn("exceeds baseline", result.function_results[-1].message)
+
+    def test_invalid_settings_fail_only_their_test(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "bad.sql").write_text("SELECT 1; {{ benchmark(repeat=0) }}", encoding="utf-8")
+            (root / "good.sql").write_text("SELECT 1;", encoding="utf-8")
+            results = run_cases(
+                [build_test_case(root / "bad.sql"), build_test_case(root / "good.sql")],
+                SQLAlchemyConnector("sqlite:///:memory:"),
+                default_registry(),
+                workers=1,
+            )
+            self.assertEqual([result.success for result in results], [False, True])
+            self.assertIn("repeat >= 1", results[0].function_results[0].message)
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlcheck.cache import ParseCache, ResultCache
+from sqlcheck.db_connector import DBConnector, ExecutionResult, SQLAlchemyConnector
+from sqlcheck.discovery import build_test_case
+from sqlcheck.function_registry import default_registry
+from sqlcheck.models import ExecutionOutput, ExecutionStatus, SQLParsed
+from sqlcheck.runner import run_test_case
+
+
+class CountingAdapter(DBConnector):
+    def __init__(self) -> None:
+        self.executed: list[str] = []
+
+    def execute(self, sql_parsed: SQLParsed, timeout: float | None = None) -> ExecutionResult:
+        self.executed.append(sql_parsed.source.strip())
+        return ExecutionResult(
+            status=ExecutionStatus(success=True, returncode=0, duration_s=0.2),
+            output=ExecutionOutput(stdout="", stderr="", rows=[[len(self.executed)]]),
+        )
+
+
+class TestParseCache(unittest.TestCase):
+    def test_warm_load_skips_parsing(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sql_path = Path(temp_dir) / "cached.sql"
+            sql_path.write_text("{{ success(name='cached') }}\nSELECT 1;", encoding="utf-8")
+            cache = ParseCache(Path(temp_dir) / ".sqlcheck_cache")
+            cold = build_test_case(sql_path, cache)
+            calls: list[Path] = []
+
+            def parse(path: Path, source: str) -> None:
+                calls.append(path)
+
+            warm = ParseCache(cache.directory).load(sql_path, parse)
+            self.assertEqual(calls, [])
+            self.assertEqual(warm[1].name, "cached")
+            self.assertEqual(build_test_case(sql_path, cache), cold)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_content_change_invalidates_entry(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sql_path = Path(temp_dir) / "changed.sql"
+            sql_path.write_text("SELECT 1;", encoding="utf-8")
+            cache = ParseCache(Path(temp_dir) / ".sqlcheck_cache")
+            build_test_case(sql_path, cache)
+            sql_path.write_text("SELECT 1; SELECT 2;", encoding="utf-8")
+            case = build_test_case(sql_path, cache)
+            self.assertEqual(len(case.sql_parsed.statements), 2)
+            self.assertEqual(cache.misses, 2)
+
+    def test_touched_file_with_same_content_is_a_hit(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sql_path = Path(temp_dir) / "touched.sql"
+            sql_path.write_text("SELECT 1;", encoding="utf-8")
+            cache = ParseCache(Path(temp_dir) / ".sqlcheck_cache")
+            build_test_case(sql_path, cache)
+            stat = sql_path.stat()
+            os.utime(sql_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            build_test_case(sql_path, cache)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_prune_evicts_oldest_entries(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ParseCache(Path(temp_dir) / ".sqlcheck_cache")
+            for idx in range(3):
+                sql_path = Path(temp_dir) / f"case_{idx}.sql"
+                sql_path.write_text(f"SELECT {idx};", encoding="utf-8")
+                build_test_case(sql_path, cache)
+            entries = sorted(cache.directory.glob("*.pickle"))
+            for age, entry in enumerate(entries):
+                os.utime(entry, (age, age))
+            cache.max_bytes = entries[-1].stat().st_size
+            cache.prune()
+            self.assertEqual(list(cache.directory.glob("*.pickle")), [entries[-1]])
+
+
+class TestResultCache(unittest.TestCase):
+    def test_cached_segments_skip_execution_until_ttl_expires(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sql_path = Path(temp_dir) / "reference.sql"
+            sql_path.write_text(
+                "SELECT 1; {{ success(cache=True) }}\n"
+                "SELECT 2; {{ success() }}\n"
+                "INSERT INTO t VALUES (1); {{ success() }}\n",
+                encoding="utf-8",
+            )
+            case = build_test_case(sql_path)
+            adapter = CountingAdapter()
+            cache = ResultCache(Path(temp_dir) / "results", read_only=True)
+            run_test_case(case, adapter, default_registry(), result_cache=cache)
+            self.assertEqual(len(adapter.executed), 3)
+            adapter.executed.clear()
+
+            warm = run_test_case(case, adapter, default_registry(), result_cache=cache)
+            self.assertEqual(adapter.executed, ["INSERT INTO t VALUES (1);"])
+            self.assertTrue(warm.success)
+            self.assertFalse(warm.status.cache_hit)
+            self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+            adapter.executed.clear()
+            expired = ResultCache(cache.directory, ttl=-1.0)
+            read_only_path = Path(temp_dir) / "select.sql"
+            read_only_path.write_text("SELECT 1; {{ success(cache=True) }}", encoding="utf-8")
+            read_only = build_test_case(read_only_path)
+            hit = run_test_case(read_only, adapter, default_registry(), result_cache=cache)
+            self.assertEqual(adapter.executed, [])
+            self.assertTrue(hit.status.cache_hit)
+            self.assertEqual(hit.output.rows, [[1]])
+            run_test_case(read_only, adapter, default_registry(), result_cache=expired)
+            self.assertEqual(adapter.executed, ["SELECT 1;"])
+
+
+    def test_isolated_sessions_always_execute_writing_segments(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sql_path = Path(temp_dir) / "isolated.sql"
+            sql_path.write_text(
+                "CREATE TABLE t (x INTEGER);\n"
+                "INSERT INTO t VALUES (1);\n"
+                "{{ success(cache=True) }}\n"
+                "SELECT COUNT(*) FROM t; {{ assess(match='rows[0][0] == 1', cache=True) }}\n",
+                encoding="utf-8",
+            )
+            case = build_test_case(sql_path)
+            cache = ResultCache(Path(temp_dir) / "results")
+            adapter = SQLAlchemyConnector(f"sqlite:///{temp_dir}/isolated.db", isolation=True)
+            results = [
+                run_test_case(case, adapter, default_registry(), result_cache=cache)
+                for _ in range(2)
+            ]
+            adapter.close()
+            # The rollback undid the table, so the second run has to create it again.
+            self.assertTrue(all(result.success for result in results), results[-1].output)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+if __name__ == "__main__":
+    unittest.main()
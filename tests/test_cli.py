@@ -46,6 +46,110 @@ class TestCli(unittest.TestCase):
             expected_count = len(list(self.fixtures_dir.rglob("*.sql")))
             self.assertEqual(len(payload), expected_count)
 
+    def test_plan_uses_cache_dir_unless_disabled(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_dir = Path(temp_dir) / ".sqlcheck_cache"
+            args = ["plan", str(self.fixtures_dir), "--cache-dir", str(cache_dir)]
+            result = self.runner.invoke(app, [*args, "--no-cache"])
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertFalse(cache_dir.exists())
+            result = self.runner.invoke(app, args)
+            self.assertEqual(result.exit_code, 0, result.output)
+            expected_count = len(list(self.fixtures_dir.rglob("*.sql")))
+            self.assertEqual(len(list(cache_dir.glob("*.pickle"))), expected_count)
+
+    def test_plan_rejects_dependency_cycles(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            Path(temp_dir, "one.sql").write_text(
+                "SELECT 1; {{ success(depends_on='two') }}", encoding="utf-8"
+            )
+            Path(temp_dir, "two.sql").write_text(
+                "SELECT 2; {{ success(depends_on=['one']) }}", encoding="utf-8"
+            )
+            result = self.runner.invoke(app, ["plan", temp_dir])
+            self.assertEqual(result.exit_code, 1, result.output)
+            self.assertIn("dependency cycle one -> two -> one", result.output)
+
+
+    def test_run_rejects_negative_report_rows(self) -> None:
+        result = self.runner.invoke(
+            app, ["run", str(self.fixtures_dir), "--report-rows", "-1"]
+        )
+        self.assertEqual(result.exit_code, 2, result.output)
+        self.assertIn("--report-rows", result.output)
+
+    def test_run_rejects_unreadable_durations(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            malformed = Path(temp_dir, "report.json")
+            malformed.write_text('[{"path": "a.sql", "status": {}}]', encoding="utf-8")
+            for source in (Path(temp_dir, "missing.json"), malformed):
+                with self.subTest(source=source.name):
+                    result = self.runner.invoke(
+                        app,
+                        [
+                            "run",
+                            str(self.fixtures_dir),
+                            "--connection",
+                            "sqlite:///:memory:",
+                            "--durations",
+                            str(source),
+                        ],
+                    )
+                    self.assertEqual(result.exit_code, 2, result.output)
+                    self.assertIsInstance(result.exception, SystemExit)
+                    self.assertIn("--durations", result.output)
+
+    def test_run_rejects_dependencies_outside_the_thread_engine(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            Path(temp_dir, "a.sql").write_text(
+                "SELECT 1; {{ success(provides=['x']) }}", encoding="utf-8"
+            )
+            Path(temp_dir, "b.sql").write_text(
+                "SELECT 2; {{ success(depends_on='x') }}", encoding="utf-8"
+            )
+            for options, hint in (
+                (["--processes", "2"], "--processes"),
+                (["--engine", "async"], "--engine"),
+            ):
+                with self.subTest(hint=hint):
+                    result = self.runner.invoke(
+                        app, ["run", temp_dir, "--connection", "sqlite:///:memory:", *options]
+                    )
+                    self.assertEqual(result.exit_code, 2, result.output)
+                    self.assertIn(hint, result.output)
+
+    def test_shards_ignore_the_local_timing_history(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tests_dir = Path(temp_dir, "tests")
+            tests_dir.mkdir()
+            for name in ("a", "b", "c"):
+                Path(tests_dir, f"{name}.sql").write_text("SELECT 1;", encoding="utf-8")
+            timings = Path(temp_dir, "timings.json")
+            timings.write_text(
+                json.dumps({str(tests_dir / "a.sql"): 10.0, str(tests_dir / "b.sql"): 1.0}),
+                encoding="utf-8",
+            )
+            report = Path(temp_dir, "report.json")
+            result = self.runner.invoke(
+                app,
+                [
+                    "run",
+                    str(tests_dir),
+                    "--connection",
+                    "local",
+                    "--shard",
+                    "1/2",
+                    "--timings",
+                    str(timings),
+                    "--json",
+                    str(report),
+                ],
+                env={"SQLCHECK_CONN_LOCAL": "sqlite:///:memory:"},
+            )
+            self.assertEqual(result.exit_code, 0, result.output)
+            payload = json.loads(report.read_text(encoding="utf-8"))
+            ran = sorted(Path(item["path"]).name for item in payload)
+            self.assertEqual(ran, ["a.sql", "c.sql"])
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,68 @@
+import tempfile
+import unittest
+from array import array
+from pathlib import Path
+
+from sqlcheck.columnar import ColumnarBuilder, ColumnarResult
+from sqlcheck.db_connector import SQLAlchemyConnector
+from sqlcheck.function_registry import default_registry
+from sqlcheck.runner import build_test_case, run_test_case
+
+
+class TestColumnar(unittest.TestCase):
+    def test_builder_uses_typed_arrays_and_falls_back_to_lists(self) -> None:
+        builder = ColumnarBuilder(["id", "price", "label"])
+        builder.extend([(1, 1.5, "a"), (2, 2.5, "b")])
+        builder.extend([(3, None, "c")])
+        result = builder.finish()
+        self.assertIsInstance(result.column("id"), array)
+        self.assertEqual(result.column("price"), [1.5, 2.5, None])
+        self.assertEqual(result.to_rows(), [[1, 1.5, "a"], [2, 2.5, "b"], [3, None, "c"]])
+
+    def test_bools_keep_their_type_and_rows_can_be_limited(self) -> None:
+        builder = ColumnarBuilder(["id", "flag", "ratio"])
+        builder.extend([(1, True, 0.5), (2, False, 1.5)])
+        builder.extend([(True, False, 2)])
+        result = builder.finish()
+        self.assertEqual(result.column("flag"), [True, False, False])
+        self.assertIs(result.column("id")[2], True)
+        self.assertIs(type(result.column("ratio")[2]), int)
+        self.assertEqual(result.to_rows(limit=1), [[1, True, 0.5]])
+        self.assertEqual(result.to_rows(limit=0), [])
+
+    def test_aggregates(self) -> None:
+        result = ColumnarResult.from_rows(["x", "y"], [(1, "a"), (3, None), (3, "a")])
+        self.assertEqual(result.sum("x"), 7)
+        self.assertEqual((result.min("x"), result.max("x")), (1, 3))
+        self.assertEqual(result.distinct_count("x"), 2)
+        self.assertEqual(result.null_count("y"), 1)
+        self.assertEqual(result.distinct_count(1), 1)
+        self.assertIsNone(ColumnarResult.from_rows(["x"], []).max("x"))
+        large = ColumnarResult.from_rows(["x"], [(2**62,), (2**62,), (1,)])
+        self.assertIsInstance(large.column("x"), array)
+        self.assertEqual(large.sum("x"), 2**63 + 1)
+        self.assertEqual(large.avg("x"), (2**63 + 1) / 3)
+        with self.assertRaises(KeyError):
+            result.column("missing")
+
+    def test_cel_column_helpers_with_columnar_capture(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sql_path = Path(temp_dir) / "columnar.sql"
+            sql_path.write_text(
+                "{{ assess(match=\"col_sum('amount') == 60 && col_max('amount') == 30 "
+                "&& distinct_count('kind') == 2 && null_count('kind') == 1 "
+                "&& columns == ['amount', 'kind'] && rows.size() == 4\", columnar=True) }}\n"
+                "SELECT 10 AS amount, 'a' AS kind UNION ALL SELECT 20, 'b' "
+                "UNION ALL SELECT 30, 'a' UNION ALL SELECT 0, NULL;\n",
+                encoding="utf-8",
+            )
+            case = build_test_case(sql_path)
+            adapter = SQLAlchemyConnector("sqlite:///:memory:")
+            result = run_test_case(case, adapter, default_registry())
+            self.assertTrue(result.success, result.function_results)
+            self.assertEqual(result.output.rows, [])
+            self.assertIsNotNone(result.output.columnar)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlcheck.expressions import ExpressionCache, referenced_names
+from sqlcheck.function_context import execution_context
+from sqlcheck.functions.assess import _context_plan, assess, expression_cache
+from sqlcheck.models import ExecutionOutput, ExecutionStatus, SQLParsed
+
+
+class TestReferencedNames(unittest.TestCase):
+    def test_referenced_names_skip_strings_and_fields(self) -> None:
+        names = referenced_names(
+            "output.stdout.contains('rows') && col_sum(\"stderr\") > 1 && statement_count == 2"
+        )
+        self.assertTrue({"output", "col_sum", "statement_count"} <= names)
+        self.assertFalse({"rows", "stderr", "stdout", "contains"} & names)
+
+    def test_referenced_names_are_computed_once_per_expression(self) -> None:
+        source = "success && row_count == 3 && rows[0][0] == 'once'"
+        before = referenced_names.cache_info()
+        first = referenced_names(source)
+        self.assertIs(referenced_names(source), first)
+        after = referenced_names.cache_info()
+        self.assertEqual((after.misses - before.misses, after.hits - before.hits), (1, 1))
+
+
+class TestExpressionCache(unittest.TestCase):
+    def test_threads_share_prepared_expressions(self) -> None:
+        cache = ExpressionCache(_context_plan, maxsize=2)
+        sources = ["success == true", "row_count > 0 && plan != null"] * 50
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            prepared = list(executor.map(cache.get, sources))
+        stats = cache.stats()
+        self.assertEqual(stats.hits + stats.misses, len(sources))
+        self.assertLessEqual(stats.misses, 16)
+        self.assertEqual(
+            [name for name, _ in prepared[1].plan], ["plan", "row_count", "uses_index"]
+        )
+
+        cache.get("stdout == ''")
+        before = cache.stats()
+        cache.get(sources[0])  # evicted as the least recently used entry
+        self.assertEqual(cache.stats().since(before).misses, 1)
+
+    def test_assess_reuses_prepared_expressions(self) -> None:
+        before = expression_cache.stats()
+        with execution_context(
+            SQLParsed(source="SELECT 1", statements=[]),
+            ExecutionStatus(success=True, returncode=0, duration_s=0.01),
+            ExecutionOutput(stdout="", stderr="", rows=[[1]]),
+        ):
+            results = [assess(match="rows[0][0] == 1 && 'cached' != ''") for _ in range(3)]
+        self.assertTrue(all(result.success for result in results), results)
+        stats = expression_cache.stats().since(before)
+        self.assertEqual((stats.hits, stats.misses), (2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
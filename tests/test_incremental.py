@@ -0,0 +1,120 @@
+import subprocess
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from sqlcheck import models
+from sqlcheck.discovery import build_fixture, build_test_case
+from sqlcheck.incremental import (
+    changed_files,
+    load_state,
+    record_result,
+    select_affected,
+    write_state,
+)
+from sqlcheck.models import ExecutionOutput, ExecutionStatus, FunctionResult
+
+
+def _result(case, success: bool = True) -> models.TestResult:
+    return models.TestResult(
+        case=case,
+        status=ExecutionStatus(success=success, returncode=0, duration_s=0.5),
+        output=ExecutionOutput(stdout="", stderr=""),
+        function_results=[FunctionResult(name="success", success=success)],
+    )
+
+
+class TestIncremental(unittest.TestCase):
+    def test_only_changed_or_failed_tests_run_again(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "_fixtures").mkdir()
+            fixture_path = root / "_fixtures" / "orders.sql"
+            fixture_path.write_text("{{ fixture() }}\nSELECT 1;\n", encoding="utf-8")
+            sources = {
+                "a_provider.sql": "SELECT 1; {{ success(provides=['seed']) }}",
+                "b_dependent.sql": "SELECT 2; {{ success(depends_on=['seed']) }}",
+                "c_fixture.sql": "SELECT 3; {{ success(fixtures=['orders']) }}",
+                "d_plain.sql": "SELECT 4;",
+                "e_flaky.sql": "SELECT 5;",
+            }
+            for name, source in sources.items():
+                (root / name).write_text(source, encoding="utf-8")
+
+            def select(state, changed=None):
+                cases = [build_test_case(root / name) for name in sources]
+                fixtures = [build_fixture(fixture_path)]
+                return select_affected(cases, fixtures, state, changed)
+
+            first = select({})
+            self.assertEqual(len(first.run), 5)
+            state: dict = {}
+            for case in first.run:
+                passed = case.path.name != "e_flaky.sql"
+                record_result(state, _result(case, passed), first.fingerprints)
+            state_path = root / "state" / "state.json"
+            write_state(state_path, state)
+            state = load_state(state_path)
+
+            second = select(state)
+            self.assertEqual([case.path.name for case in second.run], ["e_flaky.sql"])
+            self.assertTrue(all(result.cached and result.success for result in second.cached))
+            self.assertEqual(second.cached[0].status.duration_s, 0.5)
+
+            fixture_path.write_text("{{ fixture() }}\nSELECT 2;\n", encoding="utf-8")
+            (root / "b_dependent.sql").write_text(
+                "SELECT 22; {{ success(depends_on=['seed']) }}", encoding="utf-8"
+            )
+            third = select(state)
+            self.assertEqual(
+                [case.path.name for case in third.run],
+                ["a_provider.sql", "b_dependent.sql", "c_fixture.sql", "e_flaky.sql"],
+            )
+
+            # Never-run tests are not reported as passing just because nothing changed.
+            unknown = select({}, changed=set())
+            self.assertEqual(len(unknown.run), 5)
+            self.assertEqual(unknown.cached, [])
+
+            for case in third.run:
+                passed = case.path.name != "e_flaky.sql"
+                record_result(state, _result(case, passed), third.fingerprints)
+            by_git = select(state, changed={(root / "a_provider.sql").resolve()})
+            self.assertEqual(
+                [case.path.name for case in by_git.run],
+                ["a_provider.sql", "b_dependent.sql", "e_flaky.sql"],
+            )
+            self.assertEqual(
+                by_git.cached[0].function_results[0].message,
+                "Cached: no referenced file changed",
+            )
+
+    def test_changed_files_lists_diff_and_untracked_files(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+
+            def git(*args: str) -> None:
+                subprocess.run(
+                    ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+                    cwd=root,
+                    check=True,
+                    capture_output=True,
+                )
+
+            git("init", "-q")
+            for name in ("kept.sql", "edited.sql"):
+                (root / name).write_text("SELECT 1;", encoding="utf-8")
+            git("add", ".")
+            git("commit", "-q", "-m", "init")
+            (root / "edited.sql").write_text("SELECT 2;", encoding="utf-8")
+            (root / "new.sql").write_text("SELECT 3;", encoding="utf-8")
+            self.assertEqual(
+                changed_files("HEAD", root),
+                {(root / "edited.sql").resolve(), (root / "new.sql").resolve()},
+            )
+            with self.assertRaises(ValueError):
+                changed_files("no-such-ref", root)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,14 @@
 import unittest
 from pathlib import Path
 
-from sqlcheck.parser import DirectiveParseError, parse_directives, parse_file, strip_directives
+from sqlcheck.parser import (
+    DirectiveParseError,
+    is_read_only,
+    parse_directives,
+    parse_file,
+    parse_source,
+    strip_directives,
+)
 
 
 class TestParser(unittest.TestCase):
@@ -33,10 +40,43 @@ class TestParser(unittest.TestCase):
         self.assertEqual(parsed.sql_parsed.statements[1].text, "SELECT 2")
         path.unlink()
 
+    def test_split_ignores_semicolons_in_comments_and_dollar_quotes(self) -> None:
+        parsed = parse_source(
+            "SELECT 1; -- a;b\n"
+            "SELECT 2 /* x; y */;\n"
+            "CREATE FUNCTION f() AS $body$ SELECT 1; $body$;\n"
+            "SELECT $$;$$, 'it''s;';"
+        )
+        texts = [stmt.text for stmt in parsed.sql_parsed.statements]
+        self.assertEqual(len(texts), 4)
+        self.assertEqual(texts[2], "CREATE FUNCTION f() AS $body$ SELECT 1; $body$")
+        self.assertEqual(texts[3], "SELECT $$;$$, 'it''s;'")
+
+    def test_parse_source_segments_share_statement_offsets(self) -> None:
+        source = "{{ success() }}\nSELECT 1;\n{{ fail() }}\nSELECT 2; SELECT 3;"
+        parsed = parse_source(source)
+        self.assertEqual([segment.directive.name for segment in parsed.segments], ["success", "fail"])
+        self.assertEqual(len(parsed.sql_parsed.statements), 3)
+        for segment in parsed.segments:
+            for stmt in segment.sql_parsed.statements:
+                self.assertEqual(segment.sql_parsed.source[stmt.start : stmt.end].strip(), stmt.text)
+        for stmt in parsed.sql_parsed.statements:
+            self.assertEqual(parsed.sql_parsed.source[stmt.start : stmt.end].strip(), stmt.text)
+
     def test_parse_directives_rejects_kw_splat(self) -> None:
         with self.assertRaises(DirectiveParseError):
             parse_directives("{{ success(**{'a': 1}) }}")
 
+    def test_is_read_only_rejects_any_writing_statement(self) -> None:
+        def read_only(sql: str) -> bool:
+            return is_read_only(parse_source(sql).sql_parsed)
+
+        self.assertTrue(read_only("-- totals\nSELECT 1; WITH a AS (SELECT 1) SELECT * FROM a;"))
+        self.assertFalse(read_only("SELECT 1; INSERT INTO t VALUES (1);"))
+        self.assertFalse(read_only("SELECT * INTO copy FROM t;"))
+        self.assertFalse(read_only("WITH d AS (DELETE FROM t RETURNING *) SELECT * FROM d;"))
+        self.assertFalse(read_only(""))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,123 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sqlcheck.db_connector import SQLAlchemyConnector
+from sqlcheck.connectors.sqlalchemy import _explain_statement
+from sqlcheck.function_registry import default_registry
+from sqlcheck.plans import compare_plans, explain_sql, parse_plan
+from sqlcheck.runner import build_test_case, run_test_case
+
+POSTGRES_PLAN = {
+    "Plan": {
+        "Node Type": "Nested Loop",
+        "Total Cost": 16.5,
+        "Plan Rows": 1,
+        "Plans": [
+            {
+                "Node Type": "Index Scan",
+                "Relation Name": "orders",
+                "Index Name": "ix_orders_customer",
+                "Total Cost": 8.3,
+                "Plan Rows": 1,
+            },
+            {"Node Type": "Seq Scan", "Relation Name": "customers", "Total Cost": 8.1},
+        ],
+    }
+}
+
+
+class TestPlans(unittest.TestCase):
+    def test_parses_postgres_json_plan(self) -> None:
+        plan = parse_plan("postgresql", 0, [([POSTGRES_PLAN],)])
+        self.assertEqual(plan.total_cost, 16.5)
+        self.assertTrue(plan.uses_index("IX_ORDERS_CUSTOMER"))
+        self.assertEqual(
+            plan.shape(),
+            [
+                "Nested Loop",
+                "  Index Scan on orders using ix_orders_customer",
+                "  Seq Scan on customers",
+            ],
+        )
+        self.assertEqual(
+            explain_sql("postgresql", "SELECT 1;", analyze=True),
+            "EXPLAIN (ANALYZE, FORMAT JSON) SELECT 1",
+        )
+
+    def test_compare_flags_shape_changes_and_cost_growth(self) -> None:
+        baseline = [parse_plan("postgresql", 0, [(json.dumps([POSTGRES_PLAN]),)]).to_payload()]
+        cheaper = json.loads(json.dumps(POSTGRES_PLAN))
+        cheaper["Plan"]["Total Cost"] = 10.0
+        self.assertEqual(compare_plans([parse_plan("postgresql", 0, [(cheaper,)])], baseline), [])
+
+        costlier = json.loads(json.dumps(POSTGRES_PLAN))
+        costlier["Plan"]["Total Cost"] = 30.0
+        del costlier["Plan"]["Plans"][0]["Index Name"]
+        problems = compare_plans([parse_plan("postgresql", 0, [(costlier,)])], baseline)
+        self.assertEqual(len(problems), 2)
+        self.assertIn("plan changed", problems[0])
+        self.assertIn("exceeds baseline 16.5", problems[1])
+
+    def test_analyze_skips_data_modifying_ctes(self) -> None:
+        connection = mock.Mock()
+        connection.dialect.name = "postgresql"
+        connection.exec_driver_sql.return_value.fetchall.return_value = [([POSTGRES_PLAN],)]
+        for text, expected in (
+            ("WITH x AS (SELECT 1) SELECT * FROM x", "EXPLAIN (ANALYZE, FORMAT JSON) WITH"),
+            ("WITH x AS (DELETE FROM t RETURNING *) SELECT * FROM x", "EXPLAIN (FORMAT JSON) WITH"),
+        ):
+            with self.subTest(text=text):
+                _explain_statement(connection, 0, text, analyze=True)
+                sql = connection.exec_driver_sql.call_args.args[0]
+                self.assertTrue(sql.startswith(expected), sql)
+
+    def test_plan_directive_checks_indexes_and_baseline(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            sql_path = root / "lookup.sql"
+            setup = (
+                "CREATE TABLE t (a INTEGER, b INTEGER);\n"
+                "CREATE INDEX ix_t_a ON t (a);\n"
+                "{{ success() }}\n"
+            )
+            sql_path.write_text(
+                setup
+                + "SELECT b FROM t WHERE a = 1;\n"
+                + "{{ plan(match=\"plan.uses_index('ix_t_a')\", baseline=\"plans/lookup.json\") }}\n",
+                encoding="utf-8",
+            )
+            result = run_test_case(
+                build_test_case(sql_path),
+                SQLAlchemyConnector("sqlite:///:memory:"),
+                default_registry(),
+            )
+            self.assertFalse(result.success)
+            self.assertIn("--update-baselines", result.function_results[-1].message)
+
+            result = run_test_case(
+                build_test_case(sql_path),
+                SQLAlchemyConnector("sqlite:///:memory:"),
+                default_registry(update_baselines=True),
+            )
+            self.assertTrue(result.success, result.function_results)
+            stored = json.loads((root / "plans" / "lookup.json").read_text(encoding="utf-8"))
+            self.assertEqual(stored[0]["shape"], ["SEARCH on t using ix_t_a"])
+            self.assertEqual(result.output.plans[0].indexes, ["ix_t_a"])
+
+            # An expression on the column defeats the index: the plan regresses.
+            sql_path.write_text(
+                setup
+                + "SELECT b FROM t WHERE a + 0 = 1;\n"
+                + "{{ plan(baseline=\"plans/lookup.json\") }}\n",
+                encoding="utf-8",
+            )
+            result = run_test_case(
+                build_test_case(sql_path),
+                SQLAlchemyConnector("sqlite:///:memory:"),
+                default_registry(),
+            )
+            self.assertFalse(result.success)
+            self.assertIn("plan changed", result.function_results[-1].message)
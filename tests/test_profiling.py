@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlcheck.db_connector import SQLAlchemyConnector
+from sqlcheck.function_registry import default_registry
+from sqlcheck.profiling import SlowestStatements
+from sqlcheck.runner import build_test_case, run_cases
+
+
+class TestProfiling(unittest.TestCase):
+    def test_statement_timings_and_slowest_statements(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            slow = Path(temp_dir) / "slow.sql"
+            slow.write_text(
+                "CREATE TABLE n AS WITH RECURSIVE c(x) AS "
+                "(SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 200000) SELECT x FROM c;\n"
+                "SELECT x FROM n WHERE x < 3;\n"
+                "{{ assess(match=\"statement_durations.size() == 2 && rows.size() == 2\") }}\n"
+                "SELECT 1;\n"
+                "{{ success() }}\n",
+                encoding="utf-8",
+            )
+            quick = Path(temp_dir) / "quick.sql"
+            quick.write_text("SELECT 2;", encoding="utf-8")
+            adapter = SQLAlchemyConnector(f"sqlite:///{temp_dir}/profile.db")
+            results = run_cases(
+                [build_test_case(slow), build_test_case(quick)],
+                adapter,
+                default_registry(),
+                workers=1,
+            )
+            adapter.close()
+            self.assertTrue(all(result.success for result in results), results)
+
+            segments = results[0].segments
+            self.assertEqual(len(segments), 2)
+            self.assertEqual([t.index for t in segments[0].statement_timings], [0, 1])
+            self.assertTrue(all(status.evaluate_s > 0 for status in segments))
+
+            profile = SlowestStatements(size=2)
+            for result in results:
+                profile.add(result)
+            slowest = profile.slowest()
+            self.assertEqual(profile.statements, 4)
+            self.assertEqual(len(slowest), 2)
+            self.assertEqual((slowest[0].path, slowest[0].statement), (slow, 0))
+            self.assertTrue(slowest[0].text.startswith("CREATE TABLE n"))
+            self.assertGreaterEqual(slowest[0].duration_s, slowest[1].duration_s)
+            self.assertGreater(profile.phases["execute"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,16 +4,31 @@ from pathlib import Path
 from tempfile import TemporaryDirectory
 from xml.etree import ElementTree
 
+from sqlcheck.columnar import ColumnarResult
 from sqlcheck.function_registry import default_registry
-from sqlcheck.reports import write_json, write_junit, write_plan
+from sqlcheck.models import ExecutionOutput
+from sqlcheck.reports import (
+    JSONLReportWriter,
+    JSONReportWriter,
+    JUnitReportWriter,
+    PlanFileWriter,
+    build_output_payload,
+    merge_json_reports,
+    merge_junit_reports,
+    write_json,
+    write_jsonl,
+    write_junit,
+    write_plan,
+)
 from sqlcheck.runner import build_test_case, run_test_case
 from sqlcheck.db_connector import DBConnector, ExecutionResult
 from sqlcheck.models import ExecutionOutput, ExecutionStatus
 
 
 class FakeAdapter(DBConnector):
-    def __init__(self, succeed: bool = True) -> None:
+    def __init__(self, succeed: bool = True, rows: int = 0) -> None:
         self.succeed = succeed
+        self.rows = rows
 
     def execute(self, sql: str, timeout: float | None = None) -> ExecutionResult:
         status = ExecutionStatus(
@@ -24,7 +39,8 @@ class FakeAdapter(DBConnector):
         output = ExecutionOutput(
             stdout="ok" if self.succeed else "",
             stderr="" if self.succeed else "boom",
-            rows=[],
+            rows=[[index] for index in range(self.rows)],
+            row_count=self.rows,
         )
         return ExecutionResult(status=status, output=output)
 
@@ -54,6 +70,107 @@ class TestReports(unittest.TestCase):
             plan_payload = json.loads(plan_path.read_text(encoding="utf-8"))
             self.assertEqual(plan_payload["directives"][0]["name"], "success")
 
+    def test_streaming_writers_produce_valid_reports(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            sql_path = Path(temp_dir) / "sample.sql"
+            sql_path.write_text("SELECT 1; {{ success() }}", encoding="utf-8")
+            case = build_test_case(sql_path)
+            passed = run_test_case(case, FakeAdapter(True), default_registry())
+            failed = run_test_case(case, FakeAdapter(False), default_registry())
+
+            json_path = Path(temp_dir) / "report.json"
+            junit_path = Path(temp_dir) / "report.xml"
+            with JSONReportWriter(json_path) as json_writer, JUnitReportWriter(junit_path) as junit_writer:
+                for result in (passed, failed):
+                    json_writer.add(result)
+                    junit_writer.add(result)
+
+            payload = json.loads(json_path.read_text(encoding="utf-8"))
+            self.assertEqual([item["success"] for item in payload], [True, False])
+            root = ElementTree.parse(junit_path).getroot()
+            self.assertEqual((root.get("tests"), root.get("failures")), ("2", "1"))
+            self.assertEqual(len(root.findall("testcase/failure")), 1)
+
+            write_json([], json_path)
+            self.assertEqual(json.loads(json_path.read_text(encoding="utf-8")), [])
+
+            plan_path = Path(temp_dir) / "plans.json"
+            with PlanFileWriter(plan_path) as plan_writer:
+                plan_writer.add(passed)
+                plan_writer.add(failed)
+            lines = plan_path.read_text(encoding="utf-8").splitlines()
+            self.assertEqual((lines[0], lines[-1], len(lines)), ("[", "]", 4))
+            self.assertEqual(json.loads("\n".join(lines))[1]["directives"][0]["name"], "success")
+
+    def test_jsonl_writer_limits_rows(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            sql_path = Path(temp_dir) / "sample.sql"
+            sql_path.write_text("SELECT 1; {{ success() }}", encoding="utf-8")
+            case = build_test_case(sql_path)
+            result = run_test_case(case, FakeAdapter(True, rows=5), default_registry())
+
+            jsonl_path = Path(temp_dir) / "report.jsonl"
+            with JSONLReportWriter(jsonl_path, max_rows=2) as writer:
+                writer.add(result)
+                self.assertEqual(len(jsonl_path.read_text(encoding="utf-8").splitlines()), 1)
+                writer.add(result)
+
+            lines = jsonl_path.read_text(encoding="utf-8").splitlines()
+            output = json.loads(lines[0])["output"]
+            self.assertEqual(output["rows"], [[0], [1]])
+            self.assertEqual((output["row_count"], output["truncated"]), (5, True))
+
+            with JSONReportWriter(Path(temp_dir) / "report.json", max_rows=0) as writer:
+                writer.add(result)
+            output = json.loads((Path(temp_dir) / "report.json").read_text())[0]["output"]
+            self.assertEqual((output["rows"], output["row_count"]), ([], 5))
+
+            write_jsonl([result], jsonl_path)
+            output = json.loads(jsonl_path.read_text(encoding="utf-8"))["output"]
+            self.assertEqual((len(output["rows"]), output["truncated"]), (5, False))
+            merged = Path(temp_dir) / "merged.json"
+            self.assertEqual(merge_json_reports([jsonl_path, jsonl_path], merged), 2)
+
+    def test_row_limit_applies_before_columnar_rows_are_built(self) -> None:
+        class CountingColumnar(ColumnarResult):
+            def to_rows(self, limit: int | None = None) -> list[list[object]]:
+                limits.append(limit)
+                return super().to_rows(limit)
+
+        limits: list[int | None] = []
+        columnar = CountingColumnar(names=["n"], columns=[list(range(1000))])
+        output = ExecutionOutput(stdout="", stderr="", row_count=1000, columnar=columnar)
+        payload = build_output_payload(output, max_rows=2)
+        self.assertEqual(payload["rows"], [[0], [1]])
+        self.assertEqual((payload["row_count"], payload["truncated"]), (1000, True))
+        self.assertEqual(limits, [2])
+
+    def test_merge_shard_reports(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            sql_path = Path(temp_dir) / "sample.sql"
+            sql_path.write_text("SELECT 1; {{ success() }}", encoding="utf-8")
+            case = build_test_case(sql_path)
+            passed = run_test_case(case, FakeAdapter(True), default_registry())
+            failed = run_test_case(case, FakeAdapter(False), default_registry())
+
+            shards = [Path(temp_dir) / "shard1.json", Path(temp_dir) / "shard2.json"]
+            write_json([passed], shards[0])
+            write_json([failed, passed], shards[1])
+            junit_shards = [Path(temp_dir) / "shard1.xml", Path(temp_dir) / "shard2.xml"]
+            write_junit([passed], junit_shards[0])
+            write_junit([failed, passed], junit_shards[1])
+
+            merged_json = Path(temp_dir) / "merged.json"
+            self.assertEqual(merge_json_reports(shards, merged_json), 3)
+            payload = json.loads(merged_json.read_text(encoding="utf-8"))
+            self.assertEqual([item["success"] for item in payload], [True, False, True])
+
+            for sources in (junit_shards, shards):
+                merged_junit = Path(temp_dir) / "merged.xml"
+                self.assertEqual(merge_junit_reports(sources, merged_junit), 3)
+                root = ElementTree.parse(merged_junit).getroot()
+                self.assertEqual((root.get("tests"), root.get("failures")), ("3", "1"))
+
 
 if __name__ == "__main__":
     unittest.main()
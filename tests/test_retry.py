@@ -0,0 +1,92 @@
+import random
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlalchemy.exc import DBAPIError, OperationalError
+
+from sqlcheck.db_connector import DBConnector, ExecutionResult
+from sqlcheck.function_registry import default_registry
+from sqlcheck.models import ExecutionOutput, ExecutionStatus, SQLParsed
+from sqlcheck.retry import RetryPolicy, classify_error
+from sqlcheck.runner import build_test_case, run_test_case
+
+
+class _PsycopgError(Exception):
+    def __init__(self, sqlstate: str) -> None:
+        super().__init__("error")
+        self.sqlstate = sqlstate
+
+
+class ScriptedAdapter(DBConnector):
+    """Fail with the given (error code, transient) pairs, then succeed."""
+
+    def __init__(self, failures: list[tuple[str, bool]]) -> None:
+        self.failures = list(failures)
+        self.calls = 0
+
+    def execute(self, sql_parsed: SQLParsed, timeout: float | None = None) -> ExecutionResult:
+        self.calls += 1
+        if self.failures:
+            code, transient = self.failures.pop(0)
+            status = ExecutionStatus(
+                success=False,
+                returncode=1,
+                duration_s=0.01,
+                db_error_code=code,
+                transient=transient,
+            )
+            return ExecutionResult(status, ExecutionOutput(stdout="", stderr=code))
+        status = ExecutionStatus(success=True, returncode=0, duration_s=0.01)
+        return ExecutionResult(status, ExecutionOutput(stdout="", stderr=""))
+
+
+class TestRetry(unittest.TestCase):
+    def test_classify_error(self) -> None:
+        def wrapped(error: Exception, invalidated: bool = False) -> DBAPIError:
+            return OperationalError("SELECT 1", {}, error, connection_invalidated=invalidated)
+
+        self.assertEqual(classify_error(wrapped(_PsycopgError("40P01"))), ("40P01", True))
+        self.assertEqual(classify_error(wrapped(_PsycopgError("08006"))), ("08006", True))
+        self.assertEqual(classify_error(wrapped(_PsycopgError("42601"))), ("42601", False))
+        self.assertEqual(classify_error(wrapped(Exception(1213, "Deadlock"))), ("1213", True))
+        self.assertEqual(classify_error(wrapped(Exception(1064, "syntax"))), ("1064", False))
+        locked = sqlite3.OperationalError("database is locked")
+        self.assertEqual(classify_error(wrapped(locked)), (None, True))
+        missing = sqlite3.OperationalError("no such table: t")
+        self.assertEqual(classify_error(wrapped(missing)), (None, False))
+        self.assertEqual(classify_error(wrapped(missing, invalidated=True)), (None, True))
+
+    def test_backoff_grows_with_full_jitter(self) -> None:
+        policy = RetryPolicy(retries=5, backoff_s=0.5, max_backoff_s=3.0)
+        rng = random.Random(7)
+        for attempt, cap in enumerate([0.5, 1.0, 2.0, 3.0, 3.0]):
+            delays = [policy.delay(attempt, rng) for _ in range(50)]
+            self.assertTrue(all(0.0 <= delay <= cap for delay in delays))
+            self.assertGreater(max(delays), cap / 2)
+
+    def test_only_transient_errors_are_retried(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sql_path = Path(temp_dir) / "flaky.sql"
+            sql_path.write_text(
+                "SELECT 1; {{ success(retries=3, retry_backoff=0.001) }}", encoding="utf-8"
+            )
+            case = build_test_case(sql_path)
+
+            adapter = ScriptedAdapter([("40001", True), ("40001", True)])
+            result = run_test_case(case, adapter, default_registry())
+            self.assertTrue(result.success)
+            self.assertEqual((adapter.calls, result.status.attempts), (3, 3))
+            self.assertEqual(result.segments[0].attempts, 3)
+            self.assertGreaterEqual(result.segments[0].backoff_s, 0.0)
+
+            adapter = ScriptedAdapter([("42601", False)])
+            result = run_test_case(case, adapter, default_registry())
+            self.assertFalse(result.success)
+            self.assertEqual((adapter.calls, result.status.attempts), (1, 1))
+            self.assertEqual(result.status.db_error_code, "42601")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,24 @@
+import asyncio
+import tempfile
+import threading
 import unittest
 from pathlib import Path
 
-from sqlcheck.db_connector import DBConnector, ExecutionResult
-from sqlcheck.function_context import current_context
+from sqlcheck.db_connector import AsyncDBConnector, DBConnector, ExecutionResult
+from sqlcheck.function_context import ExecutionContext, current_context
+from sqlcheck.functions.assess import _build_evaluation_context
 from sqlcheck.function_registry import FunctionRegistry, default_registry
 from sqlcheck.models import ExecutionOutput, ExecutionStatus, FunctionResult, SQLParsed
-from sqlcheck.runner import build_test_case, run_cases, run_test_case
+from sqlcheck.discovery import iter_test_cases
+from sqlcheck.runner import (
+    build_test_case,
+    discover_files,
+    iter_results,
+    iter_results_async,
+    run_cases,
+    run_cases_async,
+    run_test_case,
+)
 
 
 class FakeAdapter(DBConnector):
@@ -26,6 +39,23 @@ class FakeAdapter(DBConnector):
         return ExecutionResult(status=status, output=output)
 
 
+class FakeAsyncAdapter(AsyncDBConnector):
+    def __init__(self) -> None:
+        self.active = 0
+        self.peak = 0
+        self.closed = False
+
+    async def execute(self, sql_parsed: SQLParsed, timeout: float | None = None) -> ExecutionResult:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return FakeAdapter(True).execute(sql_parsed)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
 class TestRunner(unittest.TestCase):
     def test_build_test_case_defaults_to_success(self) -> None:
         path = Path("/tmp/default.sql")
@@ -62,6 +92,278 @@ class TestRunner(unittest.TestCase):
         path_a.unlink()
         path_b.unlink()
 
+    def test_iter_test_cases_with_process_pool_keeps_path_order(self) -> None:
+        fixtures_dir = Path(__file__).resolve().parent / "fixtures"
+        paths = discover_files(fixtures_dir, "**/*.sql")
+        sequential = list(iter_test_cases(paths))
+        pooled = list(iter_test_cases(paths, workers=2))
+        self.assertEqual(pooled, sequential)
+        self.assertEqual([case.path for case in pooled], paths)
+
+    def test_run_cases_consumes_stream_in_deterministic_order(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for idx in range(6):
+                path = Path(temp_dir) / f"case_{idx}.sql"
+                serial = ", serial=True" if idx % 3 == 0 else ""
+                path.write_text(f"SELECT {idx}; {{{{ success(name='case {idx}'{serial}) }}}}", encoding="utf-8")
+                paths.append(path)
+            cases = (build_test_case(path) for path in paths)
+            results = run_cases(cases, FakeAdapter(True), default_registry(), workers=3)
+            self.assertEqual([result.case.path for result in results], paths)
+
+    def test_iter_results_yields_before_stream_is_exhausted(self) -> None:
+        path = Path("/tmp/streamed.sql")
+        path.write_text("SELECT 1;", encoding="utf-8")
+        case = build_test_case(path)
+        consumed: list[int] = []
+
+        def stream():
+            for idx in range(20):
+                consumed.append(idx)
+                yield case
+
+        results = iter_results(stream(), FakeAdapter(True), default_registry(), workers=2)
+        first = next(results)
+        self.assertTrue(first.success)
+        self.assertLess(len(consumed), 20)
+        self.assertEqual(len(list(results)), 19)
+        path.unlink()
+
+    def test_iter_results_keeps_workers_busy_behind_a_slow_test(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for idx in range(8):
+                path = Path(temp_dir) / f"case_{idx}.sql"
+                path.write_text(f"SELECT {idx};", encoding="utf-8")
+                paths.append(path)
+            released = threading.Event()
+
+            class SlowHeadAdapter(FakeAdapter):
+                def execute(self, sql_parsed: SQLParsed, timeout: float | None = None) -> ExecutionResult:
+                    if sql_parsed.source.strip() == "SELECT 0;":
+                        released.wait(timeout=5)
+                    return super().execute(sql_parsed, timeout)
+
+            finished = []
+            for result in iter_results(
+                (build_test_case(path) for path in paths),
+                SlowHeadAdapter(True),
+                default_registry(),
+                workers=2,
+            ):
+                finished.append(result.case.path)
+                if len(finished) == len(paths) - 1:
+                    released.set()
+            self.assertEqual(finished[-1], paths[0])
+            self.assertEqual(sorted(finished), paths)
+
+    def test_run_cases_async_limits_concurrency_and_keeps_order(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for idx in range(12):
+                path = Path(temp_dir) / f"case_{idx:02d}.sql"
+                serial = ", serial=True" if idx == 0 else ""
+                path.write_text(f"SELECT {idx}; {{{{ success(name='case {idx}'{serial}) }}}}", encoding="utf-8")
+                paths.append(path)
+            adapter = FakeAsyncAdapter()
+            results = run_cases_async(
+                (build_test_case(path) for path in paths),
+                adapter,
+                default_registry(),
+                concurrency=4,
+            )
+            self.assertEqual([result.case.path for result in results], paths)
+            self.assertTrue(all(result.success for result in results))
+            self.assertEqual(adapter.peak, 4)
+            self.assertTrue(adapter.closed)
+
+    def test_iter_results_async_keeps_slots_busy_behind_a_slow_test(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for idx in range(6):
+                path = Path(temp_dir) / f"case_{idx}.sql"
+                path.write_text(f"SELECT {idx};", encoding="utf-8")
+                paths.append(path)
+
+            class SlowHeadAdapter(FakeAsyncAdapter):
+                async def execute(
+                    self, sql_parsed: SQLParsed, timeout: float | None = None
+                ) -> ExecutionResult:
+                    if sql_parsed.source.strip() == "SELECT 0;":
+                        await asyncio.sleep(0.3)
+                    return await super().execute(sql_parsed, timeout)
+
+            adapter = SlowHeadAdapter()
+            finished = [
+                result.case.path
+                for result in iter_results_async(
+                    (build_test_case(path) for path in paths),
+                    adapter,
+                    default_registry(),
+                    concurrency=2,
+                )
+            ]
+            self.assertEqual(finished[-1], paths[0])
+            self.assertEqual(sorted(finished), paths)
+            self.assertTrue(adapter.closed)
+
+    def test_scheduled_run_starts_longest_first_and_yields_as_tests_finish(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for idx in range(5):
+                path = Path(temp_dir) / f"case_{idx}.sql"
+                serial = ", serial=True" if idx == 1 else ""
+                path.write_text(f"SELECT {idx}; {{{{ success(name='case {idx}'{serial}) }}}}", encoding="utf-8")
+                paths.append(path)
+            started: list[str] = []
+
+            class RecordingAdapter(FakeAdapter):
+                def execute(self, sql_parsed: SQLParsed, timeout: float | None = None) -> ExecutionResult:
+                    started.append(sql_parsed.source.strip())
+                    return super().execute(sql_parsed, timeout)
+
+            durations = {paths[3].as_posix(): 9.0, paths[0].as_posix(): 0.1}
+            streamed = iter_results(
+                (build_test_case(path) for path in paths),
+                RecordingAdapter(True),
+                default_registry(),
+                workers=1,
+                durations=durations,
+            )
+            self.assertEqual(
+                [result.case.path for result in streamed], [paths[i] for i in (3, 2, 4, 0, 1)]
+            )
+            self.assertEqual(started, ["SELECT 3;", "SELECT 2;", "SELECT 4;", "SELECT 0;", "SELECT 1;"])
+            results = run_cases(
+                [build_test_case(path) for path in paths],
+                RecordingAdapter(True),
+                default_registry(),
+                workers=1,
+                durations=durations,
+            )
+            self.assertEqual([result.case.path for result in results], paths)
+
+    def test_depends_on_runs_after_prerequisites_and_skips_on_failure(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sources = {
+                "a_check.sql": "SELECT 'check'; {{ success(depends_on='orders') }}",
+                "b_fixture.sql": "SELECT 'fixture'; {{ success(provides=['orders']) }}",
+                "c_broken.sql": "SELECT 'broken'; {{ fail(name='broken') }}",
+                "d_after_broken.sql": "SELECT 'after'; {{ success(depends_on=['broken']) }}",
+                "e_cycle_one.sql": "SELECT 1; {{ success(name='one', depends_on='two') }}",
+                "f_cycle_two.sql": "SELECT 2; {{ success(name='two', depends_on='one') }}",
+                "g_unknown.sql": "SELECT 3; {{ success(depends_on='missing') }}",
+            }
+            paths = []
+            for name, source in sources.items():
+                path = Path(temp_dir) / name
+                path.write_text(source, encoding="utf-8")
+                paths.append(path)
+            started: list[str] = []
+
+            class RecordingAdapter(FakeAdapter):
+                def execute(self, sql_parsed: SQLParsed, timeout: float | None = None) -> ExecutionResult:
+                    started.append(sql_parsed.source.strip())
+                    return super().execute(sql_parsed, timeout)
+
+            results = run_cases(
+                (build_test_case(path) for path in paths),
+                RecordingAdapter(True),
+                default_registry(),
+                workers=3,
+            )
+            by_name = {result.case.path.name: result for result in results}
+            self.assertEqual(sorted(by_name), sorted(sources))
+            self.assertLess(started.index("SELECT 'fixture';"), started.index("SELECT 'check';"))
+            self.assertTrue(by_name["a_check.sql"].success)
+            self.assertNotIn("SELECT 'after';", started)
+            for name, reason in (
+                ("d_after_broken.sql", "prerequisite 'broken' did not pass"),
+                ("e_cycle_one.sql", "dependency cycle one -> two -> one"),
+                ("g_unknown.sql", "unknown dependency 'missing'"),
+            ):
+                self.assertEqual(
+                    by_name[name].function_results[0].message, f"Skipped: {reason}"
+                )
+
+    def test_depends_on_waits_once_for_a_provider_of_several_keys(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = Path(temp_dir) / "a.sql"
+            provider.write_text(
+                "SELECT 1; {{ success(name='a', provides=['x']) }}", encoding="utf-8"
+            )
+            dependents = []
+            for name, depends_on in (("b", "['a', 'x']"), ("c", "['x', 'x']")):
+                path = Path(temp_dir) / f"{name}.sql"
+                path.write_text(
+                    f"SELECT 2; {{{{ success(name='{name}', depends_on={depends_on}) }}}}",
+                    encoding="utf-8",
+                )
+                dependents.append(path)
+
+            class SlowAdapter(FakeAdapter):
+                def execute(self, sql_parsed: SQLParsed, timeout: float | None = None) -> ExecutionResult:
+                    threading.Event().wait(0.05)
+                    return super().execute(sql_parsed, timeout)
+
+            # Providers read before and after their dependents.
+            for paths in ([provider, *dependents], [*dependents, provider]):
+                with self.subTest(order=[path.stem for path in paths]):
+                    results = run_cases(
+                        (build_test_case(path) for path in paths),
+                        SlowAdapter(True),
+                        default_registry(),
+                        workers=3,
+                    )
+                    self.assertTrue(all(result.success for result in results), results)
+
+    def test_depends_on_runs_while_the_stream_is_still_open(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sources = {
+                "fixture.sql": "SELECT 1; {{ success(provides=['orders']) }}",
+                "check.sql": "SELECT 2; {{ success(depends_on='orders') }}",
+                "tail.sql": "SELECT 3;",
+            }
+            cases = {}
+            for name, source in sources.items():
+                path = Path(temp_dir) / name
+                path.write_text(source, encoding="utf-8")
+                cases[name] = build_test_case(path)
+            released = threading.Event()
+
+            def stream():
+                yield cases["fixture.sql"]
+                yield cases["check.sql"]
+                released.wait(timeout=5)
+                yield cases["tail.sql"]
+
+            finished = []
+            for result in iter_results(stream(), FakeAdapter(True), default_registry(), workers=2):
+                finished.append(result.case.path.name)
+                if result.case.path.name == "check.sql":
+                    released.set()
+            self.assertEqual(finished, ["fixture.sql", "check.sql", "tail.sql"])
+
+    def test_evaluation_context_builds_only_referenced_fields(self) -> None:
+        class CountingOutput(ExecutionOutput):
+            calls = 0
+
+            def row_values(self):
+                CountingOutput.calls += 1
+                return super().row_values()
+
+        context = ExecutionContext(
+            sql_parsed=SQLParsed(source="SELECT 1", statements=[]),
+            status=ExecutionStatus(success=True, returncode=0, duration_s=0.01),
+            output=CountingOutput(stdout="", stderr="", rows=[[1]]),
+        )
+        self.assertEqual(_build_evaluation_context(context, {"success", "v"}), {"success": True})
+        self.assertEqual(CountingOutput.calls, 0)
+        values = _build_evaluation_context(context, {"rows", "output"})
+        self.assertIs(values["rows"], values["output"]["rows"])
+        self.assertEqual(CountingOutput.calls, 1)
+
     def test_custom_registry_function(self) -> None:
         path = Path("/tmp/custom.sql")
         path.write_text("SELECT 1; {{ custom(check='ok') }}", encoding="utf-8")
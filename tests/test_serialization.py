@@ -0,0 +1,50 @@
+import json
+import unittest
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlcheck.serialization import BACKENDS, load_backend
+
+
+def _installed_backends():
+    for name in BACKENDS:
+        try:
+            yield load_backend(name)
+        except ImportError:
+            continue
+
+
+class TestSerialization(unittest.TestCase):
+    def test_backends_produce_the_same_json(self) -> None:
+        value = {
+            "rows": [[1, 2.5, None, "x"], [Decimal("1.10"), date(2024, 1, 2), b"\x01"]],
+            "when": datetime(2024, 1, 2, 3, 4, 5),
+        }
+        expected = {
+            "rows": [[1, 2.5, None, "x"], ["1.10", "2024-01-02", "01"]],
+            "when": "2024-01-02T03:04:05",
+        }
+        backends = list(_installed_backends())
+        self.assertEqual(backends[-1].name, "json")
+        for backend in backends:
+            with self.subTest(backend=backend.name):
+                compact = backend.dumps(value, False)
+                self.assertNotIn("\n", compact)
+                self.assertEqual(json.loads(compact), expected)
+                self.assertEqual(backend.loads(backend.dumps(value, True)), expected)
+                self.assertIn('\n  "rows"', backend.dumps(value, True))
+
+    def test_backends_encode_integers_beyond_64_bits(self) -> None:
+        value = {"rows": [[2**70, -(2**70)]]}
+        for backend in _installed_backends():
+            with self.subTest(backend=backend.name):
+                for indent in (False, True):
+                    self.assertEqual(json.loads(backend.dumps(value, indent)), value)
+
+    def test_unknown_backend_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            load_backend("pickle")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from sqlcheck.cli.discovery import stream_cases
+from sqlcheck.sharding import (
+    ShardSpec,
+    assign_shards,
+    load_durations,
+    select_shard,
+    write_durations,
+)
+
+
+class TestSharding(unittest.TestCase):
+    def test_parse_shard_spec(self) -> None:
+        self.assertEqual(ShardSpec.parse("2/4"), ShardSpec(index=2, count=4))
+        for spec in ("0/4", "5/4", "1", "a/b"):
+            with self.assertRaises(ValueError):
+                ShardSpec.parse(spec)
+
+    def test_shards_cover_paths_once_and_balance_by_count(self) -> None:
+        paths = [Path(f"tests/case_{idx}.sql") for idx in range(10)]
+        shards = assign_shards(paths, 3)
+        self.assertEqual(sorted(path for shard in shards for path in shard), paths)
+        self.assertEqual(sorted(len(shard) for shard in shards), [3, 3, 4])
+        for shard in shards:
+            self.assertEqual(shard, sorted(shard))
+        self.assertEqual(assign_shards(list(reversed(paths)), 3)[0], list(reversed(shards[0])))
+
+    def test_durations_balance_shards(self) -> None:
+        paths = [Path(name) for name in ("a.sql", "b.sql", "c.sql", "d.sql", "e.sql")]
+        durations = {"a.sql": 10.0, "b.sql": 1.0, "c.sql": 1.0, "d.sql": 1.0}
+        self.assertEqual(
+            select_shard(paths, ShardSpec(1, 2), durations), [Path("a.sql")]
+        )
+        self.assertEqual(
+            select_shard(paths, ShardSpec(2, 2), durations),
+            [Path("b.sql"), Path("c.sql"), Path("d.sql"), Path("e.sql")],
+        )
+
+    def test_dependency_groups_share_a_shard(self) -> None:
+        paths = [Path(name) for name in ("a.sql", "b.sql", "c.sql", "d.sql")]
+        durations = {"a.sql": 1.0, "b.sql": 2.0, "c.sql": 2.5, "d.sql": 1.0}
+        shards = assign_shards(paths, 2, durations, groups=[[Path("a.sql"), Path("d.sql")]])
+        self.assertEqual(shards, [[Path("c.sql")], [Path("a.sql"), Path("b.sql"), Path("d.sql")]])
+
+        with TemporaryDirectory() as temp_dir:
+            Path(temp_dir, "p.sql").write_text(
+                "SELECT 1; {{ success(provides=['k']) }}", encoding="utf-8"
+            )
+            Path(temp_dir, "q.sql").write_text(
+                "SELECT 2; {{ success(depends_on='k') }}", encoding="utf-8"
+            )
+            selected = [
+                [case.path.name for case in stream_cases(Path(temp_dir), "**/*.sql", shard=spec)]
+                for spec in (ShardSpec(1, 2), ShardSpec(2, 2))
+            ]
+            self.assertEqual(selected, [["p.sql", "q.sql"], []])
+
+    def test_load_durations_from_reports_and_timing_files(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            report = Path(temp_dir) / "report.json"
+            report.write_text(
+                json.dumps([{"path": "a.sql", "status": {"duration_s": 2.5}}]),
+                encoding="utf-8",
+            )
+            timings = Path(temp_dir) / "timings.json"
+            timings.write_text(json.dumps({"b.sql": 4}), encoding="utf-8")
+            self.assertEqual(
+                load_durations([report, timings]), {"a.sql": 2.5, "b.sql": 4.0}
+            )
+            history = Path(temp_dir) / "history" / "timings.json"
+            write_durations(history, {"b.sql": 1.5, "a.sql": 3.0})
+            self.assertEqual(load_durations([history]), {"a.sql": 3.0, "b.sql": 1.5})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 
 from sqlcheck.db_connector import SQLAlchemyConnector
+from sqlcheck.connectors.timeouts import native_timeout
 
 
 class TestSQLAlchemyAdapter(unittest.TestCase):
@@ -13,6 +14,16 @@ class TestSQLAlchemyAdapter(unittest.TestCase):
         self.assertIn("sqlcheck[snowflake]", message)
         self.assertIn("Can't load plugin", message)
 
+    def test_native_timeouts_per_dialect(self) -> None:
+        postgres = native_timeout("postgresql", 1.5)
+        self.assertEqual(postgres.setup, "SET LOCAL statement_timeout = 1500")
+        self.assertEqual(postgres.reset, "SET LOCAL statement_timeout = DEFAULT")
+        self.assertTrue(postgres.local)
+        mysql = native_timeout("mysql", 0.25)
+        self.assertEqual(mysql.setup, "SET SESSION MAX_EXECUTION_TIME = 250")
+        self.assertEqual(mysql.reset, "SET SESSION MAX_EXECUTION_TIME = DEFAULT")
+        self.assertIsNone(native_timeout("sqlite", 1))
+
 
 if __name__ == "__main__":
     unittest.main()
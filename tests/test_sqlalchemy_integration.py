@@ -1,10 +1,31 @@
+import importlib.util
+import sqlite3
+import sys
 import tempfile
 import unittest
+from functools import partial
 from pathlib import Path
+from unittest import mock
 
-from sqlcheck.db_connector import SQLAlchemyConnector
+from sqlalchemy.pool import QueuePool
+
+from sqlcheck.db_connector import AsyncSQLAlchemyConnector, PoolOptions, SQLAlchemyConnector
+from sqlcheck.connectors import sqlalchemy as sqlalchemy_connector
+from sqlcheck.connectors.timeouts import NativeTimeout
+from sqlcheck.discovery import build_fixture, discover_files, discover_fixtures
+from sqlcheck.fixtures import FixtureManager
 from sqlcheck.function_registry import default_registry
-from sqlcheck.runner import build_test_case, run_test_case
+from sqlcheck.runner import (
+    build_test_case,
+    run_cases,
+    run_cases_async,
+    run_cases_processes,
+    run_test_case,
+)
+
+HAS_ASYNC_SQLITE = all(
+    importlib.util.find_spec(name) for name in ("aiosqlite", "greenlet")
+)
 
 
 class TestSQLAlchemyIntegration(unittest.TestCase):
@@ -23,6 +44,300 @@ class TestSQLAlchemyIntegration(unittest.TestCase):
             result = run_test_case(case, adapter, default_registry())
             self.assertTrue(result.success)
 
+    def test_max_rows_bounds_captured_rows(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sql_path = Path(temp_dir) / "bounded.sql"
+            sql_path.write_text(
+                "{{ assess(match=\"row_count == 2500 && truncated && rows.size() == 10\", max_rows=10) }}\n"
+                "CREATE TABLE numbers AS WITH RECURSIVE n(i) AS "
+                "(SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 2500) SELECT i FROM n;\n"
+                "SELECT * FROM numbers;\n",
+                encoding="utf-8",
+            )
+            case = build_test_case(sql_path)
+            adapter = SQLAlchemyConnector("sqlite:///:memory:")
+            result = run_test_case(case, adapter, default_registry())
+            self.assertTrue(result.success, result.function_results)
+            self.assertEqual(len(result.output.rows), 10)
+            self.assertEqual(result.output.row_count, 2500)
+
+    def test_only_the_last_query_captures_rows(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sql_path = Path(temp_dir) / "queries.sql"
+            sql_path.write_text(
+                "SELECT 1 UNION ALL SELECT 2;\n"
+                "CREATE TABLE t (a INTEGER);\n"
+                "SELECT 3;\n"
+                "INSERT INTO t VALUES (1);\n"
+                "{{ assess(match=\"rows == [[3]]\") }}\n",
+                encoding="utf-8",
+            )
+            with mock.patch.object(
+                sqlalchemy_connector, "_capture_rows", wraps=sqlalchemy_connector._capture_rows
+            ) as capture:
+                result = run_test_case(
+                    build_test_case(sql_path),
+                    SQLAlchemyConnector("sqlite:///:memory:"),
+                    default_registry(),
+                )
+            self.assertTrue(result.success, result.function_results)
+            self.assertEqual(capture.call_count, 1)
+
+    def test_connector_max_rows_applies_globally(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sql_path = Path(temp_dir) / "global.sql"
+            sql_path.write_text(
+                "{{ assess(match=\"row_count == 3 && !truncated\") }}\n"
+                "SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3;\n",
+                encoding="utf-8",
+            )
+            case = build_test_case(sql_path)
+            adapter = SQLAlchemyConnector("sqlite:///:memory:", max_rows=5)
+            result = run_test_case(case, adapter, default_registry())
+            self.assertTrue(result.success, result.function_results)
+
+    def test_pool_sized_for_workers_and_wait_reported(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pool = PoolOptions.for_workers(12, pre_ping=True)
+            adapter = SQLAlchemyConnector(f"sqlite:///{temp_dir}/pool.db", pool=pool)
+            self.assertEqual(adapter.engine.pool.size(), 12)
+            sql_path = Path(temp_dir) / "pool.sql"
+            sql_path.write_text("{{ success() }}\nSELECT 1;\n", encoding="utf-8")
+            result = run_test_case(build_test_case(sql_path), adapter, default_registry())
+            self.assertTrue(result.success, result.function_results)
+            self.assertGreaterEqual(result.status.pool_wait_s, 0.0)
+            adapter.engine.dispose()
+
+    def test_pool_size_ignored_for_memory_sqlite(self) -> None:
+        adapter = SQLAlchemyConnector("sqlite:///:memory:", pool=PoolOptions(size=4))
+        self.assertNotIsInstance(adapter.engine.pool, QueuePool)
+
+    def test_process_runner_loads_plugins_and_keeps_order(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            Path(temp_dir, "sqlcheck_test_plugin.py").write_text(
+                "from sqlcheck.function_context import current_context\n"
+                "from sqlcheck.models import FunctionResult\n\n"
+                "def register(registry):\n"
+                "    def first_value(expected, **kwargs):\n"
+                "        value = current_context().output.rows[0][0]\n"
+                "        return FunctionResult(name='first_value', success=value == expected)\n"
+                "    registry.register('first_value', first_value)\n",
+                encoding="utf-8",
+            )
+            paths = []
+            for idx in range(7):
+                path = Path(temp_dir) / f"case_{idx}.sql"
+                serial = ", serial=True" if idx == 2 else ""
+                path.write_text(
+                    f"SELECT {idx}; {{{{ first_value({idx}{serial}) }}}}", encoding="utf-8"
+                )
+                paths.append(path)
+            sys.path.insert(0, temp_dir)
+            try:
+                results = run_cases_processes(
+                    (build_test_case(path) for path in paths),
+                    partial(SQLAlchemyConnector, f"sqlite:///{temp_dir}/shared.db"),
+                    ["sqlcheck_test_plugin"],
+                    processes=2,
+                    workers=2,
+                )
+            finally:
+                sys.path.remove(temp_dir)
+            self.assertEqual([result.case.path for result in results], paths)
+            self.assertTrue(all(result.success for result in results), results)
+            self.assertEqual(results[2].output.rows, [[2]])
+
+    def test_fixtures_set_up_once_and_tear_down(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "_fixtures").mkdir()
+            (root / "_fixtures" / "orders.sql").write_text(
+                "{{ fixture(scope='run') }}\n"
+                "CREATE TABLE orders (id INTEGER);\n"
+                "INSERT INTO orders VALUES (1), (2);\n"
+                "{{ teardown() }}\n"
+                "DROP TABLE orders;\n",
+                encoding="utf-8",
+            )
+            (root / "_fixtures" / "scratch.sql").write_text(
+                "{{ fixture(name='scratch', scope='worker') }}\n"
+                "CREATE TEMP TABLE scratch (id INTEGER);\n"
+                "{{ teardown() }}\n"
+                "DROP TABLE scratch;\n",
+                encoding="utf-8",
+            )
+            (root / "_fixtures" / "broken.sql").write_text(
+                "{{ fixture() }}\nSELECT * FROM missing_table;\n", encoding="utf-8"
+            )
+            for idx in range(4):
+                (root / f"case_{idx}.sql").write_text(
+                    f"{{{{ assess(match=\"rows[0][0] == 2\", fixtures=['orders', 'scratch']) }}}}\n"
+                    f"INSERT INTO scratch VALUES ({idx});\n"
+                    "SELECT COUNT(*) FROM orders;\n",
+                    encoding="utf-8",
+                )
+            (root / "needs_broken.sql").write_text(
+                "SELECT 1; {{ success(fixtures=['broken']) }}", encoding="utf-8"
+            )
+            paths = discover_files(root, "**/*.sql")
+            self.assertEqual(len(paths), 5)
+            adapter = SQLAlchemyConnector(f"sqlite:///{temp_dir}/fixtures.db")
+            manager = FixtureManager(
+                [build_fixture(path) for path in discover_fixtures(root)], adapter
+            )
+            results = run_cases(
+                (build_test_case(path) for path in paths),
+                adapter,
+                default_registry(),
+                workers=2,
+                fixtures=manager,
+            )
+            by_name = {result.case.path.name: result for result in results}
+            for idx in range(4):
+                self.assertTrue(by_name[f"case_{idx}.sql"].success, by_name[f"case_{idx}.sql"])
+            skipped = by_name["needs_broken.sql"]
+            self.assertFalse(skipped.success)
+            self.assertIn("fixture 'broken' failed", skipped.function_results[0].message)
+            self.assertEqual(skipped.function_results[0].name, "fixtures")
+            self.assertTrue(all(item.status.success for item in manager.teardown()))
+            adapter.close()
+            with sqlite3.connect(f"{temp_dir}/fixtures.db") as check:
+                tables = check.execute("SELECT name FROM sqlite_master").fetchall()
+            self.assertEqual(tables, [])
+
+    def test_isolation_rolls_back_each_test(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for idx in range(4):
+                path = Path(temp_dir) / f"isolated_{idx}.sql"
+                path.write_text(
+                    "CREATE TABLE scratch (id INTEGER);\n"
+                    f"INSERT INTO scratch VALUES ({idx});\n"
+                    "{{ success() }}\n"
+                    "INSERT INTO missing_table VALUES (1);\n"
+                    "{{ fail() }}\n"
+                    "SELECT COUNT(*) FROM scratch;\n"
+                    "{{ assess(match=\"rows == [[1]]\") }}\n",
+                    encoding="utf-8",
+                )
+                paths.append(path)
+            kept = Path(temp_dir) / "kept.sql"
+            kept.write_text(
+                "CREATE TABLE kept (id INTEGER); {{ success(isolated=False) }}", encoding="utf-8"
+            )
+            paths.append(kept)
+            adapter = SQLAlchemyConnector(f"sqlite:///{temp_dir}/isolated.db", isolation=True)
+            results = run_cases(
+                (build_test_case(path) for path in paths), adapter, default_registry(), workers=4
+            )
+            adapter.close()
+            self.assertTrue(all(result.success for result in results), results)
+            with sqlite3.connect(f"{temp_dir}/isolated.db") as check:
+                tables = check.execute("SELECT name FROM sqlite_master").fetchall()
+            self.assertEqual(tables, [("kept",)])
+
+    def test_sqlite_without_isolation_keeps_autocommit_statements(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sql_path = Path(temp_dir) / "vacuum.sql"
+            sql_path.write_text("CREATE TABLE t (x INTEGER);\nVACUUM;\n", encoding="utf-8")
+            adapter = SQLAlchemyConnector(f"sqlite:///{temp_dir}/vacuum.db")
+            result = run_test_case(build_test_case(sql_path), adapter, default_registry())
+            adapter.close()
+            self.assertTrue(result.success, result.output.stderr)
+
+    def test_watchdog_cancels_overdue_statements(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            endless = (
+                "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+                "SELECT COUNT(*) FROM n;\n"
+            )
+            paths = [Path(temp_dir) / "endless.sql", Path(temp_dir) / "quick.sql"]
+            paths[0].write_text(endless + "{{ fail(timeout=0.2) }}", encoding="utf-8")
+            paths[1].write_text("SELECT 1; {{ success() }}", encoding="utf-8")
+            adapter = SQLAlchemyConnector(f"sqlite:///{temp_dir}/timeout.db", timeout=30)
+            results = run_cases(
+                (build_test_case(path) for path in paths), adapter, default_registry(), workers=1
+            )
+            adapter.close()
+            self.assertTrue(all(result.success for result in results), results)
+            self.assertTrue(results[0].status.timed_out)
+            self.assertLess(results[0].status.duration_s, 5)
+            self.assertIn("Timed out after 0.2s", results[0].output.stderr)
+            self.assertFalse(results[1].status.timed_out)
+
+    def test_local_timeouts_are_reset_only_inside_savepoints(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sql_path = Path(temp_dir) / "limited.sql"
+            sql_path.write_text(
+                "SELECT 1; {{ success(timeout=5) }}\nSELECT 2; {{ success() }}\n",
+                encoding="utf-8",
+            )
+            # Stands in for PostgreSQL's SET LOCAL, which SQLite does not have.
+            local = NativeTimeout("SELECT 'limit'", "SELECT 'reset'", local=True)
+            resets = {}
+            for isolation in (False, True):
+                adapter = SQLAlchemyConnector(
+                    f"sqlite:///{temp_dir}/limited.db", isolation=isolation
+                )
+                with (
+                    mock.patch.object(sqlalchemy_connector, "native_timeout", return_value=local),
+                    mock.patch.object(sqlalchemy_connector, "_reset_native_timeout") as reset,
+                ):
+                    result = run_test_case(build_test_case(sql_path), adapter, default_registry())
+                adapter.close()
+                self.assertTrue(result.success, result.output.stderr)
+                resets[isolation] = reset.call_count
+            # Each segment's savepoint is released into the isolated session's
+            # transaction, where the limit would outlive it into the next segment.
+            self.assertEqual(resets, {False: 0, True: 2})
+
+    def test_slow_failures_are_not_timeouts(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sql_path = Path(temp_dir) / "slow.sql"
+            sql_path.write_text(
+                "WITH RECURSIVE n(i) AS "
+                "(SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 300000) "
+                "SELECT COUNT(*) FROM n;\n"
+                "SELECT * FROM missing;\n"
+                "{{ fail(timeout=0.01) }}",
+                encoding="utf-8",
+            )
+            adapter = SQLAlchemyConnector("sqlite:///:memory:")
+            # Without a driver cancel nothing stops the statements at the deadline.
+            with mock.patch.object(sqlalchemy_connector, "driver_cancel", return_value=None):
+                result = run_test_case(build_test_case(sql_path), adapter, default_registry())
+            adapter.close()
+            self.assertTrue(result.success, result.output.stderr)
+            self.assertGreater(result.status.duration_s, 0.01)
+            self.assertFalse(result.status.timed_out)
+            self.assertIn("no such table", result.output.stderr)
+
+    @unittest.skipUnless(HAS_ASYNC_SQLITE, "requires aiosqlite and greenlet")
+    def test_async_engine_runs_cases(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for idx in range(3):
+                path = Path(temp_dir) / f"async_{idx}.sql"
+                path.write_text(
+                    f"{{{{ assess(match=\"rows[0][0] == {idx} && row_count == 1\") }}}}\n"
+                    f"SELECT {idx};\n",
+                    encoding="utf-8",
+                )
+                paths.append(path)
+            adapter = AsyncSQLAlchemyConnector(f"sqlite+aiosqlite:///{temp_dir}/async.db")
+            results = run_cases_async(
+                [build_test_case(path) for path in paths],
+                adapter,
+                default_registry(),
+                concurrency=2,
+            )
+            self.assertEqual([result.case.path for result in results], paths)
+            self.assertTrue(all(result.success for result in results), results)
+
+    def test_async_engine_rejects_sync_driver(self) -> None:
+        with self.assertRaises(ValueError):
+            AsyncSQLAlchemyConnector("sqlite:///:memory:")
+
 
 if __name__ == "__main__":
     unittest.main()